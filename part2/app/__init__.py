@@ -1,27 +1,57 @@
-from flask import Flask
-from flask_restx import Api
+import gc
+from importlib import import_module
+from app.config import Config
+from app.persistence import repository_factory
 from app.services.facade import HBnBFacade
 
-facade = HBnBFacade()
+if Config.STORE_SOCKET:
+    from app.services.remote import RemoteFacade
+    facade = RemoteFacade(Config.STORE_SOCKET)
+else:
+    facade = HBnBFacade(repository_factory(Config), timed=Config.METRICS)
+
+# (module defining ns, URL prefix), imported by the first create_app()
+NAMESPACES = (
+    ("app.api.v1.users",     "/api/v1/users"),
+    ("app.api.v1.amenities", "/api/v1/amenities"),
+    ("app.api.v1.places",    "/api/v1/places"),
+    ("app.api.v1.reviews",   "/api/v1/reviews")
+)
 
 def create_app():
-    app = Flask(__name__)
+    # Flask and the API are only imported here, so processes that just need
+    # the facade (the store server, benchmarks) never load them
+    from app.api.startup import CachedSchemaApi, LazyRuleFlask
+    app = LazyRuleFlask(__name__)
 
-    api = Api(
+    api = CachedSchemaApi(
         app,
         version="1.0",
         title="HBnB API",
-        description="AirBnB clone REST API - Part 2"
+        description="AirBnB clone REST API - Part 2",
+        schema_cache=Config.SWAGGER_CACHE
     )
 
-    from app.api.v1.users import ns as users_ns
-    from app.api.v1.amenities import ns as amenities_ns
-    from app.api.v1.places import ns as places_ns
-    from app.api.v1.reviews import ns as reviews_ns
+    for module, path in NAMESPACES:
+        api.add_namespace(import_module(module).ns, path=path)
 
-    api.add_namespace(users_ns,     path="/api/v1/users")
-    api.add_namespace(amenities_ns, path="/api/v1/amenities")
-    api.add_namespace(places_ns,    path="/api/v1/places")
-    api.add_namespace(reviews_ns,   path="/api/v1/reviews")
+    if Config.METRICS:
+        from app.metrics import init_metrics
+        init_metrics(app, facade)
 
     return app
+
+
+def warm_up(app):
+    """Do the first-request work of app once, before a pre-fork server starts its workers.
+
+    Serves /swagger.json, which builds (or loads) the Swagger document and runs
+    Flask's per-app setup, then freezes the garbage collector so workers do
+    not copy the parent's pages by collecting them. The facade is not called
+    here, but importing the app already built it: only preload with a store
+    server or an in-memory backend, since wal and sqlite repositories open
+    their files and connections in their constructors.
+    """
+    with app.test_client() as client:
+        client.get("/swagger.json")
+    gc.freeze()
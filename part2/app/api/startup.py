@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+from functools import cache, cached_property
+import flask_restx
+from flask import Flask
+from flask_restx import Api
+from flask_restx.swagger import Swagger
+from werkzeug.routing import Rule
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Swagger documents by cache key, shared by every Api of the process
+_schemas = {}
+
+
+class LazyRule(Rule):
+    """URL rule whose url_for() builders are generated on first use.
+
+    werkzeug generates and compiles two builder functions per rule as soon
+    as the rule is added, which is most of the cost of create_app(). Routes
+    are matched far more often than URLs are built for them, and most are
+    never built at all. Relies on werkzeug's internal _compile_builder.
+    """
+
+    def _compile_builder(self, append_unknown=True):
+        name = "_build_unknown" if append_unknown else "_build"
+
+        def build(rule, **values):
+            builder = Rule._compile_builder(rule, append_unknown).__get__(rule, None)
+            setattr(rule, name, builder)
+            return builder(**values)
+        return build
+
+
+class LazyRuleFlask(Flask):
+    url_rule_class = LazyRule
+
+
+@cache
+def source_fingerprint():
+    """Digest of the application sources and flask_restx version the Swagger document derives from"""
+    digest = hashlib.sha1(flask_restx.__version__.encode())
+    for root, dirs, files in sorted(os.walk(APP_DIR)):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".py"):
+                with open(os.path.join(root, name), "rb") as f:
+                    digest.update(name.encode() + f.read())
+    return digest.hexdigest()
+
+
+def _load(path, key):
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached["schema"] if isinstance(cached, dict) and cached.get("key") == key else None
+
+
+def _store(path, key, schema):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({"key": key, "schema": schema}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+class CachedSchemaApi(Api):
+    """Api whose Swagger document is built at most once per process.
+
+    flask_restx builds the document again for every Api instance, on its
+    first /swagger.json request, and create_app() makes a new Api for each
+    test and each worker. The document is kept per process, keyed by the
+    source fingerprint, the Api's title, version and namespaces, base path
+    and host. With ``schema_cache`` set to a
+    file path it is also written there and reused by later processes until
+    the sources change.
+    """
+
+    def __init__(self, *args, schema_cache=None, **kwargs):
+        self.schema_cache = schema_cache
+        super().__init__(*args, **kwargs)
+
+    @cached_property
+    def __schema__(self):
+        swagger = Swagger(self)
+        key = "|".join([source_fingerprint(), self.title, self.version, self.base_path,
+                        swagger.get_host() or ""] + [f"{ns.name}={ns.path}" for ns in self.namespaces])
+        schema = _schemas.get(key)
+        if schema is None and self.schema_cache:
+            schema = _load(self.schema_cache, key)
+        if schema is None:
+            schema = swagger.as_dict()
+            if self.schema_cache:
+                _store(self.schema_cache, key, schema)
+        _schemas[key] = schema
+        return schema
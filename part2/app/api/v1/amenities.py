@@ -1,6 +1,11 @@
 from flask import request
 from flask_restx import Namespace, Resource, fields
 from app import facade
+from app.api.v1.batch import batch_response, batch_result, read_batch
+from app.api.v1.caching import cached_response
+from app.api.v1.conditional import conditional
+from app.api.v1.pagination import pagination_parser, page_args, page_headers
+from app.api.v1.serialization import serialize_list_with
 
 ns = Namespace("amenities", description="Amenity operations")
 
@@ -19,20 +24,44 @@ amenity_response = ns.model("AmenityResponse", {
 @ns.route("/")
 class AmenityList(Resource):
 
-    @ns.marshal_list_with(amenity_response)
-    @ns.response(200, "List of amenities retrieved successfully")
+    @ns.expect(pagination_parser)
+    @conditional(lambda: facade.collection_stamp("amenity"))
+    @cached_response(lambda: facade.versions("amenity"))
+    @serialize_list_with(amenity_response)
+    @ns.response(200, "List of amenities retrieved successfully", [amenity_response])
     def get(self):
         """List all amenities"""
-        return facade.get_all_amenities(), 200
+        limit, after = page_args()
+        if limit is None:
+            return facade.get_all_amenities(), 200
+        amenities, next_key = facade.get_amenities_page(limit, after)
+        return amenities, 200, page_headers(next_key)
 
-    @ns.expect(amenity_model, validate=True)
+    @ns.expect(amenity_model, validate=False)
     @ns.response(201, "Amenity created successfully")
     @ns.response(400, "Invalid input data")
     def post(self):
         """Create a new amenity"""
         try:
             amenity = facade.create_amenity(request.json)
-            return amenity.to_dict(), 201
+            return amenity.serialized(), 201
+        except ValueError as e:
+            ns.abort(400, str(e))
+
+
+amenity_batch_response = batch_response(ns, "AmenityBatchResponse")
+
+
+@ns.route("/batch")
+class AmenityBatch(Resource):
+
+    @ns.expect([amenity_model], validate=False)
+    @ns.marshal_with(amenity_batch_response, code=201)
+    @ns.response(400, "Invalid input data; no amenity was created")
+    def post(self):
+        """Create up to 10,000 amenities at once; the batch is applied entirely or not at all"""
+        try:
+            return batch_result(facade.create_amenities(read_batch())), 201
         except ValueError as e:
             ns.abort(400, str(e))
 
@@ -41,6 +70,7 @@ class AmenityList(Resource):
 @ns.param("amenity_id", "The amenity identifier")
 class AmenityResource(Resource):
 
+    @conditional(lambda amenity_id: facade.entity_stamp(facade.get_amenity(amenity_id)))
     @ns.response(200, "Amenity found")
     @ns.response(404, "Amenity not found")
     def get(self, amenity_id):
@@ -48,7 +78,7 @@ class AmenityResource(Resource):
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             ns.abort(404, "Amenity not found")
-        return amenity.to_dict(), 200
+        return amenity.serialized(), 200
 
     @ns.expect(amenity_model, validate=False)
     @ns.response(200, "Amenity updated successfully")
@@ -60,6 +90,6 @@ class AmenityResource(Resource):
             ns.abort(404, "Amenity not found")
         try:
             updated = facade.update_amenity(amenity_id, request.json)
-            return updated.to_dict(), 200
+            return updated.serialized(), 200
         except ValueError as e:
             ns.abort(400, str(e))
@@ -0,0 +1,29 @@
+from flask import request
+from flask_restx import abort, fields
+
+MAX_BATCH_SIZE = 10_000
+
+def batch_response(ns, name):
+    """Response model for a /batch endpoint: how many entities were written and their IDs"""
+    return ns.model(name, {
+        "count": fields.Integer(description="Number of entities written"),
+        "ids":   fields.List(fields.String, description="Entity IDs, in request order")
+    })
+
+
+def read_batch():
+    """The JSON list posted to a /batch endpoint.
+
+    Only the list itself is checked here; each item is validated by the
+    facade with the model's compiled validator, which names it by position.
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        abort(400, "Expected a non-empty JSON list")
+    if len(items) > MAX_BATCH_SIZE:
+        abort(400, f"A batch holds at most {MAX_BATCH_SIZE} items")
+    return items
+
+
+def batch_result(objs):
+    return {"count": len(objs), "ids": [obj.id for obj in objs]}
@@ -0,0 +1,72 @@
+import json
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, request
+from flask_restx.utils import unpack
+
+
+class ResponseCache:
+    """Small LRU of serialized JSON bodies, one per request path.
+
+    Each body is stored with the data version it was built from and only
+    served for that version; a newer one replaces it. Request threads share
+    the cache, so every access holds ``_lock``.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock    = threading.Lock()
+
+    def get(self, path, version):
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is None or cached[0] != version:
+                return None
+            self._entries.move_to_end(path)
+            return cached[1]
+
+    def put(self, path, version, entry):
+        with self._lock:
+            self._entries[path] = (version, entry)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+def cached_response(version):
+    """Serve successful GETs as prebuilt JSON bytes until version() changes.
+
+    The view may return data to encode or an already serialized JSON Response.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            path, current = request.full_path, version()
+            entry = response_cache.get(path, current)
+            if entry is None:
+                resp = f(*args, **kwargs)
+                if isinstance(resp, Response):
+                    if resp.status_code != 200 or resp.is_streamed:
+                        return resp
+                    headers = {name: value for name, value in resp.headers.items()
+                               if name not in ("Content-Type", "Content-Length")}
+                    entry = (resp.get_data(), headers)
+                else:
+                    data, code, headers = unpack(resp)
+                    if code != 200:
+                        return data, code, headers
+                    entry = (json.dumps(data).encode() + b"\n", dict(headers or {}))
+                response_cache.put(path, current, entry)
+            body, headers = entry
+            return Response(body, 200, headers, mimetype="application/json")
+        return wrapper
+    return decorator
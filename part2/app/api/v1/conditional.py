@@ -0,0 +1,50 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from flask import Response, request
+from flask_restx.utils import unpack
+from werkzeug.http import http_date, quote_etag
+
+
+def _validators(stamp):
+    token, last_modified = stamp
+    etag = hashlib.blake2b(repr(token).encode(), digest_size=12).hexdigest()
+    last_modified = datetime.fromtimestamp(int(last_modified.timestamp()), timezone.utc)
+    return etag, last_modified
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional(stamp):
+    """Answer GETs with ETag/Last-Modified and short-circuit to 304 when unchanged.
+
+    stamp receives the URL arguments and returns (token, last_modified), or
+    None when the resource does not exist.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            current = stamp(**kwargs)
+            if current is None:
+                return f(*args, **kwargs)
+            etag, last_modified = _validators(current)
+            headers = {"ETag": quote_etag(etag), "Last-Modified": http_date(last_modified)}
+            if _not_modified(etag, last_modified):
+                return Response(status=304, headers=headers)
+            resp = f(*args, **kwargs)
+            if isinstance(resp, Response):
+                if resp.status_code == 200:
+                    resp.headers.update(headers)
+                return resp
+            data, code, extra = unpack(resp)
+            if code == 200:
+                extra = dict(extra or {}, **headers)
+            return data, code, extra
+        return wrapper
+    return decorator
@@ -0,0 +1,45 @@
+import base64
+from datetime import datetime
+from flask_restx import abort, reqparse
+
+MAX_PAGE_SIZE = 1000
+
+pagination_parser = reqparse.RequestParser()
+pagination_parser.add_argument("limit",  type=int, location="args",
+                               help="Page size (1 to 1000); omit to list everything")
+pagination_parser.add_argument("cursor", type=str, location="args",
+                               help="Opaque cursor from the previous page's X-Next-Cursor header")
+
+
+def encode_cursor(key):
+    created_at, obj_id = key
+    raw = f"{created_at.isoformat()}|{obj_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, obj_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        created_at = datetime.fromisoformat(created_at)
+    except ValueError:
+        abort(400, "Invalid cursor")
+    # Repositories order by naive local timestamps; an aware one cannot be compared
+    if created_at.tzinfo is not None:
+        abort(400, "Invalid cursor")
+    return created_at, obj_id
+
+
+def page_args():
+    """Return (limit, after) from the query string, or (None, None) when unpaginated"""
+    args = pagination_parser.parse_args()
+    limit = args["limit"]
+    if limit is None:
+        return None, None
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        abort(400, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    after = decode_cursor(args["cursor"]) if args["cursor"] else None
+    return limit, after
+
+
+def page_headers(next_key):
+    return {"X-Next-Cursor": encode_cursor(next_key)} if next_key else {}
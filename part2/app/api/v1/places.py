@@ -1,6 +1,14 @@
+import math
 from flask import request
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, reqparse
 from app import facade
+from app.services.facade import PLACE_RELATIONS
+from app.api.v1.batch import batch_response, batch_result, read_batch
+from app.api.v1.caching import cached_response
+from app.api.v1.conditional import conditional
+from app.api.v1.pagination import pagination_parser, page_args, page_headers
+from app.api.v1.serialization import compile_serializer, json_response, serialize_list_with
+from app.api.v1.streaming import stream_parser, streamable
 
 ns = Namespace("places", description="Place operations")
 
@@ -16,6 +24,12 @@ owner_model = ns.model("PlaceOwner", {
     "email":      fields.String(description="Email")
 })
 
+rating_model = ns.model("PlaceRating", {
+    "count":     fields.Integer(description="Number of reviews"),
+    "average":   fields.Float(description="Average rating, null without reviews"),
+    "histogram": fields.Raw(description="Number of reviews per rating, keyed 1 to 5")
+})
+
 place_model = ns.model("Place", {
     "title":       fields.String(required=True,  description="Place title"),
     "description": fields.String(default="",     description="Description"),
@@ -35,6 +49,7 @@ place_response = ns.model("PlaceResponse", {
     "longitude":   fields.Float(description="Longitude"),
     "owner_id":    fields.String(description="Owner ID"),
     "amenities":   fields.List(fields.String,    description="Amenity IDs"),
+    "rating":      fields.Nested(rating_model,   description="Rating summary"),
     "created_at":  fields.String(description="Creation date"),
     "updated_at":  fields.String(description="Last update date")
 })
@@ -48,41 +63,226 @@ place_detail_response = ns.model("PlaceDetailResponse", {
     "longitude":   fields.Float(description="Longitude"),
     "owner":       fields.Nested(owner_model,    description="Owner details"),
     "amenities":   fields.List(fields.Nested(amenity_model), description="Amenities details"),
+    "rating":      fields.Nested(rating_model,   description="Rating summary"),
     "created_at":  fields.String(description="Creation date"),
     "updated_at":  fields.String(description="Last update date")
 })
+expanded_place_models = {
+    frozenset(): place_response,
+    frozenset({"owner"}): ns.clone("PlaceWithOwnerResponse", place_response, {
+        "owner":     fields.Nested(owner_model, allow_null=True, description="Owner details")
+    }),
+    frozenset({"amenities"}): ns.clone("PlaceWithAmenitiesResponse", place_response, {
+        "amenities": fields.List(fields.Nested(amenity_model), description="Amenities details")
+    }),
+    frozenset(PLACE_RELATIONS): ns.clone("PlaceExpandedResponse", place_response, {
+        "owner":     fields.Nested(owner_model, allow_null=True, description="Owner details"),
+        "amenities": fields.List(fields.Nested(amenity_model), description="Amenities details")
+    })
+}
+place_serializers = {expand: compile_serializer(model) for expand, model in expanded_place_models.items()}
+
+expand_parser = reqparse.RequestParser()
+expand_parser.add_argument("expand", type=str, location="args",
+                           help="Comma-separated relations to embed: owner, amenities")
+
+
+def expand_args(default=()):
+    """Return the set of relations requested with ?expand="""
+    value = expand_parser.parse_args()["expand"]
+    if value is None:
+        return frozenset(default)
+    expand = frozenset(part for part in value.split(",") if part)
+    unknown = expand - set(PLACE_RELATIONS)
+    if unknown:
+        ns.abort(400, f"Cannot expand: {', '.join(sorted(unknown))}")
+    return expand
+
+
+search_parser = reqparse.RequestParser()
+search_parser.add_argument("bbox", type=str, location="args",
+                           help="min_lat,min_lon,max_lat,max_lon")
+search_parser.add_argument("near", type=str, location="args",
+                           help="lat,lon; results are ordered by distance")
+search_parser.add_argument("radius_km", type=float, location="args",
+                           help="Search radius around near, in kilometers")
+search_parser.add_argument("min_price", type=float, location="args",
+                           help="Minimum price per night")
+search_parser.add_argument("max_price", type=float, location="args",
+                           help="Maximum price per night")
+search_parser.add_argument("amenities", type=str, location="args",
+                           help="Comma-separated amenity IDs that must all be present")
+
+
+def _floats(value, count, name):
+    try:
+        numbers = [float(part) for part in value.split(",")]
+    except ValueError:
+        numbers = []
+    if len(numbers) != count:
+        ns.abort(400, f"{name} must be {count} comma-separated numbers")
+    return numbers
+
+
+def search_args():
+    """Return facade.search_places keyword arguments, or None without a filter"""
+    args = search_parser.parse_args()
+    if args["near"] and args["bbox"]:
+        ns.abort(400, "Use either bbox or near, not both")
+    search = {}
+    for name in ("min_price", "max_price"):
+        if args[name] is not None:
+            if not math.isfinite(args[name]):
+                ns.abort(400, f"{name} must be a finite number")
+            search[name] = args[name]
+    if args["amenities"]:
+        search["amenities"] = [aid for aid in args["amenities"].split(",") if aid]
+    if args["near"]:
+        lat, lon = _floats(args["near"], 2, "near")
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            ns.abort(400, "near is out of range")
+        if args["radius_km"] is None or not 0 < args["radius_km"] < math.inf:
+            ns.abort(400, "radius_km must be a positive number")
+        search.update(near=(lat, lon), radius_km=args["radius_km"])
+    if args["bbox"]:
+        min_lat, min_lon, max_lat, max_lon = _floats(args["bbox"], 4, "bbox")
+        if not (-90 <= min_lat <= max_lat <= 90):
+            ns.abort(400, "bbox latitudes must satisfy -90 <= min_lat <= max_lat <= 90")
+        if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+            ns.abort(400, "bbox longitudes must be between -180 and 180")
+        search["bbox"] = (min_lat, min_lon, max_lat, max_lon)
+    return search or None
 
 
 @ns.route("/")
 class PlaceList(Resource):
 
-    @ns.marshal_list_with(place_response)
-    @ns.response(200, "List of places retrieved successfully")
+    @ns.expect(pagination_parser, stream_parser, search_parser, expand_parser)
+    @conditional(lambda: facade.collection_stamp("place", "review", "user", "amenity"))
+    @streamable(place_response, lambda: facade.iter_places(**(search_args() or {})))
+    @cached_response(lambda: facade.versions("place", "review", "user", "amenity"))
+    @ns.response(200, "List of places retrieved successfully", [place_response])
     def get(self):
-        """List all places"""
-        return facade.get_all_places(), 200
+        """List all places, optionally filtered by location, price and amenities"""
+        expand = expand_args()
+        serialize = place_serializers[expand]
+        search = search_args()
+        limit, after = page_args()
+        if search is not None:
+            if request.args.get("cursor"):
+                ns.abort(400, "cursor cannot be combined with filters; use limit for the first matches")
+            return json_response(serialize, facade.search_places(expand=expand, limit=limit, **search))
+        if limit is None:
+            return json_response(serialize, facade.get_all_places(expand))
+        places, next_key = facade.get_places_page(limit, after, expand)
+        return json_response(serialize, places, headers=page_headers(next_key))
 
-    @ns.expect(place_model, validate=True)
+    @ns.expect(place_model, validate=False)
     @ns.response(201, "Place created successfully")
     @ns.response(400, "Invalid input data")
     def post(self):
         """Create a new place"""
         try:
             place = facade.create_place(request.json)
-            return place.to_dict(), 201
+            return place.serialized(), 201
         except ValueError as e:
             ns.abort(400, str(e))
 
 
+place_batch_response = batch_response(ns, "PlaceBatchResponse")
+
+place_update_model = ns.clone("PlaceBatchUpdate", place_model, {
+    "id": fields.String(required=True, description="ID of the place to update")
+})
+
+
+@ns.route("/batch")
+class PlaceBatch(Resource):
+
+    @ns.expect([place_model], validate=False)
+    @ns.marshal_with(place_batch_response, code=201)
+    @ns.response(400, "Invalid input data; no place was created")
+    def post(self):
+        """Create up to 10,000 places at once; the batch is applied entirely or not at all"""
+        try:
+            return batch_result(facade.create_places(read_batch())), 201
+        except ValueError as e:
+            ns.abort(400, str(e))
+
+    @ns.expect([place_update_model], validate=False)
+    @ns.marshal_with(place_batch_response)
+    @ns.response(400, "Invalid input data; no place was updated")
+    def put(self):
+        """Update up to 10,000 places at once; each item carries the place "id" """
+        try:
+            return batch_result(facade.update_places(read_batch())), 200
+        except ValueError as e:
+            ns.abort(400, str(e))
+
+
+top_rated_parser = reqparse.RequestParser()
+top_rated_parser.add_argument("limit", type=int, default=10, location="args",
+                              help="Number of places to return (1 to 100)")
+top_rated_parser.add_argument("min_reviews", type=int, default=1, location="args",
+                              help="Only rank places with at least this many reviews")
+
+
+@ns.route("/top_rated")
+class TopRatedPlaceList(Resource):
+
+    @ns.expect(top_rated_parser)
+    @conditional(lambda: facade.collection_stamp("place", "review"))
+    @cached_response(lambda: facade.versions("place", "review"))
+    @serialize_list_with(place_response)
+    @ns.response(200, "Places ordered by average rating", [place_response])
+    def get(self):
+        """List the best rated places"""
+        args = top_rated_parser.parse_args()
+        if not 1 <= args["limit"] <= 100:
+            ns.abort(400, "limit must be between 1 and 100")
+        return facade.get_top_rated_places(args["limit"], max(1, args["min_reviews"])), 200
+
+
+text_search_parser = reqparse.RequestParser()
+text_search_parser.add_argument("q", type=str, required=True, location="args",
+                                help="Words to find in titles, descriptions and reviews; "
+                                     "the last word also matches as a prefix")
+text_search_parser.add_argument("limit", type=int, default=20, location="args",
+                                help="Number of places to return (1 to 100)")
+
+place_match_response = ns.clone("PlaceMatchResponse", place_response, {
+    "score": fields.Float(description="BM25 relevance score")
+})
+
+
+@ns.route("/search")
+class PlaceTextSearch(Resource):
+
+    @ns.expect(text_search_parser)
+    @conditional(lambda: facade.collection_stamp("place", "review"))
+    @cached_response(lambda: facade.versions("place", "review"))
+    @serialize_list_with(place_match_response)
+    @ns.response(200, "Matching places, most relevant first", [place_match_response])
+    def get(self):
+        """Full-text search over places and their reviews"""
+        args = text_search_parser.parse_args()
+        if not 1 <= args["limit"] <= 100:
+            ns.abort(400, "limit must be between 1 and 100")
+        return facade.search_place_text(args["q"], args["limit"]), 200
+
+
 @ns.route("/<string:place_id>")
 @ns.param("place_id", "The place identifier")
 class PlaceResource(Resource):
 
+    @ns.expect(expand_parser)
+    @conditional(lambda place_id: facade.entity_stamp(
+        facade.place_repo.get(place_id), "review", "user", "amenity"))
     @ns.response(200, "Place found")
     @ns.response(404, "Place not found")
     def get(self, place_id):
         """Get a place by ID with owner details and amenities"""
-        place = facade.get_place(place_id)
+        place = facade.get_place(place_id, expand_args(default=PLACE_RELATIONS))
         if not place:
             ns.abort(404, "Place not found")
         return place, 200
@@ -97,6 +297,6 @@ class PlaceResource(Resource):
             ns.abort(404, "Place not found")
         try:
             updated = facade.update_place(place_id, request.json)
-            return updated.to_dict(), 200
+            return updated.serialized(), 200
         except ValueError as e:
             ns.abort(400, str(e))
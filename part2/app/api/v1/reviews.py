@@ -1,6 +1,12 @@
 from flask import request
 from flask_restx import Namespace, Resource, fields
 from app import facade
+from app.api.v1.batch import batch_response, batch_result, read_batch
+from app.api.v1.caching import cached_response
+from app.api.v1.conditional import conditional
+from app.api.v1.pagination import pagination_parser, page_args, page_headers
+from app.api.v1.serialization import serialize_list_with
+from app.api.v1.streaming import stream_parser, streamable
 
 ns = Namespace("reviews", description="Review operations")
 
@@ -25,20 +31,45 @@ review_response = ns.model("ReviewResponse", {
 @ns.route("/")
 class ReviewList(Resource):
 
-    @ns.marshal_list_with(review_response)
-    @ns.response(200, "List of reviews retrieved successfully")
+    @ns.expect(pagination_parser, stream_parser)
+    @conditional(lambda: facade.collection_stamp("review"))
+    @streamable(review_response, facade.iter_reviews)
+    @cached_response(lambda: facade.versions("review"))
+    @serialize_list_with(review_response)
+    @ns.response(200, "List of reviews retrieved successfully", [review_response])
     def get(self):
         """List all reviews"""
-        return facade.get_all_reviews(), 200
+        limit, after = page_args()
+        if limit is None:
+            return facade.get_all_reviews(), 200
+        reviews, next_key = facade.get_reviews_page(limit, after)
+        return reviews, 200, page_headers(next_key)
 
-    @ns.expect(review_model, validate=True)
+    @ns.expect(review_model, validate=False)
     @ns.response(201, "Review created successfully")
     @ns.response(400, "Invalid input data")
     def post(self):
         """Create a new review"""
         try:
             review = facade.create_review(request.json)
-            return review.to_dict(), 201
+            return review.serialized(), 201
+        except ValueError as e:
+            ns.abort(400, str(e))
+
+
+review_batch_response = batch_response(ns, "ReviewBatchResponse")
+
+
+@ns.route("/batch")
+class ReviewBatch(Resource):
+
+    @ns.expect([review_model], validate=False)
+    @ns.marshal_with(review_batch_response, code=201)
+    @ns.response(400, "Invalid input data; no review was created")
+    def post(self):
+        """Create up to 10,000 reviews at once; the batch is applied entirely or not at all"""
+        try:
+            return batch_result(facade.create_reviews(read_batch())), 201
         except ValueError as e:
             ns.abort(400, str(e))
 
@@ -47,6 +78,7 @@ class ReviewList(Resource):
 @ns.param("review_id", "The review identifier")
 class ReviewResource(Resource):
 
+    @conditional(lambda review_id: facade.entity_stamp(facade.get_review(review_id)))
     @ns.response(200, "Review found")
     @ns.response(404, "Review not found")
     def get(self, review_id):
@@ -54,7 +86,7 @@ class ReviewResource(Resource):
         review = facade.get_review(review_id)
         if not review:
             ns.abort(404, "Review not found")
-        return review.to_dict(), 200
+        return review.serialized(), 200
 
     @ns.expect(review_model, validate=False)
     @ns.response(200, "Review updated successfully")
@@ -66,7 +98,7 @@ class ReviewResource(Resource):
             ns.abort(404, "Review not found")
         try:
             updated = facade.update_review(review_id, request.json)
-            return updated.to_dict(), 200
+            return updated.serialized(), 200
         except ValueError as e:
             ns.abort(400, str(e))
 
@@ -84,8 +116,10 @@ class ReviewResource(Resource):
 @ns.param("place_id", "The place identifier")
 class PlaceReviewList(Resource):
 
-    @ns.marshal_list_with(review_response)
-    @ns.response(200, "List of reviews for the place")
+    @conditional(lambda place_id: facade.collection_stamp("review", "place"))
+    @cached_response(lambda: facade.versions("review", "place"))
+    @serialize_list_with(review_response)
+    @ns.response(200, "List of reviews for the place", [review_response])
     @ns.response(404, "Place not found")
     def get(self, place_id):
         """Get all reviews for a specific place"""
@@ -0,0 +1,46 @@
+import json
+from functools import wraps
+from flask import Response, request, stream_with_context
+from flask_restx import abort, reqparse
+from app.api.v1.serialization import compile_serializer
+
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "json":   "application/json"
+}
+
+stream_parser = reqparse.RequestParser()
+stream_parser.add_argument("stream", type=str, location="args", choices=tuple(STREAM_FORMATS),
+                           help="Stream the whole collection as ndjson or a chunked JSON array")
+
+
+def _ndjson(records, serialize):
+    for record in records:
+        yield serialize(record) + "\n"
+
+
+def _json_array(records, serialize):
+    separator = "["
+    for record in records:
+        yield separator + serialize(record)
+        separator = ","
+    yield "[]\n" if separator == "[" else "]\n"
+
+
+def streamable(model, source):
+    """Serve ?stream=<format> requests one record at a time from source()"""
+    serialize = compile_serializer(model)
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            fmt = request.args.get("stream")
+            if fmt is None:
+                return f(*args, **kwargs)
+            if fmt not in STREAM_FORMATS:
+                abort(400, f"stream must be one of: {', '.join(STREAM_FORMATS)}")
+            writer = _ndjson if fmt == "ndjson" else _json_array
+            return Response(stream_with_context(writer(source(), serialize)),
+                            mimetype=STREAM_FORMATS[fmt])
+        return wrapper
+    return decorator
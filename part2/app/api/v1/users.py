@@ -1,6 +1,11 @@
 from flask import request
 from flask_restx import Namespace, Resource, fields
 from app import facade
+from app.api.v1.batch import batch_response, batch_result, read_batch
+from app.api.v1.caching import cached_response
+from app.api.v1.conditional import conditional
+from app.api.v1.pagination import pagination_parser, page_args, page_headers
+from app.api.v1.serialization import serialize_list_with
 
 ns = Namespace("users", description="User operations")
 
@@ -23,19 +28,44 @@ user_response = ns.model("UserResponse", {
 @ns.route("/")
 class UserList(Resource):
 
-    @ns.marshal_list_with(user_response)
+    @ns.expect(pagination_parser)
+    @conditional(lambda: facade.collection_stamp("user"))
+    @cached_response(lambda: facade.versions("user"))
+    @serialize_list_with(user_response)
+    @ns.response(200, "List of users retrieved successfully", [user_response])
     def get(self):
         """List all users (password excluded)"""
-        return facade.get_all_users(), 200
+        limit, after = page_args()
+        if limit is None:
+            return facade.get_all_users(), 200
+        users, next_key = facade.get_users_page(limit, after)
+        return users, 200, page_headers(next_key)
 
-    @ns.expect(user_model, validate=True)
+    @ns.expect(user_model, validate=False)
     @ns.response(201, "User created successfully")
     @ns.response(400, "Invalid input data")
     def post(self):
         """Create a new user"""
         try:
             user = facade.create_user(request.json)
-            return user.to_dict(), 201
+            return user.serialized(), 201
+        except ValueError as e:
+            ns.abort(400, str(e))
+
+
+user_batch_response = batch_response(ns, "UserBatchResponse")
+
+
+@ns.route("/batch")
+class UserBatch(Resource):
+
+    @ns.expect([user_model], validate=False)
+    @ns.marshal_with(user_batch_response, code=201)
+    @ns.response(400, "Invalid input data; no user was created")
+    def post(self):
+        """Create up to 10,000 users at once; the batch is applied entirely or not at all"""
+        try:
+            return batch_result(facade.create_users(read_batch())), 201
         except ValueError as e:
             ns.abort(400, str(e))
 
@@ -44,6 +74,7 @@ class UserList(Resource):
 @ns.param("user_id", "The user identifier")
 class UserResource(Resource):
 
+    @conditional(lambda user_id: facade.entity_stamp(facade.get_user(user_id)))
     @ns.response(200, "User found")
     @ns.response(404, "User not found")
     def get(self, user_id):
@@ -51,7 +82,7 @@ class UserResource(Resource):
         user = facade.get_user(user_id)
         if not user:
             ns.abort(404, "User not found")
-        return user.to_dict(), 200
+        return user.serialized(), 200
 
     @ns.expect(user_model, validate=False)
     @ns.response(200, "User updated successfully")
@@ -63,6 +94,6 @@ class UserResource(Resource):
             ns.abort(404, "User not found")
         try:
             updated = facade.update_user(user_id, request.json)
-            return updated.to_dict(), 200
+            return updated.serialized(), 200
         except ValueError as e:
             ns.abort(400, str(e))
@@ -0,0 +1,226 @@
+import asyncio
+import contextvars
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import unquote
+
+_END = object()
+
+
+def _environ(scope, body):
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD":    scope["method"],
+        "SCRIPT_NAME":       scope.get("root_path", ""),
+        "PATH_INFO":         scope["path"].encode().decode("latin-1"),
+        "QUERY_STRING":      scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME":       server[0],
+        "SERVER_PORT":       str(server[1]),
+        "SERVER_PROTOCOL":   f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR":       client[0],
+        "CONTENT_LENGTH":    str(len(body)),
+        "wsgi.version":      (1, 0),
+        "wsgi.url_scheme":   scope.get("scheme", "http"),
+        "wsgi.input":        io.BytesIO(body),
+        "wsgi.errors":       sys.stderr,
+        "wsgi.multithread":  True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once":     False
+    }
+    for name, value in scope.get("headers", ()):
+        key = name.decode("latin-1").upper().replace("-", "_")
+        if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = "HTTP_" + key
+        value = value.decode("latin-1")
+        environ[key] = f"{environ[key]},{value}" if key in environ and key.startswith("HTTP_") else value
+    return environ
+
+
+class ASGIApp:
+    """Serve a WSGI app (the Flask API) from an asyncio event loop.
+
+    Each request runs on a bounded thread pool, so blocking persistence
+    never stalls the loop: connections are parked on the loop for free
+    while at most ``max_workers`` handlers run. Responses with a known
+    length are built in one executor call; streamed ones (``?stream=``)
+    are pulled one chunk per call, so a slow client holds a socket, not a
+    thread. All calls for one request share a contextvars.Context so
+    Flask's request context survives the hops between pool threads.
+    """
+
+    def __init__(self, wsgi_app, max_workers=32):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="asgi")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            await self._http(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+
+        def run(fn, *args):
+            return loop.run_in_executor(self.executor, context.run, fn, *args)
+
+        status, headers, body, app_iter = await run(self._start, _environ(scope, b"".join(chunks)))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        if app_iter is None:
+            await send({"type": "http.response.body", "body": body})
+            return
+        try:
+            while True:
+                chunk = await run(next, app_iter, _END)
+                if chunk is _END:
+                    break
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            if hasattr(app_iter, "close"):
+                await run(app_iter.close)
+
+    def _start(self, environ):
+        """Call the WSGI app; drain the body here unless it is streamed"""
+        started = []
+
+        def start_response(status, headers, exc_info=None):
+            started[:] = [status, headers]
+            return lambda data: None
+
+        result = self.wsgi_app(environ, start_response)
+        app_iter = iter(result)
+        first = next(app_iter, b"")
+        status, headers = started
+        encoded = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+        code = int(status.split(" ", 1)[0])
+        if any(k == b"content-length" for k, _ in encoded):
+            body = first + b"".join(app_iter)
+            if hasattr(result, "close"):
+                result.close()
+            return code, encoded, body, None
+        return code, encoded, b"", _Prepend(first, app_iter, result)
+
+
+class _Prepend:
+    """Iterator yielding an already-read first chunk, then the rest of a WSGI body"""
+
+    def __init__(self, first, rest, result):
+        self._first  = first
+        self._rest   = rest
+        self._result = result
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._first is not None:
+            first, self._first = self._first, None
+            return first
+        return next(self._rest)
+
+    def close(self):
+        if hasattr(self._result, "close"):
+            self._result.close()
+
+
+async def _handle_connection(app, reader, writer):
+    """Minimal HTTP/1.1 keep-alive connection: Content-Length request bodies only"""
+    server = writer.get_extra_info("sockname")[:2]
+    client = writer.get_extra_info("peername")[:2]
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, version = lines[0].split(" ", 2)
+            headers = []
+            for line in lines[1:]:
+                if line:
+                    name, _, value = line.partition(":")
+                    headers.append((name.strip().lower().encode("latin-1"),
+                                    value.strip().encode("latin-1")))
+            fields = dict(headers)
+            body = await reader.readexactly(int(fields.get(b"content-length", 0)))
+            path, _, query = target.partition("?")
+            connection = fields.get(b"connection", b"").lower()
+            keep_alive = connection != b"close" if version == "HTTP/1.1" else connection == b"keep-alive"
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": version[5:],
+                "method": method, "scheme": "http", "path": unquote(path), "raw_path": path.encode(),
+                "query_string": query.encode("latin-1"), "root_path": "", "headers": headers,
+                "server": server, "client": client
+            }
+            received = False
+
+            async def receive():
+                nonlocal received
+                if received:
+                    return {"type": "http.disconnect"}
+                received = True
+                return {"type": "http.request", "body": body}
+
+            chunked = False
+
+            async def send(message):
+                nonlocal chunked
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    out = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n".encode()]
+                    out += [name + b": " + value + b"\r\n" for name, value in message["headers"]]
+                    if not any(name == b"content-length" for name, _ in message["headers"]):
+                        chunked = status not in (204, 304) and method != "HEAD"
+                        if chunked:
+                            out.append(b"transfer-encoding: chunked\r\n")
+                    if not keep_alive:
+                        out.append(b"connection: close\r\n")
+                    writer.write(b"".join(out) + b"\r\n")
+                else:
+                    data = message.get("body", b"")
+                    if chunked:
+                        if data:
+                            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+                        if not message.get("more_body"):
+                            writer.write(b"0\r\n\r\n")
+                    else:
+                        writer.write(data)
+                    await writer.drain()
+
+            await app(scope, receive, send)
+            if not keep_alive:
+                return
+    finally:
+        writer.close()
+
+
+async def serve(app, host="127.0.0.1", port=8000):
+    """Serve an ASGI app without a third-party server; prefer uvicorn/hypercorn in production"""
+    server = await asyncio.start_server(lambda r, w: _handle_connection(app, r, w), host, port,
+                                        backlog=1024)
+    async with server:
+        await server.serve_forever()
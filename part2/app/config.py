@@ -0,0 +1,22 @@
+import os
+
+
+class Config:
+    # "memory" keeps everything in process; "wal" persists to DATA_DIR;
+    # "sqlite" stores everything in the DATABASE file; "columnar" is memory
+    # plus packed number columns for analytics
+    STORAGE  = os.environ.get("HBNB_STORAGE", "memory")
+    DATA_DIR = os.environ.get("HBNB_DATA_DIR", "data")
+    # Memory-map snapshots and decode entities on first access
+    LAZY_LOAD = os.environ.get("HBNB_LAZY_LOAD", "1") == "1"
+    DATABASE = os.environ.get("HBNB_DATABASE", os.path.join(DATA_DIR, "hbnb.db"))
+    # Lock repositories for multi-threaded servers; "0" for one thread per process
+    THREAD_SAFE = os.environ.get("HBNB_THREAD_SAFE", "1") == "1"
+    # Unix socket of a store server (store.py); when set, this process keeps
+    # no data and forwards every facade call there
+    STORE_SOCKET = os.environ.get("HBNB_STORE_SOCKET")
+    # Request latency, facade timings and repository counters at GET /metrics
+    METRICS = os.environ.get("HBNB_METRICS", "1") == "1"
+    # File caching the Swagger document across restarts and workers; it is
+    # rebuilt when the application sources change. Unset: kept in memory only
+    SWAGGER_CACHE = os.environ.get("HBNB_SWAGGER_CACHE")
@@ -0,0 +1,148 @@
+import inspect
+import threading
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SCAN_BUCKETS    = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+CONTENT_TYPE    = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is one bisect and one locked increment"""
+
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts  = [0] * (len(self.buckets) + 1)
+        self.sum     = 0
+        self._lock   = threading.Lock()
+
+    def observe(self, value):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def snapshot(self):
+        """(buckets, per-bucket counts with +Inf last, sum), safe to pickle"""
+        with self._lock:
+            return self.buckets, tuple(self.counts), self.sum
+
+
+def _timed(method, histogram):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            histogram.observe(perf_counter() - start)
+    return wrapper
+
+
+def time_methods(obj, exclude=()):
+    """Wrap obj's public methods in place; returns {method name: Histogram}.
+
+    Generator functions are skipped: their call returns before any work.
+    Instance attributes shadow the class methods, so other instances and
+    ``type(obj)`` are untouched.
+    """
+    timings = {}
+    for name, member in inspect.getmembers(type(obj), inspect.isfunction):
+        if name.startswith("_") or name in exclude or inspect.isgeneratorfunction(member):
+            continue
+        timings[name] = Histogram()
+        setattr(obj, name, _timed(getattr(obj, name), timings[name]))
+    return timings
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{key}="{escape(value)}"' for key, value in labels.items())
+
+
+class _Exposition:
+    """Prometheus text format builder"""
+
+    def __init__(self):
+        self.lines = []
+
+    def _header(self, name, kind, help):
+        self.lines.append(f"# HELP {name} {help}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def scalar(self, name, kind, help, samples):
+        self._header(name, kind, help)
+        for labels, value in samples:
+            self.lines.append(f"{name}{{{_labels(**labels)}}} {value}")
+
+    def histogram(self, name, help, samples):
+        self._header(name, "histogram", help)
+        for labels, (buckets, counts, total) in samples:
+            prefix = _labels(**labels)
+            cumulative = 0
+            for bound, count in zip((*buckets, "+Inf"), counts):
+                cumulative += count
+                self.lines.append(f'{name}_bucket{{{prefix},le="{bound}"}} {cumulative}')
+            self.lines.append(f"{name}_sum{{{prefix}}} {total}")
+            self.lines.append(f"{name}_count{{{prefix}}} {cumulative}")
+
+    def text(self):
+        return "\n".join(self.lines) + "\n"
+
+
+def render(requests, snapshot):
+    """Prometheus text for request histograms and a facade metrics_snapshot()"""
+    out = _Exposition()
+    out.histogram("hbnb_request_duration_seconds",
+                  "Time from routing to response, by route and status",
+                  ((dict(method=method, route=route, status=status), histogram.snapshot())
+                   for (method, route, status), histogram in sorted(requests.items())))
+    out.histogram("hbnb_facade_call_duration_seconds", "Time spent in each facade method",
+                  ((dict(method=name), timing) for name, timing in sorted(snapshot["timings"].items())))
+    repositories = sorted(snapshot["repositories"].items())
+    out.scalar("hbnb_entities", "gauge", "Entities stored per repository",
+               ((dict(repository=name), stats["count"]) for name, stats in repositories))
+    out.scalar("hbnb_repository_operations_total", "counter", "Repository calls by operation",
+               ((dict(repository=name, op=op), count)
+                for name, stats in repositories for op, count in sorted(stats["ops"].items())))
+    out.histogram("hbnb_repository_scan_length",
+                  "Entities examined by lookups on attributes without an index",
+                  ((dict(repository=name), stats["scan_lengths"]) for name, stats in repositories))
+    return out.text()
+
+
+def init_metrics(app, facade):
+    """Record per-route latency on app and serve everything at GET /metrics.
+
+    Latency runs from routing to the end of the view, so it includes
+    payload validation, facade calls and marshalling; streamed responses
+    are timed until their body starts. Unmatched URLs share one route label.
+    """
+    # Imported here so the facade (which uses time_methods) loads without Flask
+    from flask import Response, g, request
+    requests = {}
+
+    @app.before_request
+    def start_timer():
+        g.request_start = perf_counter()
+
+    @app.after_request
+    def record_latency(response):
+        start = g.pop("request_start", None)
+        if start is not None:
+            rule = request.url_rule.rule if request.url_rule else "unmatched"
+            key = (request.method, rule, response.status_code)
+            histogram = requests.get(key) or requests.setdefault(key, Histogram())
+            histogram.observe(perf_counter() - start)
+        return response
+
+    def metrics():
+        return Response(render(requests, facade.metrics_snapshot()), content_type=CONTENT_TYPE)
+
+    app.add_url_rule("/metrics", "metrics", metrics)
+    return requests
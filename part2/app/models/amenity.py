@@ -1,14 +1,18 @@
 from app.models.base_model import BaseModel
+from app.models.validation import Field, compile_validator, text
 
 
 class Amenity(BaseModel):
+    __slots__ = ("name",)
+
+    FIELDS = {
+        "name": Field(str, required=True, check=text("Amenity name", 50))
+    }
+    validate = staticmethod(compile_validator(FIELDS))
+
     def __init__(self, name):
         super().__init__()
-        if not name or not name.strip():
-            raise ValueError("Amenity name is required")
-        if len(name) > 50:
-            raise ValueError("Amenity name must be 50 characters max")
-        self.name = name.strip()
+        self._assign(self.validate({"name": name}))
 
     def to_dict(self):
         base = super().to_dict()
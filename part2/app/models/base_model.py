@@ -1,15 +1,77 @@
+import sys
+import time
 import uuid
 from datetime import datetime
 
+_RECORD_BASE_FIELDS = frozenset({"id", "created_at", "updated_at", "version"})
+
 
 class BaseModel:
+    """Common fields for every entity, stored compactly.
+
+    Instances use ``__slots__`` instead of a per-instance ``__dict__``, IDs are
+    interned so foreign keys share the referenced string, and timestamps are
+    kept as epoch floats and exposed as ``datetime`` properties. ``version``
+    feeds the ETag and only save() moves it; like the other base slots it is
+    not in FIELDS, so update payloads cannot set it.
+    """
+
+    __slots__ = ("id", "_created", "_updated", "version", "_serialized")
+
+    # {name: Field} declared by each model; the only attributes updates may set
+    FIELDS = {}
+
     def __init__(self):
-        self.id         = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        now = time.time()
+        self.id         = sys.intern(str(uuid.uuid4()))
+        self._created   = now
+        self._updated   = now
+        self.version    = 1
+        self._serialized = None
+
+    @property
+    def created_at(self):
+        return datetime.fromtimestamp(self._created)
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created = value.timestamp()
+
+    @property
+    def updated_at(self):
+        return datetime.fromtimestamp(self._updated)
+
+    @updated_at.setter
+    def updated_at(self, value):
+        self._updated = value.timestamp()
+
+    @classmethod
+    def create(cls, data):
+        """New entity from a request payload, checked once by the class's validate()"""
+        obj = cls.__new__(cls)
+        BaseModel.__init__(obj)
+        obj._assign(cls.validate(data))
+        return obj
+
+    @classmethod
+    def check_update(cls, data):
+        """Check and normalize the fields present in an update payload"""
+        return cls.validate(data, partial=True)
+
+    def _assign(self, values):
+        for key, value in values.items():
+            setattr(self, key, value)
 
     def save(self):
-        self.updated_at = datetime.now()
+        self._updated    = time.time()
+        self.version    += 1
+        self._serialized = None
+
+    def serialized(self):
+        """Cached to_dict() result, rebuilt after save(); callers must not mutate it"""
+        if self._serialized is None:
+            self._serialized = self.to_dict()
+        return self._serialized
 
     def to_dict(self):
         return {
@@ -17,3 +79,28 @@ class BaseModel:
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat()
         }
+
+    def to_record(self):
+        """Lossless plain-data form used by persistent repositories"""
+        record = self.to_dict()
+        record.update(created_at=self._created, updated_at=self._updated, version=self.version)
+        return record
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild an entity from to_record() output without re-running validation"""
+        obj = cls.__new__(cls)
+        obj.id          = sys.intern(record["id"])
+        obj._created    = record["created_at"]
+        obj._updated    = record["updated_at"]
+        obj.version     = record.get("version", 1)
+        obj._serialized = None
+        for key, value in record.items():
+            if key not in _RECORD_BASE_FIELDS:
+                setattr(obj, key, value)
+        return obj
+
+
+def intern_id(value):
+    """Share one string object per ID across the entities referencing it"""
+    return sys.intern(value) if isinstance(value, str) else value
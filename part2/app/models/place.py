@@ -1,27 +1,79 @@
-from app.models.base_model import BaseModel
+import math
+import threading
+from app.models.base_model import BaseModel, intern_id
+from app.models.validation import NUMBER, Field, compile_validator, text
+
+
+# Interned amenity tuples, oldest first. Tuples cannot be weakly referenced,
+# so the table is bounded instead: past the limit the oldest combination is
+# forgotten, and places already holding it simply stop sharing with new ones
+SHARED_AMENITIES_MAX = 65_536
+_shared_amenities = {}
+_shared_lock = threading.Lock()
+
+
+def _check_price(price):
+    if not math.isfinite(price) or price <= 0:
+        raise ValueError("Price must be positive")
+    return float(price)
+
+
+def _check_latitude(latitude):
+    if not (-90 <= latitude <= 90):
+        raise ValueError("Latitude must be between -90 and 90")
+    return float(latitude)
+
+
+def _check_longitude(longitude):
+    if not (-180 <= longitude <= 180):
+        raise ValueError("Longitude must be between -180 and 180")
+    return float(longitude)
 
 
 class Place(BaseModel):
+    __slots__ = ("title", "description", "price", "latitude", "longitude",
+                 "_owner_id", "_amenities")
+
+    FIELDS = {
+        "title":       Field(str, required=True, check=text("Title", 100)),
+        "description": Field(str, default=""),
+        "price":       Field(NUMBER, required=True, check=_check_price),
+        "latitude":    Field(NUMBER, required=True, check=_check_latitude),
+        "longitude":   Field(NUMBER, required=True, check=_check_longitude),
+        "owner_id":    Field(str, required=True),
+        "amenities":   Field(list, default=(), item=str)
+    }
+    validate = staticmethod(compile_validator(FIELDS))
+
     def __init__(self, title, description, price, latitude, longitude, owner_id):
         super().__init__()
-        if not title or not title.strip():
-            raise ValueError("Title is required")
-        if len(title) > 100:
-            raise ValueError("Title must be 100 characters max")
-        if float(price) <= 0:
-            raise ValueError("Price must be positive")
-        if not (-90 <= float(latitude) <= 90):
-            raise ValueError("Latitude must be between -90 and 90")
-        if not (-180 <= float(longitude) <= 180):
-            raise ValueError("Longitude must be between -180 and 180")
-
-        self.title       = title.strip()
-        self.description = description or ""
-        self.price       = float(price)
-        self.latitude    = float(latitude)
-        self.longitude   = float(longitude)
-        self.owner_id    = owner_id
-        self.amenities   = []
+        self._assign(self.validate({"title": title, "description": description, "price": price,
+                                    "latitude": latitude, "longitude": longitude,
+                                    "owner_id": owner_id}))
+
+    @property
+    def owner_id(self):
+        return self._owner_id
+
+    @owner_id.setter
+    def owner_id(self, value):
+        self._owner_id = intern_id(value)
+
+    @property
+    def amenities(self):
+        return self._amenities
+
+    @amenities.setter
+    def amenities(self, value):
+        """Store amenity IDs as a tuple shared by every place with the same set"""
+        key = tuple(intern_id(aid) for aid in value or ())
+        shared = _shared_amenities.get(key)
+        if shared is None:
+            with _shared_lock:
+                if len(_shared_amenities) >= SHARED_AMENITIES_MAX:
+                    del _shared_amenities[next(iter(_shared_amenities))]
+                shared = _shared_amenities.setdefault(key, key)
+        self._amenities = shared
 
     def to_dict(self):
         base = super().to_dict()
@@ -32,6 +84,6 @@ class Place(BaseModel):
             "latitude":    self.latitude,
             "longitude":   self.longitude,
             "owner_id":    self.owner_id,
-            "amenities":   self.amenities
+            "amenities":   list(self.amenities)
         })
         return base
@@ -1,18 +1,44 @@
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, intern_id
+from app.models.validation import Field, compile_validator, text as _text
+
+
+def _check_rating(rating):
+    if not (1 <= rating <= 5):
+        raise ValueError("Rating must be an integer between 1 and 5")
+    return rating
 
 
 class Review(BaseModel):
+    __slots__ = ("text", "rating", "_place_id", "_user_id")
+
+    FIELDS = {
+        "text":     Field(str, required=True, check=_text("Review text")),
+        "rating":   Field(int, required=True, check=_check_rating),
+        "place_id": Field(str, required=True),
+        "user_id":  Field(str, required=True)
+    }
+    validate = staticmethod(compile_validator(FIELDS))
+
     def __init__(self, text, rating, place_id, user_id):
         super().__init__()
-        if not text or not text.strip():
-            raise ValueError("Review text is required")
-        if not isinstance(rating, int) or not (1 <= rating <= 5):
-            raise ValueError("Rating must be an integer between 1 and 5")
-
-        self.text     = text.strip()
-        self.rating   = rating
-        self.place_id = place_id
-        self.user_id  = user_id
+        self._assign(self.validate({"text": text, "rating": rating,
+                                    "place_id": place_id, "user_id": user_id}))
+
+    @property
+    def place_id(self):
+        return self._place_id
+
+    @place_id.setter
+    def place_id(self, value):
+        self._place_id = intern_id(value)
+
+    @property
+    def user_id(self):
+        return self._user_id
+
+    @user_id.setter
+    def user_id(self, value):
+        self._user_id = intern_id(value)
 
     def to_dict(self):
         base = super().to_dict()
@@ -1,26 +1,31 @@
 import re
 from app.models.base_model import BaseModel
+from app.models.validation import Field, compile_validator, text
+
+EMAIL_PATTERN = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w{2,}$')
+
+
+def _check_email(email):
+    if not EMAIL_PATTERN.match(email):
+        raise ValueError("Invalid email format")
+    return email.lower()
 
 
 class User(BaseModel):
+    __slots__ = ("first_name", "last_name", "email", "is_admin")
+
+    FIELDS = {
+        "first_name": Field(str, required=True, check=text("first_name", 50)),
+        "last_name":  Field(str, required=True, check=text("last_name", 50)),
+        "email":      Field(str, required=True, check=_check_email),
+        "is_admin":   Field(bool, default=False)
+    }
+    validate = staticmethod(compile_validator(FIELDS))
+
     def __init__(self, first_name, last_name, email, is_admin=False):
         super().__init__()
-        self.first_name = self._check_name(first_name, "first_name")
-        self.last_name  = self._check_name(last_name,  "last_name")
-        self.email      = self._check_email(email)
-        self.is_admin   = is_admin
-
-    def _check_name(self, value, field):
-        if not value or not value.strip():
-            raise ValueError(f"{field} is required")
-        if len(value) > 50:
-            raise ValueError(f"{field} must be 50 characters max")
-        return value.strip()
-
-    def _check_email(self, email):
-        if not email or not re.match(r'^[\w\.-]+@[\w\.-]+\.\w{2,}$', email):
-            raise ValueError("Invalid email format")
-        return email.lower()
+        self._assign(self.validate({"first_name": first_name, "last_name": last_name,
+                                    "email": email, "is_admin": is_admin}))
 
     def to_dict(self):
         base = super().to_dict()
@@ -0,0 +1,74 @@
+NUMBER = (int, float)
+
+_KINDS = {str: "a string", NUMBER: "a number", int: "an integer", bool: "a boolean", list: "a list"}
+_ITEM_KINDS = {str: "strings", NUMBER: "numbers", int: "integers", bool: "booleans"}
+
+
+class Field:
+    """One payload field: its JSON type, presence and an optional value check.
+
+    ``check`` receives a value of the right type and returns it normalized
+    (stripped, converted...) or raises ValueError. ``item`` is the element
+    type of a list field.
+    """
+
+    __slots__ = ("type", "required", "default", "check", "item")
+
+    def __init__(self, type, required=False, default=None, check=None, item=None):
+        self.type     = type
+        self.required = required
+        self.default  = default
+        self.check    = check
+        self.item     = item
+
+
+def text(label, max_length=None):
+    """Check for a non-blank string of at most max_length characters, returned stripped"""
+    def check(value):
+        if not value.strip():
+            raise ValueError(f"{label} is required")
+        if max_length is not None and len(value) > max_length:
+            raise ValueError(f"{label} must be {max_length} characters max")
+        return value.strip()
+    return check
+
+
+def compile_validator(fields):
+    """Build validate(data, partial=False) for a model's {name: Field}.
+
+    Everything about a field is resolved here, once per model class, so a
+    call is one pass over the declared fields with isinstance checks and the
+    model's own value checks. It returns a new dict with every declared
+    field, defaults filled in (null counts as missing). With partial=True, as
+    for updates, only the declared fields present are checked and returned;
+    other keys are dropped, so a payload never reaches bookkeeping slots such
+    as ``id`` or ``version``. Raises ValueError naming the first invalid field.
+    """
+    specs = {}
+    for name, field in fields.items():
+        specs[name] = (name, field.type, field.type is not bool, field.item, field.check,
+                       field.required, field.default,
+                       f"{name} must be {_KINDS[field.type]}",
+                       f"{name} must be a list of {_ITEM_KINDS.get(field.item)}")
+    plan = tuple(specs.values())
+
+    def checked(spec, value):
+        name, kind, strict, item, check, required, default, wrong_type, wrong_item = spec
+        if value is None:
+            if required:
+                raise ValueError(f"{name} is required")
+            return default
+        if not isinstance(value, kind) or (strict and value.__class__ is bool):
+            raise ValueError(wrong_type)
+        if item is not None and not all(isinstance(v, item) for v in value):
+            raise ValueError(wrong_item)
+        return value if check is None else check(value)
+
+    def validate(data, partial=False):
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object")
+        if partial:
+            return {key: checked(specs[key], value) for key, value in data.items() if key in specs}
+        return {spec[0]: checked(spec, data.get(spec[0])) for spec in plan}
+
+    return validate
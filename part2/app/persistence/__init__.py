@@ -0,0 +1,20 @@
+from functools import partial
+from app.persistence.repository import memory_repository
+
+
+def repository_factory(config):
+    """Pick the HBnBFacade repository factory named by config.STORAGE"""
+    if config.STORAGE == "memory":
+        return partial(memory_repository, thread_safe=config.THREAD_SAFE)
+    if config.STORAGE == "wal":
+        from app.persistence.wal import wal_repository_factory
+        return wal_repository_factory(config.DATA_DIR, lazy=config.LAZY_LOAD,
+                                      thread_safe=config.THREAD_SAFE)
+    if config.STORAGE == "sqlite":
+        from app.persistence.sqlite import sqlite_repository_factory
+        return sqlite_repository_factory(config.DATABASE, thread_safe=config.THREAD_SAFE)
+    if config.STORAGE == "columnar":
+        # Always locked: its queries hold views of the column buffers
+        from app.persistence.columnar import columnar_repository
+        return columnar_repository
+    raise ValueError(f"Unknown storage backend '{config.STORAGE}'")
@@ -0,0 +1,188 @@
+import math
+from array import array
+from app.models.validation import NUMBER
+from app.persistence.repository import InMemoryRepository
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AGGREGATES = ("count", "sum", "mean", "min", "max")
+
+
+class ColumnStore:
+    """Numeric attributes copied into contiguous float64 columns, one row per object.
+
+    Rows are kept dense: deleting an object moves the last row into its slot,
+    so every column stays a single packed array.
+
+    With numpy, readers get zero-copy views of the columns, and an array
+    cannot grow or shrink while a view of it is alive (BufferError). Views
+    must not outlive a read-locked section, which is why ColumnarRepository
+    is thread-safe by default. A failed insert leaves the store unchanged.
+    """
+
+    def __init__(self, columns):
+        self.attrs    = set(columns)
+        self.columns  = {name: array("d") for name in columns}
+        self._rows    = {}
+        self._row_ids = []
+
+    def __len__(self):
+        return len(self._row_ids)
+
+    def insert(self, obj):
+        values = [float(getattr(obj, name)) for name in self.columns]
+        appended = []
+        try:
+            for column, value in zip(self.columns.values(), values):
+                column.append(value)
+                appended.append(column)
+        except BufferError:
+            for column in appended:
+                column.pop()
+            raise
+        # Row bookkeeping only once every column has the new value
+        self._rows[obj.id] = len(self._row_ids)
+        self._row_ids.append(obj.id)
+
+    def remove(self, obj):
+        row = self._rows.pop(obj.id, None)
+        if row is None:
+            return
+        last = len(self._row_ids) - 1
+        if row != last:
+            moved = self._row_ids[last]
+            self._row_ids[row] = moved
+            self._rows[moved] = row
+            for column in self.columns.values():
+                column[row] = column[last]
+        self._row_ids.pop()
+        for column in self.columns.values():
+            column.pop()
+
+    def _vector(self, name):
+        return np.frombuffer(self.columns[name], dtype=np.float64)
+
+    def mask(self, ranges):
+        """Rows matching every (low, high) range, inclusive; None bounds are open"""
+        if np is not None:
+            selected = np.ones(len(self), dtype=bool)
+            for name, (low, high) in ranges.items():
+                values = self._vector(name)
+                if low is not None:
+                    selected &= values >= low
+                if high is not None:
+                    selected &= values <= high
+            return np.flatnonzero(selected)
+        rows = range(len(self))
+        for name, (low, high) in ranges.items():
+            column = self.columns[name]
+            rows = [row for row in rows
+                    if (low is None or column[row] >= low) and (high is None or column[row] <= high)]
+        return list(rows)
+
+    def ids(self, rows):
+        return [self._row_ids[row] for row in rows]
+
+    def aggregate(self, name, func, rows=None):
+        if func not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate '{func}'")
+        if np is not None:
+            values = self._vector(name) if rows is None else self._vector(name)[rows]
+            if func == "count":
+                return int(values.size)
+            if not values.size:
+                return None
+            return float(getattr(np, func)(values))
+        column = self.columns[name]
+        values = list(column) if rows is None else [column[row] for row in rows]
+        if func == "count":
+            return len(values)
+        if not values:
+            return None
+        if func == "mean":
+            return math.fsum(values) / len(values)
+        return {"sum": math.fsum, "min": min, "max": max}[func](values)
+
+    def value_counts(self, name, rows=None):
+        if np is not None:
+            values = self._vector(name) if rows is None else self._vector(name)[rows]
+            uniques, counts = np.unique(values, return_counts=True)
+            return dict(zip(uniques.tolist(), counts.tolist()))
+        column = self.columns[name]
+        counts = {}
+        for row in (range(len(self)) if rows is None else rows):
+            counts[column[row]] = counts.get(column[row], 0) + 1
+        return dict(sorted(counts.items()))
+
+    def grouped(self, value, by, bin_size, func="mean", rows=None):
+        """Aggregate value per cell of the by-columns, each cut into bin_size buckets"""
+        if np is not None:
+            if rows is None:
+                rows = np.arange(len(self))
+            if not len(rows):
+                return {}
+            keys = np.stack([np.floor(self._vector(name)[rows] / bin_size) for name in by], axis=1)
+            cells, inverse = np.unique(keys, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            if func in ("count", "sum", "mean"):
+                counts = np.bincount(inverse)
+                sums = np.bincount(inverse, weights=self._vector(value)[rows])
+                totals = {"count": counts, "sum": sums, "mean": sums / counts}[func]
+                values = [int(v) if func == "count" else float(v) for v in totals]
+            else:
+                values = [self.aggregate(value, func, rows[inverse == i]) for i in range(len(cells))]
+            return {tuple((cell * bin_size).tolist()): v for cell, v in zip(cells, values)}
+        groups = {}
+        for row in (range(len(self)) if rows is None else rows):
+            key = tuple(float(math.floor(self.columns[name][row] / bin_size) * bin_size)
+                        for name in by)
+            groups.setdefault(key, []).append(row)
+        return {key: self.aggregate(value, func, members) for key, members in sorted(groups.items())}
+
+
+def numeric_fields(model):
+    """Names of the model's number fields, the columns columnar_repository keeps"""
+    return tuple(name for name, field in model.FIELDS.items() if field.type in (NUMBER, int))
+
+
+def columnar_repository(name, model, columns=None, **options):
+    """HBnBFacade repository factory keeping each model's number fields in columns"""
+    return ColumnarRepository(numeric_fields(model) if columns is None else columns, **options)
+
+
+class ColumnarRepository(InMemoryRepository):
+    """InMemoryRepository that also keeps numeric fields in packed columns.
+
+    get/get_all and the rest of the Repository contract behave exactly as in
+    InMemoryRepository; filter_range, aggregate, value_counts and grouped
+    answer analytics queries from the columns without touching the objects.
+    Thread-safe by default: queries read column views under ``lock``.
+    """
+
+    def __init__(self, columns, unique_indexes=(), indexes=(), thread_safe=True):
+        super().__init__(unique_indexes=unique_indexes, indexes=indexes, thread_safe=thread_safe)
+        self.column_store = self.attach_index(ColumnStore(columns))
+
+    def filter_range(self, **ranges):
+        """Objects whose columns fall inside every given (low, high) range"""
+        store = self.column_store
+        with self.lock.read():
+            return [self._storage[obj_id] for obj_id in store.ids(store.mask(ranges))]
+
+    def aggregate(self, column, func="mean", **ranges):
+        store = self.column_store
+        with self.lock.read():
+            return store.aggregate(column, func, store.mask(ranges) if ranges else None)
+
+    def value_counts(self, column, **ranges):
+        store = self.column_store
+        with self.lock.read():
+            return store.value_counts(column, store.mask(ranges) if ranges else None)
+
+    def grouped(self, value, by, bin_size=1.0, func="mean", **ranges):
+        store = self.column_store
+        with self.lock.read():
+            return store.grouped(value, by, bin_size, func, store.mask(ranges) if ranges else None)
@@ -0,0 +1,132 @@
+from bisect import bisect_left, bisect_right, insort
+
+
+class SortedIndex:
+    """Objects ordered by one attribute, for range queries with bisect"""
+
+    def __init__(self, attr_name):
+        self.attrs     = {attr_name}
+        self.attr_name = attr_name
+        self._entries  = []
+        self._keys     = {}
+
+    def insert(self, obj):
+        key = (getattr(obj, self.attr_name), obj.id)
+        self._keys[obj.id] = key
+        insort(self._entries, key)
+
+    def insert_many(self, objs):
+        """Insert a batch with one sort instead of one insort per object"""
+        keys = [(getattr(obj, self.attr_name), obj.id) for obj in objs]
+        self._keys.update((key[1], key) for key in keys)
+        self._entries.extend(keys)
+        self._entries.sort()
+
+    def remove(self, obj):
+        key = self._keys.pop(obj.id, None)
+        if key is not None:
+            del self._entries[bisect_left(self._entries, key)]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _bounds(self, low, high):
+        start = 0 if low is None else bisect_left(self._entries, (low,))
+        stop = len(self._entries) if high is None else bisect_right(self._entries, (high, chr(0x10FFFF)))
+        return start, max(start, stop)
+
+    def count(self, low=None, high=None):
+        start, stop = self._bounds(low, high)
+        return stop - start
+
+    def range(self, low=None, high=None):
+        """IDs whose value is within [low, high], in ascending value order"""
+        start, stop = self._bounds(low, high)
+        return [obj_id for _, obj_id in self._entries[start:stop]]
+
+
+class MultiValueIndex:
+    """Posting sets for a list-valued attribute: value -> IDs containing it"""
+
+    def __init__(self, attr_name):
+        self.attrs     = {attr_name}
+        self.attr_name = attr_name
+        self._postings = {}
+        self._values   = {}
+
+    def insert(self, obj):
+        values = frozenset(getattr(obj, self.attr_name) or ())
+        self._values[obj.id] = values
+        for value in values:
+            self._postings.setdefault(value, set()).add(obj.id)
+
+    def remove(self, obj):
+        for value in self._values.pop(obj.id, ()):
+            ids = self._postings[value]
+            ids.discard(obj.id)
+            if not ids:
+                del self._postings[value]
+
+    def postings(self, value):
+        return self._postings.get(value, frozenset())
+
+
+class HistogramIndex:
+    """Running count, sum and value histogram per group, ranked by average"""
+
+    def __init__(self, group_attr, value_attr):
+        self.attrs      = {group_attr, value_attr}
+        self.group_attr = group_attr
+        self.value_attr = value_attr
+        self._stats     = {}
+        self._ranking   = []
+        self._rank_keys = {}
+
+    def _rerank(self, group, stats):
+        old = self._rank_keys.pop(group, None)
+        if old is not None:
+            del self._ranking[bisect_left(self._ranking, old)]
+        count, total, _ = stats
+        if count:
+            key = (-total / count, -count, group)
+            self._rank_keys[group] = key
+            insort(self._ranking, key)
+
+    def insert(self, obj):
+        group = getattr(obj, self.group_attr)
+        value = getattr(obj, self.value_attr)
+        stats = self._stats.setdefault(group, [0, 0, {}])
+        stats[0] += 1
+        stats[1] += value
+        stats[2][value] = stats[2].get(value, 0) + 1
+        self._rerank(group, stats)
+
+    def remove(self, obj):
+        group = getattr(obj, self.group_attr)
+        value = getattr(obj, self.value_attr)
+        stats = self._stats.get(group)
+        if stats is None:
+            return
+        stats[0] -= 1
+        stats[1] -= value
+        stats[2][value] -= 1
+        if not stats[2][value]:
+            del stats[2][value]
+        self._rerank(group, stats)
+        if not stats[0]:
+            del self._stats[group]
+
+    def stats(self, group):
+        """(count, sum, histogram) for a group; zeros when it has no entries"""
+        count, total, histogram = self._stats.get(group, (0, 0, {}))
+        return count, total, dict(histogram)
+
+    def top(self, limit, min_count=1, accept=None):
+        """Groups with the highest average first, ties broken by count"""
+        groups = []
+        for _, neg_count, group in self._ranking:
+            if -neg_count >= min_count and (accept is None or accept(group)):
+                groups.append(group)
+                if len(groups) == limit:
+                    break
+        return groups
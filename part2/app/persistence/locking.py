@@ -0,0 +1,103 @@
+import threading
+from threading import get_ident
+
+
+class _Guard:
+    __slots__ = ("_enter", "_exit")
+
+    def __init__(self, enter, exit):
+        self._enter = enter
+        self._exit  = exit
+
+    def __enter__(self):
+        self._enter()
+
+    def __exit__(self, *exc):
+        self._exit()
+
+
+class RWLock:
+    """Readers-writer lock: many readers or one writer, writers first.
+
+    ``with lock.read():`` and ``with lock.write():`` are both reentrant, and
+    a thread holding the write lock may also read. New readers wait while a
+    writer is waiting, so a stream of reads cannot starve writes. Upgrading
+    a held read lock to a write lock would deadlock and raises RuntimeError.
+    """
+
+    def __init__(self):
+        self._cond    = threading.Condition(threading.Lock())
+        self._readers = {}
+        self._writer  = None
+        self._depth   = 0
+        self._waiting = 0
+        self._read_guard  = _Guard(self.acquire_read, self.release_read)
+        self._write_guard = _Guard(self.acquire_write, self.release_write)
+
+    def read(self):
+        return self._read_guard
+
+    def write(self):
+        return self._write_guard
+
+    def acquire_read(self):
+        me = get_ident()
+        with self._cond:
+            if self._writer != me and me not in self._readers:
+                while self._writer is not None or self._waiting:
+                    self._cond.wait()
+            self._readers[me] = self._readers.get(me, 0) + 1
+
+    def release_read(self):
+        me = get_ident()
+        with self._cond:
+            depth = self._readers[me] - 1
+            if depth:
+                self._readers[me] = depth
+                return
+            del self._readers[me]
+            if not self._readers and self._waiting:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        me = get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            self._waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting -= 1
+            self._writer = me
+            self._depth  = 1
+
+    def release_write(self):
+        with self._cond:
+            self._depth -= 1
+            if not self._depth:
+                self._writer = None
+                self._cond.notify_all()
+
+
+class NullLock:
+    """Same interface as RWLock for single-threaded use; never blocks"""
+
+    _guard = _Guard(lambda: None, lambda: None)
+
+    def read(self):
+        return self._guard
+
+    def write(self):
+        return self._guard
+
+
+NULL_LOCK = NullLock()
+
+
+def make_lock(thread_safe):
+    return RWLock() if thread_safe else NULL_LOCK
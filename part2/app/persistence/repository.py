@@ -1,54 +1,387 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_right, insort
+from collections import Counter
+from datetime import datetime
+from app.metrics import SCAN_BUCKETS, Histogram
+from app.persistence.locking import make_lock
+
+# Never set by updates on objects that do not declare their FIELDS
+_BOOKKEEPING = frozenset({"id", "version", "created_at", "updated_at"})
+
+
+def updatable_changes(obj, data):
+    """The entries of an update payload that may be set on obj.
+
+    Models only accept their declared FIELDS, so IDs, versions, timestamps
+    and private slots are out of reach of update payloads. Other objects
+    accept their existing public attributes except that bookkeeping.
+    """
+    fields = getattr(type(obj), "FIELDS", None)
+    if fields is not None:
+        return {key: value for key, value in data.items() if key in fields}
+    return {key: value for key, value in data.items()
+            if key not in _BOOKKEEPING and not key.startswith("_") and hasattr(obj, key)}
 
 
 class Repository(ABC):
     @abstractmethod
     def add(self, obj): pass
 
+    @abstractmethod
+    def add_many(self, objs): pass
+
     @abstractmethod
     def get(self, obj_id): pass
 
+    @abstractmethod
+    def get_many(self, obj_ids): pass
+
     @abstractmethod
     def get_all(self): pass
 
     @abstractmethod
     def update(self, obj_id, data): pass
 
+    @abstractmethod
+    def update_many(self, updates): pass
+
     @abstractmethod
     def delete(self, obj_id): pass
 
     @abstractmethod
     def get_by_attribute(self, attr_name, attr_value): pass
 
+    @abstractmethod
+    def get_page(self, limit, after=None): pass
+
+    @abstractmethod
+    def iter_all(self, batch_size=500): pass
+
+    @abstractmethod
+    def count(self): pass
+
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """Dict-backed repository with optional secondary indexes.
+
+    Unique indexes map a value to a single object ID and reject duplicates;
+    non-unique indexes map a value to the matching object IDs, kept in
+    insertion order so one-to-many lookups return stable results.
+
+    Every object is also kept in a list sorted by ``(created_at, id)`` so
+    keyset pages can be sliced with a bisect instead of a scan.
+
+    Other index structures can be attached with ``attach_index``; they must
+    expose ``attrs`` (the attributes they depend on), ``insert(obj)`` and
+    ``remove(obj)``, and are kept in sync on every write. ``add_many`` uses
+    their ``insert_many(objs)`` when they provide one.
+
+    ``add_many`` and ``update_many`` check every unique index for the whole
+    batch before changing anything, so a batch is applied entirely or not
+    at all.
+
+    ``version`` is bumped and ``last_modified`` refreshed on every write so
+    callers can stamp caches and conditional responses.
+
+    With ``thread_safe=True`` writes hold ``lock`` (an RWLock) exclusively
+    and scans and index lookups share it; ``get`` is a single dict lookup
+    and takes no lock. Callers can hold ``lock`` themselves to make several
+    calls atomic, e.g. a check followed by a write.
+
+    ``stats`` counts calls by operation (``get`` is not counted) and
+    ``scan_lengths`` records how many entities each lookup on an attribute
+    without an index examined. Counts taken under a shared read lock may
+    miss an increment when two readers race; they are meant for metrics.
+    """
+
+    def __init__(self, unique_indexes=(), indexes=(), thread_safe=False):
+        self.lock     = make_lock(thread_safe)
         self._storage = {}
+        self.version  = 0
+        self.last_modified = datetime.now()
+        self._unique  = {}
+        self._indexes = {}
+        self._order   = []
+        self._order_keys = {}
+        self._attached   = []
+        self.stats        = Counter()
+        self.scan_lengths = Histogram(SCAN_BUCKETS)
+        for attr_name in unique_indexes:
+            self.add_index(attr_name, unique=True)
+        for attr_name in indexes:
+            self.add_index(attr_name)
 
-    def add(self, obj):
+    def add_index(self, attr_name, unique=False):
+        with self.lock.write():
+            if unique:
+                index = {}
+                for obj in self._storage.values():
+                    value = getattr(obj, attr_name, None)
+                    if value in index:
+                        raise ValueError(f"Duplicate value for unique index '{attr_name}'")
+                    index[value] = obj.id
+                self._unique[attr_name] = index
+            else:
+                index = {}
+                for obj in self._storage.values():
+                    index.setdefault(getattr(obj, attr_name, None), {})[obj.id] = None
+                self._indexes[attr_name] = index
+
+    def _touch(self):
+        self.version += 1
+        self.last_modified = datetime.now()
+
+    def attach_index(self, index):
+        with self.lock.write():
+            for obj in self._storage.values():
+                index.insert(obj)
+            self._attached.append(index)
+            return index
+
+    def _check_unique(self, obj_id, values):
+        for attr_name, value in values.items():
+            index = self._unique.get(attr_name)
+            if index is None:
+                continue
+            owner = index.get(value)
+            if owner is not None and owner != obj_id:
+                raise ValueError(f"Duplicate value for unique index '{attr_name}'")
+
+    def _index(self, obj, attr_names):
+        for attr_name in attr_names:
+            value = getattr(obj, attr_name, None)
+            if attr_name in self._unique:
+                self._unique[attr_name][value] = obj.id
+            if attr_name in self._indexes:
+                self._indexes[attr_name].setdefault(value, {})[obj.id] = None
+
+    def _unindex(self, obj, attr_names):
+        for attr_name in attr_names:
+            value = getattr(obj, attr_name, None)
+            if attr_name in self._unique and self._unique[attr_name].get(value) == obj.id:
+                del self._unique[attr_name][value]
+            if attr_name in self._indexes:
+                ids = self._indexes[attr_name].get(value)
+                if ids is not None:
+                    ids.pop(obj.id, None)
+                    if not ids:
+                        del self._indexes[attr_name][value]
+
+    def _indexed_attrs(self):
+        return self._unique.keys() | self._indexes.keys()
+
+    def _insert(self, obj, indexed):
         self._storage[obj.id] = obj
+        self._index(obj, indexed)
+        for index in self._attached:
+            index.insert(obj)
+        key = (obj.created_at, obj.id)
+        self._order_keys[obj.id] = key
+        if not self._order or self._order[-1] < key:
+            self._order.append(key)
+        else:
+            insort(self._order, key)
+
+    def add(self, obj):
+        with self.lock.write():
+            self.stats["add"] += 1
+            self._check_unique(obj.id, {
+                attr_name: getattr(obj, attr_name, None) for attr_name in self._unique
+            })
+            self._touch()
+            self._insert(obj, self._indexed_attrs())
+
+    def _check_unique_batch(self, changes):
+        """Check (obj_id, values) pairs against the unique indexes and each other"""
+        for attr_name, index in self._unique.items():
+            moved = {obj_id for obj_id, values in changes if attr_name in values}
+            claimed = set()
+            for obj_id, values in changes:
+                if attr_name not in values:
+                    continue
+                value = values[attr_name]
+                owner = index.get(value)
+                if value in claimed or (owner is not None and owner != obj_id
+                                        and owner not in moved):
+                    raise ValueError(f"Duplicate value for unique index '{attr_name}'")
+                claimed.add(value)
+
+    def add_many(self, objs):
+        with self.lock.write():
+            self.stats["add_many"] += 1
+            objs = list(objs)
+            if len({obj.id for obj in objs}) != len(objs) or any(
+                    obj.id in self._storage for obj in objs):
+                raise ValueError("Duplicate ID in batch")
+            self._check_unique_batch([
+                (obj.id, {attr_name: getattr(obj, attr_name, None) for attr_name in self._unique})
+                for obj in objs
+            ])
+            if not objs:
+                return
+            self._touch()
+            storage = self._storage
+            indexed = self._indexed_attrs()
+            keys = []
+            for obj in objs:
+                storage[obj.id] = obj
+                self._index(obj, indexed)
+                keys.append((obj.created_at, obj.id))
+            for index in self._attached:
+                insert_many = getattr(index, "insert_many", None)
+                if insert_many is not None:
+                    insert_many(objs)
+                else:
+                    for obj in objs:
+                        index.insert(obj)
+            self._order_keys.update((key[1], key) for key in keys)
+            # One sort of the appended run beats an insort per key (timsort
+            # merges the two sorted runs)
+            self._order.extend(keys)
+            self._order.sort()
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
 
+    def get_many(self, obj_ids):
+        with self.lock.read():
+            self.stats["get_many"] += 1
+            storage = self._storage
+            return {obj_id: storage[obj_id] for obj_id in obj_ids if obj_id in storage}
+
     def get_all(self):
-        return list(self._storage.values())
+        with self.lock.read():
+            self.stats["get_all"] += 1
+            return list(self._storage.values())
 
-    def update(self, obj_id, data):
-        obj = self.get(obj_id)
-        if obj:
-            for key, value in data.items():
-                if hasattr(obj, key):
-                    setattr(obj, key, value)
+    def _apply(self, obj, changes):
+        """Set changes on obj and save it; if that fails, obj gets its old values back.
+
+        Either way every index is left holding obj under its current values.
+        """
+        indexed = self._indexed_attrs() & changes.keys()
+        attached = [index for index in self._attached if index.attrs & changes.keys()]
+        old = {key: getattr(obj, key) for key in changes}
+        self._unindex(obj, indexed)
+        for index in attached:
+            index.remove(obj)
+        try:
+            for key, value in changes.items():
+                setattr(obj, key, value)
             obj.save()
+        except BaseException:
+            for key, value in old.items():
+                setattr(obj, key, value)
+            raise
+        finally:
+            self._index(obj, indexed)
+            for index in attached:
+                index.insert(obj)
+
+    def update(self, obj_id, data):
+        with self.lock.write():
+            self.stats["update"] += 1
+            obj = self.get(obj_id)
+            if obj:
+                changes = updatable_changes(obj, data)
+                self._check_unique(obj_id, changes)
+                self._touch()
+                self._apply(obj, changes)
+
+    def update_many(self, updates):
+        """Apply (obj_id, data) pairs as one batch and return the updated objects.
+
+        Unknown IDs are skipped. Unique values may move between objects of
+        the same batch (e.g. two users swapping emails).
+        """
+        with self.lock.write():
+            self.stats["update_many"] += 1
+            batch = []
+            for obj_id, data in updates:
+                obj = self.get(obj_id)
+                if obj:
+                    batch.append((obj, updatable_changes(obj, data)))
+            self._check_unique_batch([(obj.id, changes) for obj, changes in batch])
+            if not batch:
+                return []
+            self._touch()
+            for obj, changes in batch:
+                self._unindex(obj, self._unique.keys() & changes.keys())
+            for i, (obj, changes) in enumerate(batch):
+                try:
+                    self._apply(obj, changes)
+                except BaseException:
+                    # The failed object re-indexed itself; restore the unique
+                    # entries of the ones not reached yet
+                    for later, later_changes in batch[i + 1:]:
+                        self._index(later, self._unique.keys() & later_changes.keys())
+                    raise
+            return [obj for obj, _ in batch]
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        with self.lock.write():
+            self.stats["delete"] += 1
+            obj = self._storage.pop(obj_id, None)
+            if obj is not None:
+                self._touch()
+                self._unindex(obj, self._indexed_attrs())
+                for index in self._attached:
+                    index.remove(obj)
+                key = self._order_keys.pop(obj_id)
+                del self._order[bisect_right(self._order, key) - 1]
 
     def get_by_attribute(self, attr_name, attr_value):
-        return next(
-            (obj for obj in self._storage.values()
-             if getattr(obj, attr_name, None) == attr_value),
-            None
-        )
+        with self.lock.read():
+            if attr_name in self._unique:
+                self.stats["index_lookup"] += 1
+                return self.get(self._unique[attr_name].get(attr_value))
+            if attr_name in self._indexes:
+                self.stats["index_lookup"] += 1
+                ids = self._indexes[attr_name].get(attr_value)
+                return self.get(next(iter(ids))) if ids else None
+            self.stats["scan"] += 1
+            scanned = 0
+            found = None
+            for obj in self._storage.values():
+                scanned += 1
+                if getattr(obj, attr_name, None) == attr_value:
+                    found = obj
+                    break
+            self.scan_lengths.observe(scanned)
+            return found
+
+    def filter_by_attribute(self, attr_name, attr_value):
+        with self.lock.read():
+            if attr_name in self._indexes:
+                self.stats["index_lookup"] += 1
+                return [self._storage[obj_id]
+                        for obj_id in self._indexes[attr_name].get(attr_value, ())]
+            self.stats["scan"] += 1
+            self.scan_lengths.observe(len(self._storage))
+            return [obj for obj in self._storage.values()
+                    if getattr(obj, attr_name, None) == attr_value]
+
+    def get_page(self, limit, after=None):
+        with self.lock.read():
+            self.stats["get_page"] += 1
+            start = bisect_right(self._order, after) if after else 0
+            keys = self._order[start:start + limit]
+            next_key = keys[-1] if start + limit < len(self._order) else None
+            return [self._storage[obj_id] for _, obj_id in keys], next_key
+
+    def iter_all(self, batch_size=500):
+        """Yield every object in keyset order, tolerating writes between batches"""
+        after = None
+        while True:
+            batch, after = self.get_page(batch_size, after)
+            yield from batch
+            if after is None:
+                return
+
+    def count(self):
+        return len(self._storage)
+
+
+def memory_repository(name, model, **options):
+    """Default repository factory for HBnBFacade"""
+    return InMemoryRepository(**options)
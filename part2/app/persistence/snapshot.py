@@ -0,0 +1,97 @@
+import json
+import mmap
+import os
+import struct
+
+MAGIC    = b"HBNBSNP1"
+ID_WIDTH = 36
+HEADER   = struct.Struct("<8sQQ")
+ENTRY    = struct.Struct(f"<{ID_WIDTH}sQI")
+
+
+def _key(obj_id):
+    key = obj_id.encode()
+    if len(key) > ID_WIDTH:
+        raise ValueError(f"ID longer than {ID_WIDTH} bytes: {obj_id}")
+    return key.ljust(ID_WIDTH, b"\0")
+
+
+def write_snapshot(path, records):
+    """Write records as a binary snapshot and fsync it.
+
+    Layout: a header (magic, record count, index offset), the records as JSON
+    lines, then one fixed-width index entry (padded ID, offset, length) per
+    record, sorted by ID so a reader can binary-search it in place.
+    """
+    entries = []
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+        offset = HEADER.size
+        for record in records:
+            line = json.dumps(record, separators=(",", ":")).encode() + b"\n"
+            entries.append((_key(record["id"]), offset, len(line)))
+            f.write(line)
+            offset += len(line)
+        entries.sort()
+        for entry in entries:
+            f.write(ENTRY.pack(*entry))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(entries), offset))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class SnapshotReader:
+    """Memory-mapped view of a snapshot; records are decoded only when asked for"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self._index_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not an HBnB snapshot")
+
+    def __len__(self):
+        return self.count
+
+    def _entry(self, i):
+        return ENTRY.unpack_from(self._mm, self._index_offset + i * ENTRY.size)
+
+    def _find(self, obj_id):
+        """(offset, length) of obj_id's record, or None; nothing is decoded"""
+        key = _key(obj_id)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._index_offset + mid * ENTRY.size
+            if self._mm[start:start + ID_WIDTH] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.count:
+            return None
+        entry_key, offset, length = self._entry(lo)
+        if entry_key != key:
+            return None
+        return offset, length
+
+    def __contains__(self, obj_id):
+        return self._find(obj_id) is not None
+
+    def get(self, obj_id):
+        found = self._find(obj_id)
+        if found is None:
+            return None
+        offset, length = found
+        return json.loads(self._mm[offset:offset + length])
+
+    def __iter__(self):
+        pos = HEADER.size
+        while pos < self._index_offset:
+            end = self._mm.find(b"\n", pos, self._index_offset)
+            yield json.loads(self._mm[pos:end])
+            pos = end + 1
+
+    def close(self):
+        self._mm.close()
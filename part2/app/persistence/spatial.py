@@ -0,0 +1,98 @@
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE   = 111.32
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    """Fixed-size lat/lon grid over objects, for bounding-box and radius queries.
+
+    Each object lives in exactly one cell; a query only visits the cells that
+    overlap its box (or the occupied cells, whichever is fewer).
+    """
+
+    def __init__(self, lat_attr="latitude", lon_attr="longitude", cell_deg=0.1):
+        self.attrs    = {lat_attr, lon_attr}
+        self.lat_attr = lat_attr
+        self.lon_attr = lon_attr
+        self.cell_deg = cell_deg
+        self._cells     = {}
+        self._positions = {}
+
+    def _cell(self, lat, lon):
+        return (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+
+    def insert(self, obj):
+        lat = getattr(obj, self.lat_attr)
+        lon = getattr(obj, self.lon_attr)
+        cell = self._cell(lat, lon)
+        self._cells.setdefault(cell, {})[obj.id] = (lat, lon)
+        self._positions[obj.id] = cell
+
+    def remove(self, obj):
+        cell = self._positions.pop(obj.id, None)
+        if cell is None:
+            return
+        members = self._cells[cell]
+        del members[obj.id]
+        if not members:
+            del self._cells[cell]
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _lon_ranges(self, min_lon, max_lon):
+        if max_lon - min_lon >= 360:
+            return [(-180.0, 180.0)]
+        if min_lon < -180:
+            return [(min_lon + 360, 180.0), (-180.0, max_lon)]
+        if max_lon > 180:
+            return [(min_lon, 180.0), (-180.0, max_lon - 360)]
+        if min_lon > max_lon:
+            return [(min_lon, 180.0), (-180.0, max_lon)]
+        return [(min_lon, max_lon)]
+
+    def _scan_box(self, min_lat, min_lon, max_lat, max_lon):
+        lo_x, lo_y = self._cell(min_lat, min_lon)
+        hi_x, hi_y = self._cell(max_lat, max_lon)
+        if (hi_x - lo_x + 1) * (hi_y - lo_y + 1) > len(self._cells):
+            cells = (members for (x, y), members in self._cells.items()
+                     if lo_x <= x <= hi_x and lo_y <= y <= hi_y)
+        else:
+            cells = (self._cells[(x, y)]
+                     for x in range(lo_x, hi_x + 1)
+                     for y in range(lo_y, hi_y + 1)
+                     if (x, y) in self._cells)
+        for members in cells:
+            for obj_id, (lat, lon) in members.items():
+                if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon:
+                    yield obj_id, lat, lon
+
+    def within_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """IDs inside the box; min_lon > max_lon means the box crosses the antimeridian"""
+        return [obj_id
+                for lo, hi in self._lon_ranges(min_lon, max_lon)
+                for obj_id, _, _ in self._scan_box(min_lat, lo, max_lat, hi)]
+
+    def nearby(self, lat, lon, radius_km):
+        """(distance_km, id) pairs within radius_km of (lat, lon), nearest first"""
+        dlat = radius_km / KM_PER_DEGREE
+        min_lat, max_lat = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+        dlon = 360.0 if cos_lat < 1e-9 else radius_km / (KM_PER_DEGREE * cos_lat)
+        hits = []
+        for lo, hi in self._lon_ranges(lon - dlon, lon + dlon):
+            for obj_id, p_lat, p_lon in self._scan_box(min_lat, lo, max_lat, hi):
+                distance = haversine_km(lat, lon, p_lat, p_lon)
+                if distance <= radius_km:
+                    hits.append((distance, obj_id))
+        hits.sort()
+        return hits
@@ -0,0 +1,331 @@
+import json
+import os
+import sqlite3
+import threading
+import weakref
+from collections import Counter
+from datetime import datetime
+from app.metrics import SCAN_BUCKETS, Histogram
+from app.persistence.locking import make_lock
+from app.persistence.repository import Repository, updatable_changes
+
+_KEY_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def _order_key(created_at):
+    """Sortable text form of created_at, matching InMemoryRepository's ordering"""
+    return created_at.strftime(_KEY_FORMAT)
+
+
+def sqlite_repository_factory(database, **options):
+    """Repository factory for HBnBFacade keeping every repository in one SQLite file"""
+    def make(name, model, **index_options):
+        return SQLiteRepository(database, name, model, **index_options, **options)
+    return make
+
+
+class _ThreadConnection:
+    """Holds one thread's connection; collected with the thread's local data"""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+def _release(conn, connections, pool_lock):
+    with pool_lock:
+        if conn in connections:
+            connections.remove(conn)
+    conn.close()
+
+
+class SQLiteRepository(Repository):
+    """Repository stored in a SQLite table, one row per entity.
+
+    Each thread gets its own connection (opened on first use, WAL journal
+    mode, closed when the thread ends) and statements are built once per repository, so sqlite3's
+    per-connection statement cache reuses the prepared statements. Indexed
+    attributes get their own column and SQL index; unique ones a UNIQUE
+    constraint. Entities are stored as their to_record() JSON and rebuilt on
+    every read.
+
+    Attached index structures are kept in this process only, loaded from the
+    table when attached and updated on every write made through this object.
+    With ``thread_safe=True`` writes hold ``lock`` so those structures change
+    under the same RWLock as InMemoryRepository's; reads go straight to
+    SQLite.
+
+    ``stats`` and ``scan_lengths`` follow InMemoryRepository; scans are
+    lookups on attributes that have no column.
+    """
+
+    def __init__(self, database, name, model, unique_indexes=(), indexes=(),
+                 cached_statements=256, timeout=30.0, thread_safe=False):
+        self.lock      = make_lock(thread_safe)
+        self.database  = database
+        self.table     = name
+        self.model     = model
+        self.version   = 0
+        self.last_modified = datetime.now()
+        self._unique   = tuple(unique_indexes)
+        self._columns  = self._unique + tuple(indexes)
+        self._attached = []
+        self.stats        = Counter()
+        self.scan_lengths = Histogram(SCAN_BUCKETS)
+        self._local    = threading.local()
+        self._connections = []
+        self._pool_lock   = threading.Lock()
+        self._cached_statements = cached_statements
+        self._timeout  = timeout
+        directory = os.path.dirname(database)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._create_schema()
+        self._sql = self._statements()
+
+    def _connection(self):
+        holder = getattr(self._local, "holder", None)
+        if holder is not None:
+            return holder.conn
+        conn = sqlite3.connect(self.database, timeout=self._timeout, isolation_level=None,
+                               check_same_thread=False,
+                               cached_statements=self._cached_statements)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        holder = self._local.holder = _ThreadConnection(conn)
+        # The thread's local data, and so the holder, is dropped when the thread ends
+        weakref.finalize(holder, _release, conn, self._connections, self._pool_lock)
+        with self._pool_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _create_schema(self):
+        extra = "".join(
+            f", {col} {'UNIQUE' if col in self._unique else ''}" for col in self._columns)
+        conn = self._connection()
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                     f"id TEXT PRIMARY KEY, order_key TEXT NOT NULL, data TEXT NOT NULL{extra})")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_order ON {self.table} (order_key, id)")
+        for col in self._columns:
+            if col not in self._unique:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_{col} "
+                             f"ON {self.table} ({col}, order_key, id)")
+
+    def _statements(self):
+        t = self.table
+        columns = ("id", "order_key", "data") + self._columns
+        assignments = ", ".join(f"{col} = ?" for col in columns[1:])
+        return {
+            "insert":   f"INSERT INTO {t} ({', '.join(columns)}) "
+                        f"VALUES ({', '.join('?' for _ in columns)})",
+            "update":   f"UPDATE {t} SET {assignments} WHERE id = ?",
+            "delete":   f"DELETE FROM {t} WHERE id = ?",
+            "get":      f"SELECT data FROM {t} WHERE id = ?",
+            "all":      f"SELECT data FROM {t} ORDER BY order_key, id",
+            "first":    f"SELECT data FROM {t} ORDER BY order_key, id LIMIT ?",
+            "after":    f"SELECT data FROM {t} WHERE (order_key, id) > (?, ?) "
+                        f"ORDER BY order_key, id LIMIT ?",
+            **{f"by_{col}": f"SELECT data FROM {t} WHERE {col} = ? ORDER BY order_key, id"
+               for col in self._columns},
+            **{f"clear_{col}": f"UPDATE {t} SET {col} = NULL WHERE id = ?"
+               for col in self._unique}
+        }
+
+    def _row(self, obj):
+        return (obj.id, _order_key(obj.created_at),
+                json.dumps(obj.to_record(), separators=(",", ":")),
+                *(getattr(obj, col, None) for col in self._columns))
+
+    def _load(self, data):
+        return self.model.from_record(json.loads(data))
+
+    def _duplicate(self, error):
+        for col in self._unique:
+            if f"{self.table}.{col}" in str(error):
+                return ValueError(f"Duplicate value for unique index '{col}'")
+        return ValueError(str(error))
+
+    def _touch(self):
+        self.version += 1
+        self.last_modified = datetime.now()
+
+    def attach_index(self, index):
+        with self.lock.write():
+            for obj in self.iter_all():
+                index.insert(obj)
+            self._attached.append(index)
+            return index
+
+    def add(self, obj):
+        with self.lock.write():
+            self.stats["add"] += 1
+            try:
+                self._connection().execute(self._sql["insert"], self._row(obj))
+            except sqlite3.IntegrityError as e:
+                raise self._duplicate(e)
+            self._touch()
+            for index in self._attached:
+                index.insert(obj)
+
+    def add_many(self, objs):
+        with self.lock.write():
+            self.stats["add_many"] += 1
+            objs = list(objs)
+            if not objs:
+                return
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(self._sql["insert"], [self._row(obj) for obj in objs])
+                conn.execute("COMMIT")
+            except sqlite3.IntegrityError as e:
+                conn.execute("ROLLBACK")
+                if f"UNIQUE constraint failed: {self.table}.id" in str(e):
+                    raise ValueError("Duplicate ID in batch")
+                raise self._duplicate(e)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self._touch()
+            for obj in objs:
+                for index in self._attached:
+                    index.insert(obj)
+
+    def get(self, obj_id):
+        row = self._connection().execute(self._sql["get"], (obj_id,)).fetchone()
+        return self._load(row[0]) if row else None
+
+    def get_many(self, obj_ids):
+        self.stats["get_many"] += 1
+        obj_ids = list(obj_ids)
+        found = {}
+        conn = self._connection()
+        for start in range(0, len(obj_ids), 500):
+            chunk = obj_ids[start:start + 500]
+            sql = f"SELECT data FROM {self.table} WHERE id IN ({', '.join('?' for _ in chunk)})"
+            for (data,) in conn.execute(sql, chunk):
+                obj = self._load(data)
+                found[obj.id] = obj
+        return found
+
+    def get_all(self):
+        self.stats["get_all"] += 1
+        return [self._load(data) for (data,) in self._connection().execute(self._sql["all"])]
+
+    def update(self, obj_id, data):
+        self.stats["update"] += 1
+        self._update_rows([(obj_id, data)])
+
+    def update_many(self, updates):
+        """Apply (obj_id, data) pairs in one transaction and return the updated objects.
+
+        Changed unique columns are cleared before any row is rewritten, so
+        values may move between objects of the same batch.
+        """
+        self.stats["update_many"] += 1
+        return self._update_rows(updates)
+
+    def _update_rows(self, updates):
+        with self.lock.write():
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                batch = []
+                for obj_id, data in updates:
+                    row = conn.execute(self._sql["get"], (obj_id,)).fetchone()
+                    if row is None:
+                        continue
+                    obj = self._load(row[0])
+                    changes = updatable_changes(obj, data)
+                    attached = [index for index in self._attached if index.attrs & changes.keys()]
+                    old = self._load(row[0]) if attached else None
+                    for key, value in changes.items():
+                        setattr(obj, key, value)
+                    obj.save()
+                    batch.append((obj, old, attached))
+                    for col in self._unique:
+                        if col in changes:
+                            conn.execute(self._sql[f"clear_{col}"], (obj_id,))
+                for obj, _, _ in batch:
+                    row = self._row(obj)
+                    conn.execute(self._sql["update"], row[1:] + (obj.id,))
+                conn.execute("COMMIT")
+            except sqlite3.IntegrityError as e:
+                conn.execute("ROLLBACK")
+                raise self._duplicate(e)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if batch:
+                self._touch()
+            for obj, old, attached in batch:
+                for index in attached:
+                    index.remove(old)
+                    index.insert(obj)
+            return [obj for obj, _, _ in batch]
+
+    def delete(self, obj_id):
+        with self.lock.write():
+            self.stats["delete"] += 1
+            obj = self.get(obj_id) if self._attached else None
+            cursor = self._connection().execute(self._sql["delete"], (obj_id,))
+            if cursor.rowcount:
+                self._touch()
+                if obj is not None:
+                    for index in self._attached:
+                        index.remove(obj)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        if attr_name in self._columns:
+            self.stats["index_lookup"] += 1
+            row = self._connection().execute(self._sql[f"by_{attr_name}"], (attr_value,)).fetchone()
+            return self._load(row[0]) if row else None
+        return next(iter(self.filter_by_attribute(attr_name, attr_value)), None)
+
+    def filter_by_attribute(self, attr_name, attr_value):
+        if attr_name in self._columns:
+            self.stats["index_lookup"] += 1
+            rows = self._connection().execute(self._sql[f"by_{attr_name}"], (attr_value,))
+            return [self._load(data) for (data,) in rows]
+        self.stats["scan"] += 1
+        scanned = 0
+        found = []
+        for (data,) in self._connection().execute(self._sql["all"]):
+            scanned += 1
+            obj = self._load(data)
+            if getattr(obj, attr_name, None) == attr_value:
+                found.append(obj)
+        self.scan_lengths.observe(scanned)
+        return found
+
+    def get_page(self, limit, after=None):
+        self.stats["get_page"] += 1
+        conn = self._connection()
+        if after:
+            rows = conn.execute(self._sql["after"], (_order_key(after[0]), after[1], limit + 1))
+        else:
+            rows = conn.execute(self._sql["first"], (limit + 1,))
+        objs = [self._load(data) for (data,) in rows]
+        if len(objs) <= limit:
+            return objs, None
+        objs = objs[:limit]
+        return objs, (objs[-1].created_at, objs[-1].id)
+
+    def iter_all(self, batch_size=500):
+        after = None
+        while True:
+            batch, after = self.get_page(batch_size, after)
+            yield from batch
+            if after is None:
+                return
+
+    def count(self):
+        return self._connection().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self):
+        with self._pool_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
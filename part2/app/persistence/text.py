@@ -0,0 +1,277 @@
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+
+WORD = re.compile(r"\w+")
+MAX_EXPANSIONS = 64
+# Up to this many postings a query word is scored exhaustively; above it
+# ranked postings are walked until the top results settle
+EXHAUSTIVE_LIMIT = 4_000
+STEP = 256
+
+
+def tokenize(text):
+    """Lowercase words with accents stripped: "Café Crème" -> ["cafe", "creme"]"""
+    text = text.casefold()
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return WORD.findall(text)
+
+
+class TextIndex:
+    """Inverted index over text attributes, ranked with BM25.
+
+    Documents are keyed by ``key_attr``: with the default "id" each object
+    is its own document, while e.g. ``key_attr="place_id"`` on reviews
+    merges all reviews of a place into one document. Postings map a term to
+    {document key: term frequency}; a sorted vocabulary answers prefix
+    lookups with a bisect.
+
+    ``ranked(term)`` groups a term's postings by frequency, shortest
+    documents first, so queries can stop early. Those lists are built on
+    first use and dropped when the term's postings (or the length of one of
+    its documents) change.
+    """
+
+    def __init__(self, text_attrs, key_attr="id", k1=1.2, b=0.75):
+        self.text_attrs = tuple(text_attrs)
+        self.key_attr   = key_attr
+        self.attrs      = {*self.text_attrs, key_attr}
+        self.k1 = k1
+        self.b  = b
+        self._postings   = {}
+        self._vocabulary = []
+        self._lengths    = {}
+        self._total      = 0
+        self._sources    = {}
+        self._key_sources = {}
+        self._ranked     = {}
+
+    def _terms(self, obj):
+        return Counter(tokenize(" ".join(getattr(obj, attr) or "" for attr in self.text_attrs)))
+
+    def _invalidate(self, terms, shared):
+        """Drop ranked lists the write made stale; a shared document changes length for all its terms"""
+        if not self._ranked:
+            return
+        if shared:
+            self._ranked.clear()
+            return
+        for term in terms:
+            self._ranked.pop(term, None)
+
+    def _add(self, obj, new_terms):
+        key = getattr(obj, self.key_attr)
+        terms = self._terms(obj)
+        self._sources[obj.id] = (key, terms)
+        sources = self._key_sources.get(key, 0)
+        self._key_sources[key] = sources + 1
+        self._invalidate(terms, sources)
+        postings = self._postings
+        for term, tf in terms.items():
+            posting = postings.get(term)
+            if posting is None:
+                posting = postings[term] = {}
+                new_terms.append(term)
+            posting[key] = posting.get(key, 0) + tf
+        length = sum(terms.values())
+        self._lengths[key] = self._lengths.get(key, 0) + length
+        self._total += length
+
+    def insert(self, obj):
+        new_terms = []
+        self._add(obj, new_terms)
+        for term in new_terms:
+            insort(self._vocabulary, term)
+
+    def insert_many(self, objs):
+        """Insert a batch, sorting the vocabulary once"""
+        new_terms = []
+        for obj in objs:
+            self._add(obj, new_terms)
+        if new_terms:
+            self._vocabulary.extend(new_terms)
+            self._vocabulary.sort()
+
+    def remove(self, obj):
+        source = self._sources.pop(obj.id, None)
+        if source is None:
+            return
+        key, terms = source
+        sources = self._key_sources[key] - 1
+        if sources:
+            self._key_sources[key] = sources
+        else:
+            del self._key_sources[key]
+        self._invalidate(terms, sources)
+        for term, tf in terms.items():
+            posting = self._postings[term]
+            left = posting[key] - tf
+            if left:
+                posting[key] = left
+                continue
+            del posting[key]
+            if not posting:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+        length = sum(terms.values())
+        self._total -= length
+        left = self._lengths[key] - length
+        if left:
+            self._lengths[key] = left
+        else:
+            del self._lengths[key]
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def expand(self, token, prefix=False):
+        """Indexed terms equal to token, or starting with it (the most frequent first)"""
+        if not prefix:
+            return [token] if token in self._postings else []
+        vocabulary = self._vocabulary
+        terms = []
+        for i in range(bisect_left(vocabulary, token), len(vocabulary)):
+            if not vocabulary[i].startswith(token):
+                break
+            terms.append(vocabulary[i])
+        if len(terms) > MAX_EXPANSIONS:
+            terms = heapq.nlargest(MAX_EXPANSIONS, terms, key=lambda t: len(self._postings[t]))
+        return terms
+
+    def ranked(self, term):
+        """[(tf, keys by ascending document length)] for term, highest tf first"""
+        groups = self._ranked.get(term)
+        if groups is None:
+            by_tf = {}
+            for key, tf in self._postings[term].items():
+                by_tf.setdefault(tf, []).append(key)
+            lengths = self._lengths
+            groups = [(tf, sorted(keys, key=lengths.__getitem__))
+                      for tf, keys in sorted(by_tf.items(), reverse=True)]
+            self._ranked[term] = groups
+        return groups
+
+
+class _Scorer:
+    """BM25 contribution of one term of one TextIndex, weighted"""
+
+    __slots__ = ("index", "term", "postings", "lengths", "factor", "norm0", "norm1")
+
+    def __init__(self, index, term, weight):
+        self.index    = index
+        self.term     = term
+        self.postings = index._postings[term]
+        self.lengths  = index._lengths
+        docs = len(self.lengths)
+        idf = math.log(1 + (docs - len(self.postings) + 0.5) / (len(self.postings) + 0.5))
+        self.factor = idf * weight * (index.k1 + 1)
+        self.norm0  = index.k1 * (1 - index.b)
+        self.norm1  = index.k1 * index.b * docs / index._total
+
+    def impact(self, tf, length):
+        return self.factor * tf / (tf + self.norm0 + self.norm1 * length)
+
+    def score(self, key):
+        tf = self.postings.get(key)
+        return self.impact(tf, self.lengths[key]) if tf else 0.0
+
+    def max_impact(self):
+        return max(self.impact(tf, self.lengths[keys[0]]) for tf, keys in self.index.ranked(self.term))
+
+
+def _word_score(word, key):
+    """A word scores, in each field, through its best-matching term"""
+    return sum(max(s.score(key) for s in scorers) for scorers in word)
+
+
+def search(fields, query, limit=20):
+    """Best (key, score) pairs for query over [(TextIndex, weight)] fields.
+
+    Every query word must occur in at least one field; the last word also
+    matches as a prefix (search-as-you-type), through its best-matching
+    term per field. Scores add up BM25 over words and fields. Candidates
+    come from the word with the fewest postings. When even that word is
+    common, its ranked postings are walked, highest possible score first,
+    until no unseen document could outscore the current top results (the
+    threshold algorithm), so results stay exact.
+    """
+    tokens = tokenize(query)
+    words = []
+    for i, token in enumerate(tokens):
+        prefix = i == len(tokens) - 1
+        word = [[_Scorer(index, term, weight) for term in terms]
+                for index, weight in fields if (terms := index.expand(token, prefix))]
+        if not word:
+            return []
+        words.append(word)
+    if not words:
+        return []
+    words.sort(key=lambda word: sum(len(s.postings) for scorers in word for s in scorers))
+    driving, others = words[0], words[1:]
+
+    def matches(key):
+        return all(any(key in s.postings for scorers in word for s in scorers) for word in others)
+
+    if sum(len(s.postings) for scorers in driving for s in scorers) > EXHAUSTIVE_LIMIT:
+        return _threshold_search(words, matches, limit)
+    scores = {}
+    for scorers in driving:
+        best = {}
+        for s in scorers:
+            lengths, factor, norm0, norm1 = s.lengths, s.factor, s.norm0, s.norm1
+            for key, tf in s.postings.items():
+                impact = factor * tf / (tf + norm0 + norm1 * lengths[key])
+                if impact > best.get(key, 0.0):
+                    best[key] = impact
+        for key, impact in best.items():
+            scores[key] = scores.get(key, 0.0) + impact
+    if others:
+        scores = {key: score + sum(_word_score(word, key) for word in others)
+                  for key, score in scores.items() if matches(key)}
+    return [(key, score) for score, key in heapq.nlargest(limit, zip(scores.values(), scores))]
+
+
+def _threshold_search(words, matches, limit):
+    """Top results when the first (driving) word has long postings.
+
+    Each field of the driving word keeps a heap of its ranked lists by the
+    best score left in them. An unseen document scores at most the top of
+    each field's heap for the driving word plus the best possible score of
+    every other word.
+    """
+    driving, others = words[0], words[1:]
+    rest = sum(max(s.max_impact() for s in scorers) for word in others for scorers in word)
+    heaps = []
+    for scorers in driving:
+        heap = [(-s.impact(tf, s.lengths[keys[0]]), id(keys), s, tf, keys, 0)
+                for s in scorers for tf, keys in s.index.ranked(s.term)]
+        heapq.heapify(heap)
+        heaps.append(heap)
+    seen = set()
+    top = []
+    while True:
+        heap = min((heap for heap in heaps if heap), key=lambda heap: heap[0], default=None)
+        if heap is None:
+            break
+        _, n, s, tf, keys, position = heapq.heappop(heap)
+        end = position + STEP
+        for key in keys[position:end]:
+            if key in seen:
+                continue
+            seen.add(key)
+            if not matches(key):
+                continue
+            item = (sum(_word_score(word, key) for word in words), key)
+            if len(top) < limit:
+                heapq.heappush(top, item)
+            elif item > top[0]:
+                heapq.heapreplace(top, item)
+        if end < len(keys):
+            heapq.heappush(heap, (-s.impact(tf, s.lengths[keys[end]]), n, s, tf, keys, end))
+        if len(top) == limit and top[0][0] >= rest - sum(heap[0][0] for heap in heaps if heap):
+            break
+    return [(key, score) for score, key in sorted(top, reverse=True)]
@@ -0,0 +1,346 @@
+import json
+import os
+import threading
+from app.persistence.repository import InMemoryRepository
+from app.persistence.snapshot import SnapshotReader, write_snapshot
+
+
+def _fsync_directory(path):
+    """Make a rename durable; not every platform can open a directory"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def wal_repository_factory(data_dir, **wal_options):
+    """Repository factory for HBnBFacade storing each repository under data_dir"""
+    def make(name, model, **options):
+        return PersistentRepository(os.path.join(data_dir, name), model, **options, **wal_options)
+    return make
+
+
+class PersistentRepository(InMemoryRepository):
+    """InMemoryRepository made durable with a write-ahead log and snapshots.
+
+    Every add/update/delete is appended to ``<path>.wal`` as one JSON line
+    before the call returns; ``add_many``/``update_many`` write their whole
+    batch as a single line, so a torn write drops the batch as a unit. Concurrent writers share fsyncs: whichever
+    writer finds no sync in progress flushes and fsyncs everything written
+    so far, and the others wait for it (group commit).
+
+    After ``compact_every`` log records the whole repository is written to
+    the binary ``<path>.snapshot`` (via a temporary file and an atomic
+    rename) and the log is truncated. Opening the repository loads the
+    snapshot, then replays the log tail; a torn last line from a crash is
+    ignored.
+
+    Writers take ``lock`` (see InMemoryRepository) before the log's own
+    condition, so callers holding ``lock`` may write without deadlocking.
+
+    With ``lazy=True`` the snapshot is only memory-mapped at startup: ``get``
+    and ``get_many`` decode single records on first access, ``count`` is
+    answered from the snapshot and the log, and everything else (writes,
+    scans, index queries) loads the full repository once. Reading an index
+    attached before that load, such as the facade's review ratings shown with
+    every place, loads it too.
+    """
+
+    def __init__(self, path, model, unique_indexes=(), indexes=(),
+                 fsync=True, compact_every=100_000, lazy=False, thread_safe=False):
+        super().__init__(unique_indexes=unique_indexes, indexes=indexes, thread_safe=thread_safe)
+        self.model          = model
+        self.snapshot_path  = f"{path}.snapshot"
+        self.wal_path       = f"{path}.wal"
+        self.fsync          = fsync
+        self.compact_every  = compact_every
+        self._cond          = threading.Condition()
+        self._written       = 0
+        self._synced        = 0
+        self._syncing       = False
+        self._wal_records   = 0
+        self.lazy           = lazy
+        # (snapshot reader, {id: decoded or replayed entity}, {deleted id}) until loaded
+        self._lazy          = None
+        self._deferred      = []
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._load()
+        self.stats.clear()
+        self._wal = open(self.wal_path, "a", encoding="utf-8")
+
+    def _load(self):
+        if os.path.exists(self.snapshot_path):
+            snapshot = SnapshotReader(self.snapshot_path)
+            if self.lazy:
+                self._lazy = (snapshot, {}, set())
+            else:
+                for record in snapshot:
+                    self._replay({"op": "put", "record": record})
+                snapshot.close()
+        if os.path.exists(self.wal_path):
+            valid = self._replay_file(self.wal_path)
+            if valid < os.path.getsize(self.wal_path):
+                os.truncate(self.wal_path, valid)
+
+    def _replay_file(self, path):
+        """Apply every complete entry in path; returns the byte length of the valid prefix"""
+        valid = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self._replay(entry)
+                valid += len(line)
+                if path == self.wal_path:
+                    self._wal_records += 1
+        return valid
+
+    def _replay(self, entry):
+        if entry["op"] == "batch":
+            for item in entry["entries"]:
+                self._replay(item)
+            return
+        if self._lazy is not None:
+            self._replay_lazy(entry)
+            return
+        if entry["op"] == "delete":
+            super().delete(entry["id"])
+            return
+        record = entry["record"]
+        if record["id"] in self._storage:
+            super().delete(record["id"])
+        super().add(self.model.from_record(record))
+
+    def _replay_lazy(self, entry):
+        _, overlay, deleted = self._lazy
+        if entry["op"] == "delete":
+            overlay.pop(entry["id"], None)
+            deleted.add(entry["id"])
+            return
+        record = entry["record"]
+        overlay[record["id"]] = self.model.from_record(record)
+        deleted.discard(record["id"])
+
+    def _ensure_loaded(self):
+        """Materialize every snapshot record and attach deferred indexes.
+
+        Entities are inserted without taking ``lock``, so this is safe inside
+        a read-locked section; ``get`` keeps answering from the overlay and
+        the snapshot until the load is complete.
+        """
+        if self._lazy is None:
+            return
+        with self._cond:
+            if self._lazy is None:
+                return
+            snapshot, overlay, deleted = self._lazy
+            indexed = self._indexed_attrs()
+            for record in snapshot:
+                obj_id = record["id"]
+                if obj_id in deleted:
+                    continue
+                self._insert(overlay.get(obj_id) or self.model.from_record(record), indexed)
+            # get() may still be adding decoded records to the overlay
+            for obj_id, obj in list(overlay.items()):
+                if obj_id not in self._storage:
+                    self._insert(obj, indexed)
+            for index in self._deferred:
+                for obj in self._storage.values():
+                    index.insert(obj)
+                self._attached.append(index)
+            self._deferred = []
+            # The mapping is released once no concurrent get() still uses it
+            self._lazy = None
+
+    def attach_index(self, index):
+        if self._lazy is None:
+            return super().attach_index(index)
+        self._deferred.append(index)
+        return _DeferredIndex(self, index)
+
+    def get(self, obj_id):
+        # Read once, before _storage: a load finishing in between leaves this
+        # consistent view usable, and without one _storage is complete
+        lazy = self._lazy
+        obj = self._storage.get(obj_id)
+        if obj is not None or lazy is None:
+            return obj
+        snapshot, overlay, deleted = lazy
+        obj = overlay.get(obj_id)
+        if obj is not None or obj_id in deleted:
+            return obj
+        record = snapshot.get(obj_id)
+        if record is None:
+            return None
+        obj = self.model.from_record(record)
+        return overlay.setdefault(obj_id, obj)
+
+    def get_many(self, obj_ids):
+        if self._lazy is None:
+            return super().get_many(obj_ids)
+        found = {obj_id: self.get(obj_id) for obj_id in obj_ids}
+        return {obj_id: obj for obj_id, obj in found.items() if obj is not None}
+
+    def get_all(self):
+        self._ensure_loaded()
+        return super().get_all()
+
+    def get_page(self, limit, after=None):
+        self._ensure_loaded()
+        return super().get_page(limit, after)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        self._ensure_loaded()
+        return super().get_by_attribute(attr_name, attr_value)
+
+    def filter_by_attribute(self, attr_name, attr_value):
+        self._ensure_loaded()
+        return super().filter_by_attribute(attr_name, attr_value)
+
+    def count(self):
+        lazy = self._lazy
+        if lazy is None:
+            return super().count()
+        # Snapshot size adjusted by the log: overlay entries the snapshot
+        # lacks were added, deleted ones it holds were removed
+        snapshot, overlay, deleted = lazy
+        added = sum(1 for obj_id in list(overlay) if obj_id not in snapshot)
+        removed = sum(1 for obj_id in list(deleted) if obj_id in snapshot)
+        return len(snapshot) + added - removed
+
+    def _append(self, entry):
+        """Write one log entry; the caller holds self._cond. Returns its sequence number"""
+        self._wal.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._written += 1
+        self._wal_records += 1
+        return self._written
+
+    def _commit(self, seq):
+        """Block until log entry seq is on disk, fsyncing on behalf of other writers"""
+        if not self.fsync:
+            with self._cond:
+                self._wal.flush()
+            return
+        with self._cond:
+            while self._synced < seq:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                self._wal.flush()
+                target = self._written
+                fd = self._wal.fileno()
+                self._cond.release()
+                try:
+                    os.fsync(fd)
+                finally:
+                    self._cond.acquire()
+                    self._syncing = False
+                self._synced = max(self._synced, target)
+                self._cond.notify_all()
+
+    def _write(self, apply, entry_for):
+        self._ensure_loaded()
+        # Always self.lock before self._cond, as in _ensure_loaded
+        with self.lock.write(), self._cond:
+            result = apply()
+            entry = entry_for(result)
+            if entry is None:
+                return result
+            seq = self._append(entry)
+            if self._wal_records >= self.compact_every:
+                self._compact_locked()
+        self._commit(seq)
+        return result
+
+    def add(self, obj):
+        self._write(lambda: super(PersistentRepository, self).add(obj),
+                    lambda _: {"op": "put", "record": obj.to_record()})
+
+    def update(self, obj_id, data):
+        def entry_for(_):
+            obj = self.get(obj_id)
+            return {"op": "put", "record": obj.to_record()} if obj else None
+        self._write(lambda: super(PersistentRepository, self).update(obj_id, data), entry_for)
+
+    def add_many(self, objs):
+        objs = list(objs)
+        self._write(lambda: super(PersistentRepository, self).add_many(objs),
+                    lambda _: self._batch_entry(objs))
+
+    def update_many(self, updates):
+        return self._write(lambda: super(PersistentRepository, self).update_many(updates),
+                           self._batch_entry)
+
+    def _batch_entry(self, objs):
+        if not objs:
+            return None
+        return {"op": "batch",
+                "entries": [{"op": "put", "record": obj.to_record()} for obj in objs]}
+
+    def delete(self, obj_id):
+        def apply():
+            existed = obj_id in self._storage
+            super(PersistentRepository, self).delete(obj_id)
+            return existed
+        self._write(apply, lambda existed: {"op": "delete", "id": obj_id} if existed else None)
+
+    def _compact_locked(self):
+        self._wal.flush()
+        tmp_path = f"{self.snapshot_path}.tmp"
+        write_snapshot(tmp_path, (obj.to_record() for obj in self._storage.values()))
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_directory(os.path.dirname(self.snapshot_path) or ".")
+        self._wal.truncate(0)
+        self._wal.seek(0)
+        os.fsync(self._wal.fileno())
+        self._wal_records = 0
+        self._synced = self._written
+
+    def compact(self):
+        """Write a snapshot of the current state and empty the log"""
+        self._ensure_loaded()
+        with self.lock.write(), self._cond:
+            self._compact_locked()
+
+    def close(self):
+        with self._cond:
+            if self._lazy is not None:
+                self._lazy[0].close()
+                self._lazy = None
+            self._wal.flush()
+            os.fsync(self._wal.fileno())
+            self._synced = self._written
+            self._wal.close()
+
+
+class _DeferredIndex:
+    """Handle on an index attached before a lazy repository was loaded.
+
+    Reading through it loads the repository first, so queries never see a
+    partially built index.
+    """
+
+    def __init__(self, repo, index):
+        self._repo  = repo
+        self._index = index
+
+    def __getattr__(self, name):
+        self._repo._ensure_loaded()
+        return getattr(self._index, name)
+
+    def __len__(self):
+        self._repo._ensure_loaded()
+        return len(self._index)
@@ -1,134 +1,425 @@
+import uuid
+from contextlib import ExitStack, contextmanager
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
-from app.persistence.repository import InMemoryRepository
+from app.metrics import time_methods
+from app.persistence.repository import memory_repository
+from app.persistence.indexes import HistogramIndex, MultiValueIndex, SortedIndex
+from app.persistence.spatial import GridIndex
+from app.persistence.text import TextIndex, search
+
+PLACE_RELATIONS = ("owner", "amenities")
+# Review text counts half as much as the place's own title and description
+REVIEW_TEXT_WEIGHT = 0.5
+REPOSITORIES    = ("user", "place", "review", "amenity")
+# Not timed: context managers and generator sources return before any work
+UNTIMED = ("close", "locked", "iter_places", "iter_reviews", "metrics_snapshot")
 
 
 class HBnBFacade:
-    def __init__(self):
-        self.user_repo    = InMemoryRepository()
-        self.place_repo   = InMemoryRepository()
-        self.review_repo  = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+    def __init__(self, repository_factory=memory_repository, timed=False):
+        make = repository_factory
+        self.instance_id  = uuid.uuid4().hex
+        self.user_repo    = make("users",     User,    unique_indexes=("email",))
+        self.place_repo   = make("places",    Place,   indexes=("owner_id",))
+        self.review_repo  = make("reviews",   Review,  indexes=("place_id", "user_id"))
+        self.amenity_repo = make("amenities", Amenity)
+        self.place_geo    = self.place_repo.attach_index(GridIndex())
+        self.place_prices = self.place_repo.attach_index(SortedIndex("price"))
+        self.place_amenities = self.place_repo.attach_index(MultiValueIndex("amenities"))
+        self.place_ratings   = self.review_repo.attach_index(HistogramIndex("place_id", "rating"))
+        self.place_text  = self.place_repo.attach_index(TextIndex(("title", "description")))
+        self.review_text = self.review_repo.attach_index(TextIndex(("text",), key_attr="place_id"))
+        self.timings = time_methods(self, exclude=UNTIMED) if timed else {}
+
+    def close(self):
+        for repo in (self.user_repo, self.place_repo, self.review_repo, self.amenity_repo):
+            if hasattr(repo, "close"):
+                repo.close()
+
+    def metrics_snapshot(self):
+        """Method timings, repository counters and entity counts as plain data"""
+        repositories = {}
+        for name in REPOSITORIES:
+            repo = getattr(self, f"{name}_repo")
+            repositories[name] = {"count": repo.count(), "ops": dict(repo.stats),
+                                  "scan_lengths": repo.scan_lengths.snapshot()}
+        return {"timings": {name: timing.snapshot() for name, timing in self.timings.items()},
+                "repositories": repositories}
+
+    @contextmanager
+    def locked(self, writes=(), reads=()):
+        """Hold the named repositories' locks for a multi-step operation.
+
+        Locks are always taken in name order, so concurrent callers cannot
+        deadlock; inside the block only the named repositories may be used.
+        """
+        with ExitStack() as stack:
+            for name in sorted({*writes, *reads}):
+                lock = getattr(self, f"{name}_repo").lock
+                stack.enter_context(lock.write() if name in writes else lock.read())
+            yield
+
+    def versions(self, *names):
+        """Write counters of the named repositories, for stamping cached responses"""
+        return tuple(getattr(self, f"{name}_repo").version for name in names)
+
+    def collection_stamp(self, *names):
+        """(token, last_modified) identifying the current state of the named repositories"""
+        repos = [getattr(self, f"{name}_repo") for name in names]
+        token = (self.instance_id, names, tuple(repo.version for repo in repos))
+        return token, max(repo.last_modified for repo in repos)
+
+    def entity_stamp(self, obj, *names):
+        """(token, last_modified) for one entity, plus the repositories it embeds data from"""
+        if obj is None:
+            return None
+        token, last_modified = self.collection_stamp(*names) if names else (self.instance_id, obj.updated_at)
+        return (token, obj.id, obj.version), max(last_modified, obj.updated_at)
+
+    @staticmethod
+    def _build_batch(items, build):
+        """Build every item of a batch, naming the first invalid one by position"""
+        objs = []
+        for i, data in enumerate(items):
+            try:
+                objs.append(build(data))
+            except ValueError as e:
+                raise ValueError(f"Item {i}: {e}")
+        return objs
 
     def create_user(self, data):
-        if self.user_repo.get_by_attribute("email", data["email"]):
+        user = User.create(data)
+        try:
+            self.user_repo.add(user)
+        except ValueError:
             raise ValueError("Email already registered")
-        user = User(
-            first_name=data["first_name"],
-            last_name=data["last_name"],
-            email=data["email"],
-            is_admin=data.get("is_admin", False)
-        )
-        self.user_repo.add(user)
         return user
 
+    def create_users(self, items):
+        """Create users in one batch; nothing is stored if any item is invalid"""
+        users = self._build_batch(items, User.create)
+        try:
+            self.user_repo.add_many(users)
+        except ValueError:
+            raise ValueError("Email already registered")
+        return users
+
     def get_user(self, user_id):
         return self.user_repo.get(user_id)
 
     def get_all_users(self):
         return self.user_repo.get_all()
 
+    def get_users_page(self, limit, after=None):
+        return self.user_repo.get_page(limit, after)
+
     def update_user(self, user_id, data):
-        if "email" in data:
-            existing = self.user_repo.get_by_attribute("email", data["email"])
-            if existing and existing.id != user_id:
-                raise ValueError("Email already registered")
-        self.user_repo.update(user_id, data)
+        data = User.check_update(data)
+        try:
+            self.user_repo.update(user_id, data)
+        except ValueError:
+            raise ValueError("Email already registered")
         return self.user_repo.get(user_id)
 
     def create_amenity(self, data):
-        amenity = Amenity(name=data["name"])
+        amenity = Amenity.create(data)
         self.amenity_repo.add(amenity)
         return amenity
 
+    def create_amenities(self, items):
+        """Create amenities in one batch; nothing is stored if any item is invalid"""
+        amenities = self._build_batch(items, Amenity.create)
+        self.amenity_repo.add_many(amenities)
+        return amenities
+
     def get_amenity(self, amenity_id):
         return self.amenity_repo.get(amenity_id)
 
     def get_all_amenities(self):
         return self.amenity_repo.get_all()
 
+    def get_amenities_page(self, limit, after=None):
+        return self.amenity_repo.get_page(limit, after)
+
     def update_amenity(self, amenity_id, data):
-        self.amenity_repo.update(amenity_id, data)
+        self.amenity_repo.update(amenity_id, Amenity.check_update(data))
         return self.amenity_repo.get(amenity_id)
 
     def delete_amenity(self, amenity_id):
         self.amenity_repo.delete(amenity_id)
 
     def create_place(self, data):
-        if not self.user_repo.get(data["owner_id"]):
-            raise ValueError("Owner not found")
-        for aid in data.get("amenities", []):
-            if not self.amenity_repo.get(aid):
-                raise ValueError(f"Amenity {aid} not found")
-        place = Place(
-            title=data["title"],
-            description=data.get("description", ""),
-            price=data["price"],
-            latitude=data["latitude"],
-            longitude=data["longitude"],
-            owner_id=data["owner_id"]
-        )
-        place.amenities = data.get("amenities", [])
-        self.place_repo.add(place)
+        place = Place.create(data)
+        with self.locked(writes=("place",), reads=("user", "amenity")):
+            if not self.user_repo.get(place.owner_id):
+                raise ValueError("Owner not found")
+            for aid in place.amenities:
+                if not self.amenity_repo.get(aid):
+                    raise ValueError(f"Amenity {aid} not found")
+            self.place_repo.add(place)
         return place
 
-    def get_place(self, place_id):
+    def create_places(self, items):
+        """Create places in one batch; nothing is stored if any item is invalid.
+
+        Payloads are validated before any lock is taken. Owners and amenities
+        referenced by the whole batch are then fetched with one get_many each
+        and checked by set membership.
+        """
+        def check(place):
+            if place.owner_id not in owners:
+                raise ValueError("Owner not found")
+            for aid in place.amenities:
+                if aid not in amenities:
+                    raise ValueError(f"Amenity {aid} not found")
+            return place
+
+        places = self._build_batch(items, Place.create)
+        with self.locked(writes=("place",), reads=("user", "amenity")):
+            owners    = self.user_repo.get_many({place.owner_id for place in places})
+            amenities = self.amenity_repo.get_many(
+                {aid for place in places for aid in place.amenities})
+            self._build_batch(places, check)
+            self.place_repo.add_many(places)
+        return places
+
+    def get_place(self, place_id, expand=PLACE_RELATIONS):
         place = self.place_repo.get(place_id)
         if not place:
             return None
-        owner = self.user_repo.get(place.owner_id)
-        amenities = [
-            self.amenity_repo.get(aid).to_dict()
-            for aid in place.amenities
-            if self.amenity_repo.get(aid)
-        ]
-        result = place.to_dict()
-        result["owner"] = {
-            "id":         owner.id,
-            "first_name": owner.first_name,
-            "last_name":  owner.last_name,
-            "email":      owner.email
-        } if owner else None
-        result["amenities"] = amenities
-        return result
-
-    def get_all_places(self):
-        return [p.to_dict() for p in self.place_repo.get_all()]
+        return self.expand_places([place], expand)[0]
+
+    def expand_places(self, places, expand=()):
+        """Place dicts with the requested relations resolved in one batched pass"""
+        results = self._place_dicts(places)
+        if "owner" in expand:
+            owners = self.user_repo.get_many({r["owner_id"] for r in results})
+            for result in results:
+                owner = owners.get(result["owner_id"])
+                result["owner"] = {
+                    "id":         owner.id,
+                    "first_name": owner.first_name,
+                    "last_name":  owner.last_name,
+                    "email":      owner.email
+                } if owner else None
+        if "amenities" in expand:
+            amenities = self.amenity_repo.get_many({aid for r in results for aid in r["amenities"]})
+            amenities = {aid: amenity.serialized() for aid, amenity in amenities.items()}
+            for result in results:
+                result["amenities"] = [amenities[aid] for aid in result["amenities"]
+                                       if aid in amenities]
+        return results
+
+    def get_all_places(self, expand=()):
+        return self.expand_places(self.place_repo.get_all(), expand)
+
+    def get_places_page(self, limit, after=None, expand=()):
+        places, next_key = self.place_repo.get_page(limit, after)
+        return self.expand_places(places, expand), next_key
+
+    def iter_places(self, **search):
+        """Place dicts one at a time, all of them or the search_places(**search) matches"""
+        if search:
+            with self.locked(reads=("place",)):
+                places = self._search_places(**search)
+            if places is not None:
+                return (self._place_dicts([p])[0] for p in places)
+        return (self._place_dicts([p])[0] for p in self.place_repo.iter_all())
+
+    def get_places_by_owner(self, owner_id):
+        return self.place_repo.filter_by_attribute("owner_id", owner_id)
+
+    def search_places(self, bbox=None, near=None, radius_km=None,
+                      min_price=None, max_price=None, amenities=(), expand=(), limit=None):
+        """Filter places using the geo, price and amenity indexes.
+
+        The most selective index drives the query and the other predicates are
+        checked by set membership. Radius searches are ordered by distance,
+        everything else by price. With a limit only the first matches in that
+        order are expanded and returned.
+        """
+        with self.locked(reads=("place",)):
+            places = self._search_places(bbox, near, radius_km, min_price, max_price, amenities)
+        if places is None:
+            places = self.place_repo.get_all()
+        return self.expand_places(places if limit is None else places[:limit], expand)
+
+    def _search_places(self, bbox=None, near=None, radius_km=None,
+                       min_price=None, max_price=None, amenities=()):
+        postings = sorted((self.place_amenities.postings(aid) for aid in amenities), key=len)
+        priced = min_price is not None or max_price is not None
+        if near is not None:
+            hits = [pid for _, pid in self.place_geo.nearby(near[0], near[1], radius_km)]
+        elif bbox is not None:
+            hits = self.place_geo.within_bbox(*bbox)
+        elif postings and (not priced or len(postings[0]) < self.place_prices.count(min_price, max_price)):
+            hits, postings = postings[0], postings[1:]
+        elif priced:
+            hits, priced = self.place_prices.range(min_price, max_price), False
+        else:
+            return None
+
+        places = []
+        for pid in hits:
+            if not all(pid in ids for ids in postings):
+                continue
+            place = self.place_repo.get(pid)
+            if priced and not ((min_price is None or place.price >= min_price) and
+                               (max_price is None or place.price <= max_price)):
+                continue
+            places.append(place)
+        if near is None:
+            places.sort(key=lambda p: (p.price, p.id))
+        return places
+
+    def get_place_rating(self, place_id):
+        with self.review_repo.lock.read():
+            return self._rating(place_id)
+
+    def _rating(self, place_id):
+        count, total, histogram = self.place_ratings.stats(place_id)
+        return {
+            "count":     count,
+            "average":   round(total / count, 2) if count else None,
+            "histogram": {str(r): histogram.get(r, 0) for r in range(1, 6)}
+        }
+
+    def _place_dicts(self, places):
+        """Serialized places with their rating, read under one review lock"""
+        with self.review_repo.lock.read():
+            results = []
+            for place in places:
+                result = dict(place.serialized())
+                result["rating"] = self._rating(place.id)
+                results.append(result)
+        return results
+
+    def search_place_text(self, query, limit=20):
+        """Places matching every word of query, best BM25 score first.
+
+        Titles and descriptions are searched together with the text of each
+        place's reviews; every dict carries its "score".
+        """
+        with self.locked(reads=("place", "review")):
+            hits = search([(self.place_text, 1.0), (self.review_text, REVIEW_TEXT_WEIGHT)],
+                          query, limit)
+            places = [(self.place_repo.get(pid), score) for pid, score in hits]
+            places = [(place, score) for place, score in places if place is not None]
+            results = self._place_dicts([place for place, _ in places])
+        for result, (_, score) in zip(results, places):
+            result["score"] = round(score, 4)
+        return results
+
+    def get_top_rated_places(self, limit=10, min_reviews=1):
+        with self.review_repo.lock.read():
+            top = self.place_ratings.top(limit, min_reviews, accept=self.place_repo.get)
+        return self._place_dicts([self.place_repo.get(pid) for pid in top])
 
     def update_place(self, place_id, data):
-        self.place_repo.update(place_id, data)
+        changes = Place.check_update(data)
+        with self.locked(writes=("place",), reads=("user", "amenity")):
+            if "owner_id" in changes and not self.user_repo.get(changes["owner_id"]):
+                raise ValueError("Owner not found")
+            for aid in changes.get("amenities", ()):
+                if not self.amenity_repo.get(aid):
+                    raise ValueError(f"Amenity {aid} not found")
+            self.place_repo.update(place_id, changes)
         return self.place_repo.get(place_id)
 
+    def update_places(self, items):
+        """Apply a batch of updates, each a payload with the place's "id".
+
+        Raises ValueError before anything is written if a place, owner or
+        amenity is unknown or a payload is invalid.
+        """
+        def place_id(data):
+            value = data.get("id") if isinstance(data, dict) else None
+            return value if isinstance(value, str) else None
+
+        def build(data):
+            if place_id(data) not in found:
+                raise ValueError("Place not found")
+            return data["id"], Place.check_update(
+                {key: value for key, value in data.items() if key != "id"})
+
+        def check(update):
+            _, changes = update
+            if "owner_id" in changes and changes["owner_id"] not in owners:
+                raise ValueError("Owner not found")
+            for aid in changes.get("amenities", ()):
+                if aid not in amenities:
+                    raise ValueError(f"Amenity {aid} not found")
+            return update
+
+        with self.locked(writes=("place",), reads=("user", "amenity")):
+            found = self.place_repo.get_many({place_id(data) for data in items} - {None})
+            updates = self._build_batch(items, build)
+            owners = self.user_repo.get_many(
+                {changes["owner_id"] for _, changes in updates if "owner_id" in changes})
+            amenities = self.amenity_repo.get_many(
+                {aid for _, changes in updates for aid in changes.get("amenities", ())})
+            self._build_batch(updates, check)
+            return self.place_repo.update_many(updates)
+
     def delete_place(self, place_id):
         self.place_repo.delete(place_id)
 
     def create_review(self, data):
-        if not self.place_repo.get(data["place_id"]):
-            raise ValueError("Place not found")
-        if not self.user_repo.get(data["user_id"]):
-            raise ValueError("User not found")
-        review = Review(
-            text=data["text"],
-            rating=data["rating"],
-            place_id=data["place_id"],
-            user_id=data["user_id"]
-        )
-        self.review_repo.add(review)
+        review = Review.create(data)
+        with self.locked(writes=("review",), reads=("place", "user")):
+            if not self.place_repo.get(review.place_id):
+                raise ValueError("Place not found")
+            if not self.user_repo.get(review.user_id):
+                raise ValueError("User not found")
+            self.review_repo.add(review)
         return review
 
+    def create_reviews(self, items):
+        """Create reviews in one batch; places and users are looked up once"""
+        def check(review):
+            if review.place_id not in places:
+                raise ValueError("Place not found")
+            if review.user_id not in users:
+                raise ValueError("User not found")
+            return review
+
+        reviews = self._build_batch(items, Review.create)
+        with self.locked(writes=("review",), reads=("place", "user")):
+            places = self.place_repo.get_many({review.place_id for review in reviews})
+            users  = self.user_repo.get_many({review.user_id for review in reviews})
+            self._build_batch(reviews, check)
+            self.review_repo.add_many(reviews)
+        return reviews
+
     def get_review(self, review_id):
         return self.review_repo.get(review_id)
 
     def get_all_reviews(self):
         return self.review_repo.get_all()
 
+    def get_reviews_page(self, limit, after=None):
+        return self.review_repo.get_page(limit, after)
+
+    def iter_reviews(self):
+        return self.review_repo.iter_all()
+
     def get_reviews_by_place(self, place_id):
-        return [r for r in self.review_repo.get_all() if r.place_id == place_id]
+        return self.review_repo.filter_by_attribute("place_id", place_id)
+
+    def get_reviews_by_user(self, user_id):
+        return self.review_repo.filter_by_attribute("user_id", user_id)
 
     def update_review(self, review_id, data):
-        self.review_repo.update(review_id, data)
+        changes = Review.check_update(data)
+        with self.locked(writes=("review",), reads=("place", "user")):
+            if "place_id" in changes and not self.place_repo.get(changes["place_id"]):
+                raise ValueError("Place not found")
+            if "user_id" in changes and not self.user_repo.get(changes["user_id"]):
+                raise ValueError("User not found")
+            self.review_repo.update(review_id, changes)
         return self.review_repo.get(review_id)
 
     def delete_review(self, review_id):
@@ -0,0 +1,189 @@
+import itertools
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import threading
+import types
+
+FRAME = struct.Struct("!I")
+ITER_CHUNK = 500
+
+
+def _send(sock, message):
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(FRAME.pack(len(data)) + data)
+
+
+def _recv_exactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Store connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock):
+    (size,) = FRAME.unpack(_recv_exactly(sock, FRAME.size))
+    return pickle.loads(_recv_exactly(sock, size))
+
+
+def _resolve(target, path):
+    for name in path:
+        if name.startswith("_"):
+            raise AttributeError(f"'{name}' is not exposed")
+        target = getattr(target, name)
+    return target
+
+
+class _StoreHandler(socketserver.BaseRequestHandler):
+    """Serve one worker connection: calls are answered in order, one at a time"""
+
+    def handle(self):
+        iterators = {}
+        ids = itertools.count()
+        while True:
+            try:
+                message = _recv(self.request)
+            except (ConnectionError, EOFError):
+                return
+            try:
+                op = message[0]
+                if op == "call":
+                    _, path, args, kwargs = message
+                    result = _resolve(self.server.facade, path)(*args, **kwargs)
+                    if isinstance(result, types.GeneratorType):
+                        iter_id = next(ids)
+                        iterators[iter_id] = result
+                        reply = ("iter", iter_id)
+                    else:
+                        reply = ("ok", result)
+                elif op == "next":
+                    _, iter_id = message
+                    chunk = list(itertools.islice(iterators[iter_id], ITER_CHUNK))
+                    if len(chunk) < ITER_CHUNK:
+                        del iterators[iter_id]
+                    reply = ("ok", chunk)
+                elif op == "close":
+                    iterators.pop(message[1], None)
+                    reply = ("ok", None)
+                else:
+                    raise ValueError(f"Unknown store operation '{op}'")
+            except Exception as e:
+                reply = ("error", e)
+            try:
+                _send(self.request, reply)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                _send(self.request, ("error", RuntimeError(f"Unpicklable store reply: {e}")))
+
+
+class StoreServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server exposing one HBnBFacade to every worker process.
+
+    Each worker connection gets a thread, so the facade must be built with
+    thread-safe repositories. Messages are pickled: the socket is created
+    owner-only (mode 0600) and must not be reachable by untrusted users.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, facade, path):
+        self.facade = facade
+        if os.path.exists(path):
+            os.unlink(path)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(path, _StoreHandler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class RemoteFacade:
+    """Stand-in for HBnBFacade that forwards every call to a StoreServer.
+
+    ``remote.get_place(pid)`` and ``remote.place_repo.get(pid)`` are sent as
+    one request each and return unpickled results; exceptions raised by the
+    facade (e.g. ValueError) are re-raised here. Generators are streamed back
+    in chunks. Each thread of each process opens its own connection on first
+    use, so a facade created before a server forks its workers stays usable.
+    """
+
+    def __init__(self, path, timeout=30.0):
+        self.path     = path
+        self.timeout  = timeout
+        self._local   = threading.local()
+
+    def _connection(self):
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            local.sock, local.pid = sock, os.getpid()
+        return local.sock
+
+    def _request(self, message):
+        sock = self._connection()
+        try:
+            _send(sock, message)
+            status, value = _recv(sock)
+        except (OSError, EOFError):
+            self._local.pid = None
+            sock.close()
+            raise
+        if status == "error":
+            raise value
+        return status, value
+
+    def _call(self, path, args, kwargs):
+        status, value = self._request(("call", path, args, kwargs))
+        if status == "iter":
+            return self._iterate(value)
+        return value
+
+    def _iterate(self, iter_id):
+        try:
+            while True:
+                chunk = self._request(("next", iter_id))[1]
+                yield from chunk
+                if len(chunk) < ITER_CHUNK:
+                    return
+        except GeneratorExit:
+            self._request(("close", iter_id))
+            raise
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _RemoteAttribute(self, (name,))
+
+    def close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.pid = None
+
+
+class _RemoteAttribute:
+    __slots__ = ("_remote", "_path")
+
+    def __init__(self, remote, path):
+        self._remote = remote
+        self._path   = path
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _RemoteAttribute(self._remote, self._path + (name,))
+
+    def __call__(self, *args, **kwargs):
+        return self._remote._call(self._path, args, kwargs)
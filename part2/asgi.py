@@ -0,0 +1,8 @@
+import asyncio
+from app import create_app
+from app.asgi import ASGIApp, serve
+
+app = ASGIApp(create_app())
+
+if __name__ == "__main__":
+    asyncio.run(serve(app, host="0.0.0.0", port=5000))
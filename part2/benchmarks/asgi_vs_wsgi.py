@@ -0,0 +1,150 @@
+"""Requests/second and latency of the WSGI and ASGI entry points under load.
+
+Serves the API from one process, either through werkzeug's threaded WSGI
+server (run.py) or through the ASGI app (asgi.py) on an asyncio loop, for
+each storage backend. An asyncio client then keeps CONNECTIONS concurrent
+connections busy with GET /api/v1/places/<id> (80%) and
+GET /api/v1/places/?limit=20 (20%), recording every response time. The
+werkzeug server closes the connection after each response, so the client
+reconnects whenever it is told to; the ASGI server keeps connections alive.
+
+Usage: python -m benchmarks.asgi_vs_wsgi [seconds] [connections]
+"""
+import asyncio
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+PORT = 5200
+PLACES = 2_000
+
+
+def _server(kind, port, storage, data_dir):
+    os.environ["HBNB_STORAGE"] = storage
+    os.environ["HBNB_DATABASE"] = os.path.join(data_dir, "hbnb.db")
+    from app import create_app
+    if kind == "wsgi":
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_request(self, *args):
+                pass
+
+        make_server("127.0.0.1", port, create_app(), threaded=True,
+                    request_handler=QuietHandler).serve_forever()
+    else:
+        from app.asgi import ASGIApp, serve
+        asyncio.run(serve(ASGIApp(create_app()), port=port))
+
+
+def _request(port, method, path, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                 headers={"Content-Type": "application/json"})
+    res = conn.getresponse()
+    data = res.read()
+    conn.close()
+    return res.status, json.loads(data) if data else None
+
+
+def _wait_for(port):
+    for _ in range(200):
+        try:
+            _request(port, "GET", "/api/v1/amenities/?limit=1")
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def _seed(port):
+    _, owner = _request(port, "POST", "/api/v1/users/",
+                        {"first_name": "Owner", "last_name": "Bench", "email": "owner@bench.com"})
+    rng = random.Random(0)
+    ids = []
+    for start in range(0, PLACES, 1000):
+        _, body = _request(port, "POST", "/api/v1/places/batch", [{
+            "title": f"Place {i}", "price": rng.uniform(20, 500),
+            "latitude": rng.uniform(-60, 60), "longitude": rng.uniform(-180, 180),
+            "owner_id": owner["id"]
+        } for i in range(start, min(PLACES, start + 1000))])
+        ids += body["ids"]
+    return ids
+
+
+async def _read_response(reader):
+    """Return (status, whether the server closes the connection)"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    headers = {name.lower(): value.lower() for name, _, value in
+               (line.partition(b": ") for line in head.split(b"\r\n")[1:] if line)}
+    await reader.readexactly(int(headers.get(b"content-length", 0)))
+    return status, headers.get(b"connection") == b"close"
+
+
+async def _connection(port, place_ids, deadline, seed, latencies, errors):
+    rng = random.Random(seed)
+    writer = None
+    try:
+        while time.perf_counter() < deadline:
+            if rng.random() < 0.8:
+                path = f"/api/v1/places/{rng.choice(place_ids)}"
+            else:
+                path = "/api/v1/places/?limit=20"
+            start = time.perf_counter()
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            status, close = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(path)
+            if close:
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def _load(port, place_ids, seconds, connections):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(_connection(port, place_ids, deadline, n, latencies, errors)
+                           for n in range(connections)))
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0.0
+    return round(len(latencies) / seconds), round(p99 * 1000, 1), len(errors)
+
+
+def measure(ctx, kind, storage, seconds, connections):
+    """Return (requests/second, p99 latency in ms, non-200 responses)"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        proc = ctx.Process(target=_server, args=(kind, PORT, storage, data_dir), daemon=True)
+        proc.start()
+        try:
+            _wait_for(PORT)
+            place_ids = _seed(PORT)
+            return asyncio.run(_load(PORT, place_ids, seconds, connections))
+        finally:
+            proc.terminate()
+            proc.join()
+
+
+def run(seconds=5, connections=200, storages=("memory", "sqlite")):
+    ctx = multiprocessing.get_context("spawn")
+    return {(kind, storage): measure(ctx, kind, storage, seconds, connections)
+            for storage in storages for kind in ("wsgi", "asgi")}
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    connections = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"{connections} connections, {os.cpu_count()} CPUs")
+    for (kind, storage), (rate, p99, errors) in run(seconds, connections).items():
+        print(f"{kind} {storage:<8}{rate:>8} req/s  p99 {p99:>8} ms  errors {errors}")
@@ -0,0 +1,68 @@
+"""Place creation throughput, one by one versus in batches.
+
+Compares facade.create_place in a loop with facade.create_places, and POSTs
+to /api/v1/places/batch through the Flask test client (JSON decoding,
+payload validation and response included). Every place references one of
+100 owners and three of 50 amenities.
+
+Usage: python -m benchmarks.bulk [count]
+"""
+import json
+import random
+import sys
+import time
+from app import create_app
+from app.api.v1.batch import MAX_BATCH_SIZE
+from app.services.facade import HBnBFacade
+
+
+def _payloads(facade, count, seed=0):
+    rng = random.Random(seed)
+    owners = [facade.create_user({"first_name": "Owner", "last_name": str(i),
+                                  "email": f"owner{i}-{seed}@bench.com"}).id for i in range(100)]
+    amenities = [facade.create_amenity({"name": f"Amenity {i}"}).id for i in range(50)]
+    return [{
+        "title":     f"Place {i}",
+        "price":     rng.uniform(20, 500),
+        "latitude":  rng.uniform(-90, 90),
+        "longitude": rng.uniform(-180, 180),
+        "owner_id":  rng.choice(owners),
+        "amenities": rng.sample(amenities, 3)
+    } for i in range(count)]
+
+
+def _rate(count, func):
+    start = time.perf_counter()
+    func()
+    return round(count / (time.perf_counter() - start))
+
+
+def run(count=50_000):
+    results = {}
+    facade = HBnBFacade()
+    items = _payloads(facade, count)
+    results["create_place loop"] = _rate(count, lambda: [facade.create_place(d) for d in items])
+
+    facade = HBnBFacade()
+    items = _payloads(facade, count)
+    results["create_places"] = _rate(count, lambda: facade.create_places(items))
+
+    from app import facade as app_facade
+    items = _payloads(app_facade, count, seed=1)
+    client = create_app().test_client()
+
+    def post_batches():
+        for start in range(0, count, MAX_BATCH_SIZE):
+            res = client.post("/api/v1/places/batch",
+                              data=json.dumps(items[start:start + MAX_BATCH_SIZE]),
+                              headers={"Content-Type": "application/json"})
+            assert res.status_code == 201, res.get_json()
+    results["POST /places/batch"] = _rate(count, post_batches)
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    print(f"places/second, {count} places")
+    for name, rate in run(count).items():
+        print(f"{name:<20}{rate:>10}")
@@ -0,0 +1,97 @@
+"""Facade throughput with thread-safe repositories, and a lost-update check.
+
+Each thread runs a mix of 55% get_place (owner and amenities expanded), 10%
+price searches, 15% create_review, 15% update_place and 5% create_user,
+where the user emails come from a small pool shared by every thread so
+uniqueness checks race. Afterwards every place version must equal one plus
+the updates that thread workers counted, every index must hold every
+entity, and each email of the pool must have been created exactly once.
+
+Usage: python -m benchmarks.concurrency [places] [ops_per_thread]
+"""
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from app.persistence.repository import InMemoryRepository
+from app.services.facade import HBnBFacade
+
+
+def _facade(thread_safe):
+    return HBnBFacade(lambda name, model, **options:
+                      InMemoryRepository(thread_safe=thread_safe, **options))
+
+
+def _seed(facade, places):
+    rng = random.Random(0)
+    owners = [facade.create_user({"first_name": "Owner", "last_name": str(i),
+                                  "email": f"owner{i}@bench.com"}).id for i in range(100)]
+    amenities = [facade.create_amenity({"name": f"Amenity {i}"}).id for i in range(20)]
+    return owners, [facade.create_place({
+        "title": f"Place {i}", "price": rng.uniform(20, 500),
+        "latitude": rng.uniform(-60, 60), "longitude": rng.uniform(-180, 180),
+        "owner_id": rng.choice(owners), "amenities": rng.sample(amenities, 3)
+    }).id for i in range(places)]
+
+
+def _worker(facade, owners, place_ids, ops, seed, updates, emails):
+    rng = random.Random(seed)
+    for i in range(ops):
+        roll = rng.random()
+        if roll < 0.55:
+            facade.get_place(rng.choice(place_ids))
+        elif roll < 0.65:
+            low = rng.uniform(20, 495)
+            facade.search_places(min_price=low, max_price=low + 5)
+        elif roll < 0.80:
+            facade.create_review({"text": "Nice", "rating": rng.randint(1, 5),
+                                  "place_id": rng.choice(place_ids), "user_id": rng.choice(owners)})
+        elif roll < 0.95:
+            place_id = rng.choice(place_ids)
+            facade.update_place(place_id, {"price": rng.uniform(20, 500)})
+            updates[place_id] += 1
+        else:
+            email = f"shared{rng.randrange(200)}@bench.com"
+            try:
+                facade.create_user({"first_name": "Racer", "last_name": str(seed), "email": email})
+                emails[email] += 1
+            except ValueError:
+                pass
+
+
+def _check(facade, place_ids, updates, emails):
+    lost = sum(facade.place_repo.get(pid).version != 1 + updates[pid] for pid in place_ids)
+    reviews = len(facade.review_repo.get_all())
+    indexes_ok = (len(facade.place_geo) == len(facade.place_prices) == len(place_ids) and
+                  sum(facade.place_ratings.stats(pid)[0] for pid in place_ids) == reviews)
+    duplicates = sum(count - 1 for count in emails.values())
+    return {"lost_updates": lost, "indexes_consistent": indexes_ok, "duplicate_emails": duplicates}
+
+
+def measure(threads, places, ops, thread_safe=True):
+    facade = _facade(thread_safe)
+    owners, place_ids = _seed(facade, places)
+    counters = [(Counter(), Counter()) for _ in range(threads)]
+    workers = [threading.Thread(target=_worker,
+                                args=(facade, owners, place_ids, ops, n, *counters[n]))
+               for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    rate = round(threads * ops / (time.perf_counter() - start))
+    updates = sum((u for u, _ in counters), Counter())
+    emails = sum((e for _, e in counters), Counter())
+    return rate, _check(facade, place_ids, updates, emails)
+
+
+if __name__ == "__main__":
+    places = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    ops = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    rate, _ = measure(1, places, ops, thread_safe=False)
+    print(f"{'unlocked':<10}{1:>3} threads: {rate:>8} ops/s")
+    for threads in (1, 2, 4, 8):
+        rate, check = measure(threads, places, ops)
+        print(f"{'locked':<10}{threads:>3} threads: {rate:>8} ops/s  {check}")
@@ -0,0 +1,137 @@
+"""Synthetic HBnB datasets for benchmarks, reproducible from a seed.
+
+A dataset of ``scale`` entities is split like a real listing site: 30%
+users, 20% places and 50% reviews, plus a fixed catalogue of amenities.
+One user in five hosts places. Places sit in clusters around a set of
+cities. Prices follow a log-normal curve, amenity popularity and review
+counts are skewed toward a few items, and ratings lean toward 4 and 5.
+Titles, descriptions and review texts are drawn from small vocabularies
+so that full-text search has common and rare words to find.
+
+Payloads are generated in batches and written with the facade's batch
+methods, so a 10M-entity dataset never holds more than one batch of
+payloads at a time. The same seed and scale always give the same payloads.
+
+Usage: python -m benchmarks.data [scale] [seed]
+"""
+import random
+import sys
+import time
+from itertools import accumulate
+from app.services.facade import HBnBFacade
+
+BATCH = 10_000
+AMENITIES = ("Wifi", "Kitchen", "Washer", "Dryer", "Air conditioning", "Heating", "Pool",
+             "Hot tub", "Free parking", "EV charger", "Crib", "Gym", "Breakfast", "Fireplace",
+             "Smoke alarm", "Workspace", "TV", "Hair dryer", "Iron", "Beachfront", "Ski-in",
+             "Lake access", "Garden", "Balcony", "BBQ grill", "Sauna", "Elevator", "Pets allowed")
+# (name, latitude, longitude)
+CITIES = (("Paris", 48.86, 2.35), ("London", 51.51, -0.13), ("New York", 40.71, -74.01),
+          ("Tokyo", 35.68, 139.69), ("Sydney", -33.87, 151.21), ("Cape Town", -33.92, 18.42),
+          ("Rio", -22.91, -43.17), ("Lisbon", 38.72, -9.14), ("Bali", -8.34, 115.09),
+          ("Reykjavik", 64.15, -21.94), ("Mexico City", 19.43, -99.13), ("Tulsa", 36.15, -95.99))
+FIRST_NAMES = ("Ada", "Alan", "Grace", "Linus", "Margaret", "Ken", "Barbara", "Dennis", "Frances",
+               "Guido", "Hedy", "John", "Katherine", "Edsger", "Radia", "Tim", "Shafi", "Donald")
+LAST_NAMES = ("Lovelace", "Turing", "Hopper", "Torvalds", "Hamilton", "Thompson", "Liskov",
+              "Ritchie", "Allen", "Van Rossum", "Lamarr", "Backus", "Johnson", "Dijkstra",
+              "Perlman", "Berners-Lee", "Goldwasser", "Knuth")
+KINDS = ("apartment", "loft", "studio", "house", "cabin", "villa", "cottage", "room", "chalet",
+         "bungalow", "townhouse", "houseboat")
+ADJECTIVES = ("cozy", "sunny", "quiet", "modern", "rustic", "spacious", "charming", "bright",
+              "historic", "stylish", "secluded", "elegant", "tiny", "luxury", "central")
+FEATURES = ("with a view", "near the beach", "by the park", "in the old town", "close to the metro",
+            "with a garden", "with a terrace", "near the station", "on the river", "with parking")
+WORDS = ("walk", "shops", "restaurants", "market", "museum", "host", "clean", "bed", "kitchen",
+         "light", "neighborhood", "family", "coffee", "views", "sea", "mountains", "bikes", "wine",
+         "checkin", "quiet", "train", "airport", "friends", "weekend", "stay", "balcony", "pool")
+REVIEW_OPENINGS = ("Great stay", "Lovely place", "Would come back", "Decent value", "Not as described",
+                   "Perfect location", "Very clean", "Noisy at night", "Amazing host", "Just fine")
+RATINGS = (1, 2, 3, 4, 5)
+RATING_WEIGHTS = (3, 5, 12, 35, 45)
+
+
+def counts(scale):
+    """{collection: entity count} for a dataset of about scale entities"""
+    return {"users": max(1, scale * 3 // 10), "amenities": len(AMENITIES),
+            "places": max(1, scale // 5), "reviews": max(1, scale // 2)}
+
+
+def _skewed(count, exponent=1.0):
+    """Cumulative weights ranking index i with weight 1 / (i + 1) ** exponent"""
+    return list(accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+
+def _sentence(rng, words, length):
+    return " ".join(rng.choice(words) for _ in range(length))
+
+
+def user_payloads(rng, count):
+    for i in range(count):
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {"first_name": first_name, "last_name": last_name,
+               "email": f"{first_name}.{last_name}.{i}@example.com".replace(" ", "").lower()}
+
+
+def place_payloads(rng, count, hosts, amenity_ids, amenity_weights):
+    for _ in range(count):
+        city, lat, lon = rng.choice(CITIES)
+        adjective, kind = rng.choice(ADJECTIVES), rng.choice(KINDS)
+        yield {
+            "title":       f"{adjective.capitalize()} {kind} {rng.choice(FEATURES)} in {city}",
+            "description": f"A {adjective} {kind} in {city}. " + _sentence(rng, WORDS, rng.randint(8, 30)),
+            "price":       round(min(5_000.0, max(10.0, rng.lognormvariate(4.6, 0.6))), 2),
+            "latitude":    round(max(-90.0, min(90.0, rng.gauss(lat, 0.15))), 6),
+            "longitude":   round((rng.gauss(lon, 0.2) + 180) % 360 - 180, 6),
+            "owner_id":    rng.choice(hosts),
+            "amenities":   sorted(set(rng.choices(amenity_ids, cum_weights=amenity_weights,
+                                                  k=rng.randint(0, 8))))
+        }
+
+
+def review_payloads(rng, count, user_ids, place_ids, place_weights):
+    for _ in range(count):
+        yield {
+            "text":     f"{rng.choice(REVIEW_OPENINGS)}. " + _sentence(rng, WORDS, rng.randint(3, 25)),
+            "rating":   rng.choices(RATINGS, weights=RATING_WEIGHTS)[0],
+            "user_id":  rng.choice(user_ids),
+            "place_id": rng.choices(place_ids, cum_weights=place_weights)[0]
+        }
+
+
+def _batches(payloads, total):
+    payloads = iter(payloads)
+    for first in range(0, total, BATCH):
+        yield [next(payloads) for _ in range(min(BATCH, total - first))]
+
+
+def populate(facade, scale, seed=0):
+    """Write a synthetic dataset into facade; returns {collection: [ids]} in creation order"""
+    rng = random.Random(seed)
+    sizes = counts(scale)
+    ids = {"users": [], "amenities": [], "places": [], "reviews": []}
+    for batch in _batches(user_payloads(rng, sizes["users"]), sizes["users"]):
+        ids["users"].extend(user.id for user in facade.create_users(batch))
+    ids["amenities"] = [a.id for a in facade.create_amenities([{"name": n} for n in AMENITIES])]
+    hosts = ids["users"][:max(1, len(ids["users"]) // 5)]
+    places = place_payloads(rng, sizes["places"], hosts, ids["amenities"],
+                            _skewed(len(AMENITIES), 0.7))
+    for batch in _batches(places, sizes["places"]):
+        ids["places"].extend(place.id for place in facade.create_places(batch))
+    # Popular places collect most reviews; shuffled so popularity is not creation order
+    popular = rng.sample(ids["places"], len(ids["places"]))
+    reviews = review_payloads(rng, sizes["reviews"], ids["users"], popular,
+                              _skewed(len(popular), 0.8))
+    for batch in _batches(reviews, sizes["reviews"]):
+        ids["reviews"].extend(review.id for review in facade.create_reviews(batch))
+    return ids
+
+
+if __name__ == "__main__":
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    start = time.perf_counter()
+    ids = populate(HBnBFacade(), scale, seed)
+    elapsed = time.perf_counter() - start
+    total = sum(len(values) for values in ids.values())
+    print(", ".join(f"{len(values)} {name}" for name, values in ids.items()) +
+          f" in {elapsed:.1f} s ({total / elapsed:.0f} entities/s)")
@@ -0,0 +1,86 @@
+"""Bytes per entity for the compact models versus the previous __dict__ layout.
+
+Usage: python -m benchmarks.memory [count]
+"""
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class _DictModel:
+    """The pre-__slots__ layout: str UUID, two datetimes and a __dict__"""
+
+    def __init__(self, **fields):
+        self.id         = str(uuid.uuid4())
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+        self.__dict__.update(fields)
+
+
+def _legacy_factories(user_ids, place_ids, amenity_ids):
+    return {
+        "user":    lambda i: _DictModel(first_name="First", last_name="Last",
+                                        email=f"user{i}@example.com", is_admin=False),
+        "amenity": lambda i: _DictModel(name=f"Amenity {i}"),
+        "place":   lambda i: _DictModel(title="Flat", description="", price=80.0,
+                                        latitude=48.85, longitude=2.35,
+                                        owner_id=str(user_ids[i % len(user_ids)]),
+                                        amenities=list(amenity_ids[:3])),
+        "review":  lambda i: _DictModel(text="Great stay", rating=5,
+                                        place_id=str(place_ids[i % len(place_ids)]),
+                                        user_id=str(user_ids[i % len(user_ids)]))
+    }
+
+
+def _compact_factories(user_ids, place_ids, amenity_ids):
+    def place(i):
+        obj = Place("Flat", "", 80.0, 48.85, 2.35, user_ids[i % len(user_ids)])
+        obj.amenities = amenity_ids[:3]
+        return obj
+    return {
+        "user":    lambda i: User("First", "Last", f"user{i}@example.com"),
+        "amenity": lambda i: Amenity(f"Amenity {i}"),
+        "place":   place,
+        "review":  lambda i: Review("Great stay", 5, place_ids[i % len(place_ids)],
+                                    user_ids[i % len(user_ids)])
+    }
+
+
+def bytes_per_entity(factory, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def run(count=50_000):
+    users = [User("Owner", "Example", f"owner{i}@example.com") for i in range(100)]
+    amenities = [Amenity(f"Amenity {i}") for i in range(10)]
+    user_ids = [u.id for u in users]
+    amenity_ids = [a.id for a in amenities]
+    place_ids = [Place("Flat", "", 80.0, 0, 0, user_ids[0]).id for _ in range(100)]
+
+    legacy = _legacy_factories(user_ids, place_ids, amenity_ids)
+    compact = _compact_factories(user_ids, place_ids, amenity_ids)
+    results = {}
+    for kind in ("user", "amenity", "place", "review"):
+        results[kind] = {
+            "before": round(bytes_per_entity(legacy[kind], count)),
+            "after":  round(bytes_per_entity(compact[kind], count))
+        }
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    print(f"{'entity':<10}{'before':>10}{'after':>10}   (bytes per entity, {count} each)")
+    for kind, sizes in run(count).items():
+        print(f"{kind:<10}{sizes['before']:>10}{sizes['after']:>10}")
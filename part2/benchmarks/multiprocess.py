@@ -0,0 +1,155 @@
+"""HTTP throughput with N worker processes sharing one store server.
+
+Starts store.py's StoreServer in its own process, seeds it, then for each
+worker count serves the API from that many processes (one werkzeug server
+each, on consecutive ports) and drives them from CLIENTS load processes
+doing GET /api/v1/places/<id> and GET /api/v1/places/?limit=20. A single
+process with its own in-memory facade is measured first as the baseline.
+Before each run, a place updated through one worker must read back
+updated through every other worker.
+
+Usage: python -m benchmarks.multiprocess [seconds] [clients]
+"""
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+PORT = 5100
+PLACES = 2_000
+
+
+def _store(path, ready):
+    from app import facade
+    from app.services.remote import StoreServer
+    server = StoreServer(facade, path)
+    ready.set()
+    server.serve_forever()
+
+
+def _worker(port, socket_path):
+    if socket_path:
+        os.environ["HBNB_STORE_SOCKET"] = socket_path
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from app import create_app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args):
+            pass
+
+    make_server("127.0.0.1", port, create_app(), request_handler=QuietHandler).serve_forever()
+
+
+def _request(port, method, path, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                 headers={"Content-Type": "application/json"})
+    res = conn.getresponse()
+    data = res.read()
+    conn.close()
+    return res.status, json.loads(data) if data else None
+
+
+def _client(ports, place_ids, seconds, seed, results):
+    rng = random.Random(seed)
+    done = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        port = ports[done % len(ports)]
+        if rng.random() < 0.8:
+            _request(port, "GET", f"/api/v1/places/{rng.choice(place_ids)}")
+        else:
+            _request(port, "GET", "/api/v1/places/?limit=20")
+        done += 1
+    results.put(done)
+
+
+def _wait_for(port):
+    for _ in range(200):
+        try:
+            _request(port, "GET", "/api/v1/amenities/?limit=1")
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Worker on port {port} did not start")
+
+
+def _seed(port):
+    _, owner = _request(port, "POST", "/api/v1/users/",
+                        {"first_name": "Owner", "last_name": "Bench", "email": "owner@bench.com"})
+    rng = random.Random(0)
+    ids = []
+    for start in range(0, PLACES, 1000):
+        _, body = _request(port, "POST", "/api/v1/places/batch", [{
+            "title": f"Place {i}", "price": rng.uniform(20, 500),
+            "latitude": rng.uniform(-60, 60), "longitude": rng.uniform(-180, 180),
+            "owner_id": owner["id"]
+        } for i in range(start, min(PLACES, start + 1000))])
+        ids += body["ids"]
+    return ids
+
+
+def _check_consistent(ports, place_id):
+    price = round(random.uniform(20, 500), 2)
+    _request(ports[0], "PUT", f"/api/v1/places/{place_id}", {"price": price})
+    return all(_request(port, "GET", f"/api/v1/places/{place_id}")[1]["price"] == price
+               for port in ports)
+
+
+def measure(ctx, workers, socket_path, seconds, clients, place_ids=None):
+    """Return (requests/second, reads consistent, place IDs); seeds the store without place_ids"""
+    ports = [PORT + i for i in range(workers)]
+    procs = [ctx.Process(target=_worker, args=(port, socket_path), daemon=True) for port in ports]
+    for proc in procs:
+        proc.start()
+    try:
+        for port in ports:
+            _wait_for(port)
+        place_ids = place_ids or _seed(ports[0])
+        consistent = _check_consistent(ports, place_ids[0])
+        results = ctx.Queue()
+        loaders = [ctx.Process(target=_client, args=(ports, place_ids, seconds, n, results))
+                   for n in range(clients)]
+        for loader in loaders:
+            loader.start()
+        total = sum(results.get() for _ in loaders)
+        for loader in loaders:
+            loader.join()
+        return round(total / seconds), consistent, place_ids
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.join()
+
+
+def run(seconds=5, clients=4, worker_counts=(1, 2, 4)):
+    ctx = multiprocessing.get_context("spawn")
+    results = {"local, 1 worker": measure(ctx, 1, None, seconds, clients)[:2]}
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "store.sock")
+        ready = ctx.Event()
+        store = ctx.Process(target=_store, args=(socket_path, ready), daemon=True)
+        store.start()
+        ready.wait(30)
+        place_ids = None
+        try:
+            for workers in worker_counts:
+                rate, consistent, place_ids = measure(ctx, workers, socket_path,
+                                                      seconds, clients, place_ids)
+                results[f"store, {workers} workers"] = rate, consistent
+        finally:
+            store.terminate()
+            store.join()
+    return results
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    print(f"requests/second, {clients} client processes, {os.cpu_count()} CPUs")
+    for name, (rate, consistent) in run(seconds, clients).items():
+        print(f"{name:<18}{rate:>8}  reads consistent across workers: {consistent}")
@@ -0,0 +1,60 @@
+"""Cold-start time of the write-ahead-log repository.
+
+Writes COUNT reviews (half compacted into the snapshot, half left in the
+log), then times reopening the repository eagerly and lazily (memory-mapped
+snapshot), plus the first lookup of a snapshot record in the lazy case and
+a lazy restart right after a full compaction.
+
+Usage: python -m benchmarks.restart [count]
+"""
+import os
+import sys
+import tempfile
+import time
+from app.models.review import Review
+from app.persistence.wal import PersistentRepository
+
+
+def run(count=1_000_000):
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, "reviews")
+        repo = PersistentRepository(path, Review, indexes=("place_id",),
+                                    fsync=False, compact_every=count + 1)
+        place_ids = [f"place-{i}" for i in range(1000)]
+        start = time.perf_counter()
+        for i in range(count):
+            repo.add(Review("Great stay", 1 + i % 5, place_ids[i % len(place_ids)], "user"))
+            if i == count // 2:
+                repo.compact()
+        write_s = time.perf_counter() - start
+        repo.close()
+        sizes = {name: os.path.getsize(f"{path}.{name}") for name in ("snapshot", "wal")}
+
+        start = time.perf_counter()
+        reopened = PersistentRepository(path, Review, indexes=("place_id",), fsync=False)
+        restart_s = time.perf_counter() - start
+        assert len(reopened.get_all()) == count
+        some_id = reopened.get_all()[count // 4].id
+        reopened.close()
+
+        start = time.perf_counter()
+        lazy = PersistentRepository(path, Review, indexes=("place_id",), fsync=False, lazy=True)
+        lazy_restart_s = time.perf_counter() - start
+        start = time.perf_counter()
+        assert lazy.get(some_id) is not None
+        first_get_ms = (time.perf_counter() - start) * 1000
+        lazy.compact()
+        lazy.close()
+
+        start = time.perf_counter()
+        compacted = PersistentRepository(path, Review, indexes=("place_id",), fsync=False, lazy=True)
+        compacted_restart_s = time.perf_counter() - start
+        compacted.close()
+    return {"entities": count, "write_s": round(write_s, 2), "restart_s": round(restart_s, 2),
+            "lazy_restart_s": round(lazy_restart_s, 2), "lazy_first_get_ms": round(first_get_ms, 3),
+            "lazy_compacted_restart_s": round(compacted_restart_s, 4),
+            "snapshot_bytes": sizes["snapshot"], "wal_bytes": sizes["wal"]}
+
+
+if __name__ == "__main__":
+    print(run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
@@ -0,0 +1,75 @@
+"""List serialization, flask_restx marshal versus compiled serializers.
+
+Builds a list of entities per response model and times (best of three)
+turning it into the JSON body of a list endpoint: marshal() followed by json.dumps() (the
+previous ns.marshal_list_with path) against dump_list() with the model's
+compiled serializer. Both bodies are checked to be identical. Users,
+reviews and amenities are serialized from model objects, places from the
+dicts built by the facade (with their rating summary).
+
+Usage: python -m benchmarks.serialization [count]
+"""
+import json
+import random
+import sys
+import time
+from flask_restx import marshal
+from app.api.v1.amenities import amenity_response
+from app.api.v1.places import place_response
+from app.api.v1.reviews import review_response
+from app.api.v1.serialization import compile_serializer, dump_list
+from app.api.v1.users import user_response
+from app.services.facade import HBnBFacade
+
+
+def _data(count):
+    rng = random.Random(0)
+    facade = HBnBFacade()
+    users = facade.create_users([{"first_name": "User", "last_name": str(i),
+                                  "email": f"user{i}@bench.com"} for i in range(count)])
+    amenities = facade.create_amenities([{"name": f"Amenity {i}"} for i in range(count)])
+    places = facade.create_places([{
+        "title": f"Place {i}", "description": "A quiet place", "price": rng.uniform(20, 500),
+        "latitude": rng.uniform(-90, 90), "longitude": rng.uniform(-180, 180),
+        "owner_id": rng.choice(users).id, "amenities": [a.id for a in rng.sample(amenities[:50], 3)]
+    } for i in range(count)])
+    reviews = facade.create_reviews([{
+        "text": f"Review {i}", "rating": rng.randint(1, 5),
+        "user_id": rng.choice(users).id, "place_id": rng.choice(places).id
+    } for i in range(count)])
+    return {
+        "users":     (user_response, users),
+        "amenities": (amenity_response, amenities),
+        "reviews":   (review_response, reviews),
+        "places":    (place_response, facade.get_all_places())
+    }
+
+
+def _time(func, repeat=3):
+    """(best of repeat runs in seconds, result)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(count=100_000):
+    """{collection: (marshal seconds, compiled seconds)}"""
+    results = {}
+    for name, (model, objs) in _data(count).items():
+        serialize = compile_serializer(model)
+        marshalled, expected = _time(lambda: json.dumps(marshal(objs, model)).encode() + b"\n")
+        compiled, body = _time(lambda: dump_list(serialize, objs))
+        assert body == expected, f"{name}: compiled output differs from marshal"
+        results[name] = (marshalled, compiled)
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{count} items per list, seconds to build the JSON body")
+    for name, (marshalled, compiled) in run(count).items():
+        print(f"{name:<10} marshal {marshalled:>7.3f}  compiled {compiled:>7.3f}  "
+              f"{marshalled / compiled:>5.1f}x")
@@ -0,0 +1,69 @@
+"""Throughput of SQLiteRepository versus InMemoryRepository under concurrent load.
+
+Each thread runs a mix of 80% get-by-id, 15% get_by_attribute("email") and
+5% add against a repository pre-loaded with SEED users.
+
+Usage: python -m benchmarks.sqlite_vs_memory [seed] [ops_per_thread]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlite import SQLiteRepository
+
+
+def _worker(repo, ids, emails, ops, seed, tag, counter):
+    rng = random.Random(seed)
+    for i in range(ops):
+        roll = rng.random()
+        if roll < 0.80:
+            repo.get(rng.choice(ids))
+        elif roll < 0.95:
+            repo.get_by_attribute("email", rng.choice(emails))
+        else:
+            repo.add(User("Load", "Test", f"load-{tag}-{seed}-{i}@bench.com"))
+    counter.append(ops)
+
+
+def measure(repo, ids, emails, threads, ops):
+    done = []
+    workers = [threading.Thread(target=_worker, args=(repo, ids, emails, ops, n, threads, done))
+               for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return round(sum(done) / (time.perf_counter() - start))
+
+
+def run(seed=20_000, ops=5_000, thread_counts=(1, 2, 4, 8)):
+    users = [User("Seed", "User", f"seed{i}@bench.com") for i in range(seed)]
+    ids = [u.id for u in users]
+    emails = [u.email for u in users]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            "memory": InMemoryRepository(unique_indexes=("email",)),
+            "sqlite": SQLiteRepository(os.path.join(tmp, "bench.db"), "users", User,
+                                       unique_indexes=("email",))
+        }
+        for name, repo in backends.items():
+            for user in users:
+                repo.add(user)
+            results[name] = {threads: measure(repo, ids, emails, threads, ops)
+                             for threads in thread_counts}
+        backends["sqlite"].close()
+    return results
+
+
+if __name__ == "__main__":
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    ops = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    print("ops/second by thread count")
+    for name, by_threads in run(seed, ops).items():
+        print(f"{name:<8}" + "".join(f"{t:>4} threads: {v:>8}  " for t, v in by_threads.items()))
@@ -0,0 +1,123 @@
+"""Startup cost: milliseconds from process start to the first served request.
+
+Each sample is a fresh Python process that imports the app, calls
+create_app() and serves one request through the test client, either the
+Swagger document (GET /swagger.json) or a list endpoint (GET /api/v1/users/).
+The time is measured from just before the process is spawned, so
+interpreter startup is included. Processes are run without a Swagger disk
+cache and then with HBNB_SWAGGER_CACHE pointing at a file written by the
+first of them. Then the same requests are timed in workers forked from a
+process that already ran create_app() and warm_up(), as a pre-fork server
+would start them. Also reported, in one process: import of the facade alone
+(what store.py loads), and the per-call cost of create_app() and of its
+first /swagger.json, which every test's setUp pays.
+
+Usage: python -m benchmarks.startup [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_CHILD = """
+import json, sys, time
+start = float(sys.argv[1])
+t0 = time.time()
+from app import create_app
+t1 = time.time()
+app = create_app()
+t2 = time.time()
+status = app.test_client().get(sys.argv[2]).status_code
+t3 = time.time()
+print(json.dumps({"import": t1 - t0, "create_app": t2 - t1, "request": t3 - t2,
+                  "total": t3 - start, "status": status}))
+"""
+
+
+def _spawn(path, env):
+    start = time.time()
+    out = subprocess.run([sys.executable, "-c", _CHILD, repr(start), path], env=env,
+                         capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    assert result["status"] == 200, result
+    return result
+
+
+def _median_ms(samples):
+    return {key: round(statistics.median(s[key] for s in samples) * 1000, 1)
+            for key in ("import", "create_app", "request", "total")}
+
+
+def _forked(path, app):
+    """Seconds from fork() to the response in the child"""
+    read_end, write_end = os.pipe()
+    start = time.time()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        status = app.test_client().get(path).status_code
+        os.write(write_end, json.dumps([time.time() - start, status]).encode())
+        os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end) as f:
+        elapsed, status = json.loads(f.read())
+    os.waitpid(pid, 0)
+    assert status == 200, status
+    return elapsed
+
+
+def _in_process(runs):
+    start = time.perf_counter()
+    from app import facade  # noqa: F401  (the facade only, as the store server imports it)
+    facade_import = time.perf_counter() - start
+    from app import create_app
+    create_app()
+    timings = {"create_app": [], "swagger": []}
+    for _ in range(runs):
+        start = time.perf_counter()
+        app = create_app()
+        timings["create_app"].append(time.perf_counter() - start)
+        client = app.test_client()
+        start = time.perf_counter()
+        client.get("/swagger.json")
+        timings["swagger"].append(time.perf_counter() - start)
+    results = {key: round(statistics.median(values) * 1000, 2) for key, values in timings.items()}
+    results["facade import"] = round(facade_import * 1000, 1)
+    return results
+
+
+def _prefork(runs):
+    from app import create_app, warm_up
+    app = create_app()
+    warm_up(app)
+    return {path: round(statistics.median(_forked(path, app) for _ in range(runs)) * 1000, 1)
+            for path in ("/swagger.json", "/api/v1/users/")}
+
+
+def run(runs=10):
+    """({(first request, swagger cache): median ms by phase}, in-process ms, forked worker ms)"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, HBNB_STORAGE="memory", HBNB_METRICS="1")
+        env.pop("HBNB_SWAGGER_CACHE", None)
+        cached_env = dict(env, HBNB_SWAGGER_CACHE=os.path.join(tmp, "swagger.json"))
+        _spawn("/swagger.json", cached_env)
+        for path in ("/swagger.json", "/api/v1/users/"):
+            for cache, child_env in (("none", env), ("disk", cached_env)):
+                results[path, cache] = _median_ms([_spawn(path, child_env) for _ in range(runs)])
+    return results, _in_process(runs * 5), _prefork(runs)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    processes, in_process, forked = run(runs)
+    print(f"fresh processes, median of {runs}, ms")
+    for (path, cache), ms in processes.items():
+        print(f"{path:<15} cache {cache:<5} import {ms['import']:>6}  create_app {ms['create_app']:>6}"
+              f"  request {ms['request']:>6}  spawn to response {ms['total']:>6}")
+    for path, ms in forked.items():
+        print(f"{path:<15} worker forked after warm_up(), fork to response {ms:>6}")
+    print("in one process, ms: " + ", ".join(f"{key} {value}" for key, value in in_process.items()))
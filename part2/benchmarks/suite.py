@@ -0,0 +1,315 @@
+"""Repeatable micro-benchmarks and HTTP load tests, with JSON results.
+
+Loads a synthetic dataset (benchmarks.data) into the application facade,
+with the storage backend selected by HBNB_STORAGE, then measures:
+
+- micro: single repository and facade operations (lookups by ID and
+  index, relation expansion, geo/price/text searches, rankings, writes);
+- http: each endpoint through the Flask test client, or with
+  ``--http server`` through a local threaded server in another process,
+  driven by ``--clients`` keep-alive connections.
+
+Every benchmark draws its arguments from its own generator seeded with
+the run seed and runs a warm-up. It then records the latency of each of
+``--ops`` operations, in three rounds, keeping the round with the lowest
+mean latency. Results (ops/s, mean, p50, p90 and p99 latency in
+µs) are written as JSON with the commit, Python version, storage and
+dataset size. ``--compare`` prints each benchmark against an earlier
+results file and marks changes above 10%.
+
+Usage: python -m benchmarks.suite [--scale N] [--seed S] [--ops N] [--only micro|http]
+                                  [--http client|server] [--clients N]
+                                  [--output FILE] [--compare FILE]
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import platform
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+from itertools import count
+from benchmarks.data import CITIES, WORDS, populate
+
+SAMPLE = 1_000
+WARMUP = 50
+ROUNDS = 3
+PORT = 5200
+# Changes in ops/s smaller than this are reported as noise
+THRESHOLD = 0.10
+
+
+def _samples(facade, ids, seed):
+    """A fixed random subset of the dataset to draw request arguments from"""
+    rng = random.Random(seed)
+    samples = {name: rng.sample(values, min(SAMPLE, len(values))) for name, values in ids.items()}
+    samples["emails"] = [facade.get_user(uid).email for uid in samples["users"]]
+    return samples
+
+
+def _stats(latencies, wall=None):
+    latencies = sorted(latencies)
+    total = len(latencies)
+
+    def us(seconds):
+        return round(seconds * 1e6, 1)
+    return {
+        "ops":       total,
+        "ops_per_s": round(total / (wall if wall is not None else sum(latencies)), 1),
+        "mean_us":   us(sum(latencies) / total),
+        "p50_us":    us(latencies[total // 2]),
+        "p90_us":    us(latencies[int(total * 0.9)]),
+        "p99_us":    us(latencies[min(total - 1, int(total * 0.99))])
+    }
+
+
+def _measure(op, seed, ops):
+    rng = random.Random(seed)
+    for _ in range(min(WARMUP, ops)):
+        op(rng)
+    best = None
+    for _ in range(ROUNDS):
+        latencies = []
+        for _ in range(ops):
+            start = time.perf_counter()
+            op(rng)
+            latencies.append(time.perf_counter() - start)
+        if best is None or sum(latencies) < sum(best):
+            best = latencies
+    return _stats(best)
+
+
+def _near(rng):
+    _, lat, lon = rng.choice(CITIES)
+    return lat + rng.uniform(-0.1, 0.1), lon + rng.uniform(-0.1, 0.1)
+
+
+def micro_benchmarks(facade, samples):
+    """{name: op(rng)}, reads first; the writes only add and update entities"""
+    users, places, amenities = samples["users"], samples["places"], samples["amenities"]
+    emails, serial = samples["emails"], count()
+
+    def price_range(rng):
+        low = rng.uniform(20, 300)
+        return facade.search_places(min_price=low, max_price=low * 1.2,
+                                    amenities=[rng.choice(amenities)])
+
+    def create_user(rng):
+        facade.create_user({"first_name": "Bench", "last_name": "User",
+                            "email": f"bench.{next(serial)}@suite.example.com"})
+
+    return {
+        "repository.get":                lambda rng: facade.place_repo.get(rng.choice(places)),
+        "repository.get_many_20":        lambda rng: facade.place_repo.get_many(rng.sample(places, 20)),
+        "repository.get_by_email":       lambda rng: facade.user_repo.get_by_attribute(
+                                             "email", rng.choice(emails)),
+        "repository.get_page_20":        lambda rng: facade.place_repo.get_page(20),
+        "facade.get_place_expanded":     lambda rng: facade.get_place(rng.choice(places)),
+        "facade.get_places_page_20":     lambda rng: facade.get_places_page(20, expand=("owner",)),
+        "facade.get_reviews_by_place":   lambda rng: facade.get_reviews_by_place(rng.choice(places)),
+        "facade.get_places_by_owner":    lambda rng: facade.get_places_by_owner(rng.choice(users)),
+        "facade.search_near_2km":        lambda rng: facade.search_places(near=_near(rng),
+                                                                          radius_km=2),
+        "facade.search_price_amenity":   price_range,
+        "facade.search_text":            lambda rng: facade.search_place_text(
+                                             f"{rng.choice(WORDS)} {rng.choice(WORDS)[:3]}"),
+        "facade.top_rated":              lambda rng: facade.get_top_rated_places(10),
+        "facade.create_user":            create_user,
+        "facade.update_place":           lambda rng: facade.update_place(
+                                             rng.choice(places), {"price": round(rng.uniform(20, 500), 2)}),
+        "facade.create_review":          lambda rng: facade.create_review({
+                                             "text": "Bench review", "rating": rng.randint(1, 5),
+                                             "user_id": rng.choice(users),
+                                             "place_id": rng.choice(places)})
+    }
+
+
+def http_requests(samples):
+    """{name: request(rng) -> (method, path, body)}"""
+    users, places = samples["users"], samples["places"]
+
+    def near(rng):
+        lat, lon = _near(rng)
+        return "GET", f"/api/v1/places/?near={lat:.4f},{lon:.4f}&radius_km=2", None
+
+    return {
+        "GET /users/<id>":          lambda rng: ("GET", f"/api/v1/users/{rng.choice(users)}", None),
+        "GET /places/<id>":         lambda rng: ("GET", f"/api/v1/places/{rng.choice(places)}", None),
+        "GET /places/?limit=20":    lambda rng: ("GET", "/api/v1/places/?limit=20", None),
+        "GET /places/?near":        near,
+        "GET /places/search":       lambda rng: ("GET", f"/api/v1/places/search?q={rng.choice(WORDS)}",
+                                                 None),
+        "GET /reviews/places/<id>": lambda rng: ("GET", f"/api/v1/reviews/places/{rng.choice(places)}",
+                                                 None),
+        "POST /reviews/":           lambda rng: ("POST", "/api/v1/reviews/", {
+                                        "text": "Bench review", "rating": rng.randint(1, 5),
+                                        "user_id": rng.choice(users), "place_id": rng.choice(places)})
+    }
+
+
+def _check(status, method, path):
+    if status >= 400:
+        raise RuntimeError(f"{method} {path} answered {status}")
+
+
+def http_client_benchmarks(app, samples, seed, ops):
+    """Every request through the Flask test client, one at a time"""
+    client = app.test_client()
+    results = {}
+    for name, request in http_requests(samples).items():
+        def op(rng):
+            method, path, body = request(rng)
+            res = client.open(path, method=method, json=body)
+            _check(res.status_code, method, path)
+        results[name] = _measure(op, f"{seed}:{name}", ops)
+    return results
+
+
+def _serve(scale, seed, conn):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from app import create_app, facade
+
+    class Handler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_request(self, *args):
+            pass
+
+    ids = populate(facade, scale, seed)
+    server = make_server("127.0.0.1", PORT, create_app(), threaded=True, request_handler=Handler)
+    conn.send(_samples(facade, ids, seed))
+    server.serve_forever()
+
+
+def _client(request, seed, ops, latencies):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=60)
+    for i in range(ops):
+        method, path, body = request(rng)
+        start = time.perf_counter()
+        conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                     headers={"Content-Type": "application/json"})
+        res = conn.getresponse()
+        res.read()
+        if i >= WARMUP:
+            latencies.append(time.perf_counter() - start)
+        _check(res.status, method, path)
+    conn.close()
+
+
+def http_server_benchmarks(samples, seed, ops, clients):
+    """Each endpoint under load from clients concurrent keep-alive connections"""
+    results = {}
+    for name, request in http_requests(samples).items():
+        latencies = []
+        per_client = ops // clients + WARMUP
+        threads = [threading.Thread(target=_client, args=(request, f"{seed}:{name}:{i}",
+                                                           per_client, latencies))
+                   for i in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results[name] = _stats(latencies, time.perf_counter() - start)
+    return results
+
+
+def _commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def run(scale=10_000, seed=0, ops=2_000, only=None, http="client", clients=4):
+    """Results document: {"meta": {...}, "results": {benchmark: stats}}"""
+    from app import create_app, facade
+    from app.config import Config
+    commit, dirty = _commit()
+    meta = {"commit": commit, "dirty": dirty, "python": platform.python_version(),
+            "platform": platform.platform(), "storage": Config.STORAGE, "metrics": Config.METRICS,
+            "scale": scale, "seed": seed, "ops": ops,
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    results = {}
+    if only in (None, "micro") or http == "client":
+        start = time.perf_counter()
+        ids = populate(facade, scale, seed)
+        meta["load_seconds"] = round(time.perf_counter() - start, 2)
+        samples = _samples(facade, ids, seed)
+        if only in (None, "micro"):
+            for name, op in micro_benchmarks(facade, samples).items():
+                results[f"micro.{name}"] = _measure(op, f"{seed}:{name}", ops)
+        if only in (None, "http") and http == "client":
+            for name, stats in http_client_benchmarks(create_app(), samples, seed, ops).items():
+                results[f"http.client.{name}"] = stats
+    if only in (None, "http") and http == "server":
+        meta["clients"] = clients
+        # Spawned, not forked: the server loads its own copy of the dataset
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        server = context.Process(target=_serve, args=(scale, seed, sender), daemon=True)
+        server.start()
+        try:
+            samples = receiver.recv()
+            for name, stats in http_server_benchmarks(samples, seed, ops, clients).items():
+                results[f"http.server.{name}"] = stats
+        finally:
+            server.terminate()
+            server.join()
+    return {"meta": meta, "results": results}
+
+
+def compare(old, new):
+    """Lines comparing the benchmarks present in both result documents"""
+    lines = [f"{'benchmark':<42} {'ops/s before':>13} {'after':>11} {'change':>8}"
+             f" {'p99 µs before':>14} {'after':>10}"]
+    for name, after in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        change = after["ops_per_s"] / before["ops_per_s"] - 1
+        flag = "" if abs(change) < THRESHOLD else ("  faster" if change > 0 else "  SLOWER")
+        lines.append(f"{name:<42} {before['ops_per_s']:>13} {after['ops_per_s']:>11}"
+                     f" {change:>+8.1%} {before['p99_us']:>14} {after['p99_us']:>10}{flag}")
+    return lines
+
+
+def _arguments():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n")[0])
+    parser.add_argument("--scale", type=int, default=10_000, help="entities in the dataset (10k to 10M)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ops", type=int, default=2_000, help="measured operations per benchmark")
+    parser.add_argument("--only", choices=("micro", "http"))
+    parser.add_argument("--http", choices=("client", "server"), default="client")
+    parser.add_argument("--clients", type=int, default=4, help="connections with --http server")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _arguments()
+    document = run(args.scale, args.seed, args.ops, args.only, args.http, args.clients)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+    meta = document["meta"]
+    print(f"commit {meta['commit']}{' (modified)' if meta['dirty'] else ''}, {meta['storage']} storage,"
+          f" scale {meta['scale']}, seed {meta['seed']}, {meta['ops']} ops per round")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"compared with commit {baseline['meta']['commit']}")
+        print("\n".join(compare(baseline, document)))
+    else:
+        print(f"{'benchmark':<42} {'ops/s':>11} {'p50 µs':>9} {'p99 µs':>9}")
+        for name, stats in document["results"].items():
+            print(f"{name:<42} {stats['ops_per_s']:>11} {stats['p50_us']:>9} {stats['p99_us']:>9}")
@@ -0,0 +1,79 @@
+"""Full-text search latency over synthetic listings.
+
+Builds places whose titles and descriptions draw words from a Zipf-like
+distribution over a 20,000-word vocabulary (a few words appear in most
+listings, most words are rare), then times facade.search_place_text for
+four kinds of queries: one rare word, the most common word, a common plus
+a mid-frequency word, and a three-letter prefix. Each set runs twice: the
+first pass also sorts the postings of common terms for the index, the
+repeat pass finds them cached.
+
+Usage: python -m benchmarks.text_search [places] [queries]
+"""
+import random
+import sys
+import time
+from itertools import accumulate
+from app.services.facade import HBnBFacade
+
+VOCABULARY = 20_000
+BATCH = 10_000
+
+
+def _words(rng, count):
+    syllables = ["ka", "lo", "mi", "ra", "se", "tu", "ve", "no", "pi", "da", "re", "su"]
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words, key=lambda w: rng.random())
+
+
+def _build(places, rng, words):
+    facade = HBnBFacade()
+    owner = facade.create_user({"first_name": "Owner", "last_name": "Bench",
+                                "email": "owner@bench.com"}).id
+    cum_weights = list(accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    elapsed = 0.0
+    for first in range(0, places, BATCH):
+        batch = [{
+            "title":       " ".join(rng.choices(words, cum_weights=cum_weights, k=4)),
+            "description": " ".join(rng.choices(words, cum_weights=cum_weights, k=20)),
+            "price": 100, "latitude": 0, "longitude": 0, "owner_id": owner
+        } for _ in range(first, min(places, first + BATCH))]
+        start = time.perf_counter()
+        facade.create_places(batch)
+        elapsed += time.perf_counter() - start
+    return facade, round(places / elapsed)
+
+
+def _latency(facade, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        facade.search_place_text(query)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return round(times[len(times) // 2] * 1000, 2), round(times[int(len(times) * 0.99)] * 1000, 2)
+
+
+def run(places=100_000, queries=200):
+    rng = random.Random(0)
+    words = _words(rng, VOCABULARY)
+    facade, rate = _build(places, rng, words)
+    kinds = {
+        "rare word":     [rng.choice(words[5_000:]) for _ in range(queries)],
+        "common word":   [words[0]] * queries,
+        "common + mid":  [f"{words[0]} {rng.choice(words[50:500])}" for _ in range(queries)],
+        "3-char prefix": [rng.choice(words[50:500])[:3] for _ in range(queries)]
+    }
+    return rate, {kind: (_latency(facade, qs), _latency(facade, qs)) for kind, qs in kinds.items()}
+
+
+if __name__ == "__main__":
+    places = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rate, results = run(places, queries)
+    print(f"{places} places indexed at {rate} places/s (create_places, all indexes)")
+    for kind, ((p50, p99), (warm_p50, warm_p99)) in results.items():
+        print(f"{kind:<15} first pass p50 {p50:>8} ms  p99 {p99:>8} ms"
+              f"  repeat p50 {warm_p50:>8} ms  p99 {warm_p99:>8} ms")
@@ -0,0 +1,75 @@
+"""Per-request payload validation, JSON schema plus constructor versus compiled validators.
+
+Times, per payload, what a POST used to pay before a model was built: the
+flask_restx ``validate=True`` pass (a JSON schema validator interpreting the
+API model) followed by the constructor's own checks. The other path is the
+model's create(), which runs the validator compiled once from its fields.
+Invalid payloads are timed too, since they take the same path until the
+error is raised.
+
+Usage: python -m benchmarks.validation [count]
+"""
+import sys
+import time
+from werkzeug.exceptions import BadRequest
+from app import create_app
+from app.api.v1.places import place_model
+from app.api.v1.reviews import review_model
+from app.api.v1.users import user_model
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+PAYLOADS = {
+    "user": (user_model, User, {"first_name": "Ada", "last_name": "Lovelace",
+                                "email": "Ada@Example.com"}),
+    "place": (place_model, Place, {"title": "Loft", "description": "Bright", "price": 80,
+                                   "latitude": 48.85, "longitude": 2.35, "owner_id": "u1",
+                                   "amenities": ["a1", "a2"]}),
+    "review": (review_model, Review, {"text": "Lovely stay", "rating": 5,
+                                      "place_id": "p1", "user_id": "u1"}),
+    "invalid place": (place_model, Place, {"title": "Loft", "price": "80", "latitude": 0,
+                                           "longitude": 0, "owner_id": "u1"})
+}
+
+
+def _schema_then_construct(model, cls, payload):
+    try:
+        model.validate(payload)
+    except BadRequest:
+        return
+    fields = {key: value for key, value in payload.items() if key != "amenities"}
+    try:
+        cls(**fields)
+    except ValueError:
+        return
+
+
+def _compiled(cls, payload):
+    try:
+        cls.create(payload)
+    except ValueError:
+        return
+
+
+def _per_call(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def run(count=20_000):
+    """{payload: (schema + constructor µs, compiled µs)}"""
+    with create_app().app_context():
+        return {name: (_per_call(lambda: _schema_then_construct(model, cls, payload), count),
+                       _per_call(lambda: _compiled(cls, payload), count))
+                for name, (model, cls, payload) in PAYLOADS.items()}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{count} payloads each, µs per payload")
+    for name, (schema, compiled) in run(count).items():
+        print(f"{name:<14} schema + constructor {schema:>7.1f}  compiled {compiled:>6.1f}  "
+              f"{schema / compiled:>5.1f}x")
@@ -0,0 +1,24 @@
+"""gunicorn settings, read from the working directory: gunicorn -w 4 run:app
+
+The app is imported and warmed up once in the master, then forked into
+workers, which serve their first request without repeating that work. Use
+it with HBNB_STORE_SOCKET so the workers share one store server; with a
+local facade each worker would own a diverging copy of the data.
+
+Importing the app builds the facade, and the wal and sqlite backends open
+their files and connections right then. A connection or log handle must
+not be shared across fork(), so with those backends and no store server
+the app is not preloaded and each worker imports it itself.
+"""
+import os
+
+preload_app = bool(os.environ.get("HBNB_STORE_SOCKET")) or \
+    os.environ.get("HBNB_STORAGE", "memory") in ("memory", "columnar")
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    from app import warm_up
+    from run import app
+    warm_up(app)
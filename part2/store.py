@@ -0,0 +1,28 @@
+"""Store server for multi-process deployments.
+
+Owns the data (any HBNB_STORAGE backend) and serves it to API workers
+started with HBNB_STORE_SOCKET pointing at the same socket:
+
+    HBNB_STORAGE=wal python3 store.py /tmp/hbnb.sock
+    HBNB_STORE_SOCKET=/tmp/hbnb.sock gunicorn -w 4 run:app
+"""
+import os
+import sys
+
+# This process must build the real facade, not a client of itself
+path = sys.argv[1] if len(sys.argv) > 1 else os.environ.get("HBNB_STORE_SOCKET", "hbnb.sock")
+os.environ.pop("HBNB_STORE_SOCKET", None)
+
+from app import facade
+from app.services.remote import StoreServer
+
+if __name__ == "__main__":
+    server = StoreServer(facade, path)
+    print(f"HBnB store serving on {path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        facade.close()
@@ -1,6 +1,38 @@
 import unittest
+import asyncio
+import base64
 import json
-from app import create_app
+import os
+import runpy
+import tempfile
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from unittest import mock
+from flask_restx import marshal
+from app import create_app, facade
+from app.api import startup
+from app.api.startup import CachedSchemaApi, LazyRuleFlask
+from app.api.v1.caching import ResponseCache, response_cache
+from app.api.v1.places import expanded_place_models
+from app.api.v1.serialization import compile_serializer, dump_list
+from app.api.v1.users import ns as users_ns, user_response
+from app.asgi import ASGIApp
+from app.config import Config
+from app.models import place as place_module
+from app.models.place import Place
+from app.models.user import User
+from app.persistence import columnar, repository_factory
+from app.persistence.repository import InMemoryRepository
+from app.persistence.columnar import ColumnarRepository
+from app.persistence.indexes import SortedIndex
+from app.persistence.locking import RWLock
+from app.persistence.spatial import GridIndex
+from app.persistence.text import TextIndex, search
+from app.persistence.sqlite import SQLiteRepository
+from app.persistence.wal import PersistentRepository
+from app.services.facade import HBnBFacade
+from app.services.remote import RemoteFacade, StoreServer
 
 
 class TestHBnBAPI(unittest.TestCase):
@@ -175,6 +207,944 @@ class TestHBnBAPI(unittest.TestCase):
         res = self.client.delete("/api/v1/reviews/nonexistent-id")
         self.assertEqual(res.status_code, 404)
 
+    def test_26_reviews_by_place_only_returns_that_place(self):
+        place_id, user_id = self._create_place("rev6@test.com")
+        other_id, _ = self._create_place("rev7@test.com")
+        for text, pid in (("First", place_id), ("Other", other_id), ("Second", place_id)):
+            data = {"text": text, "rating": 4, "place_id": pid, "user_id": user_id}
+            self.client.post("/api/v1/reviews/", data=json.dumps(data), headers=self.headers)
+        res = self.client.get(f"/api/v1/reviews/places/{place_id}")
+        self.assertEqual([r["text"] for r in res.get_json()], ["First", "Second"])
+
+    def test_27_paginate_users_with_cursor(self):
+        for i in range(3):
+            self._create_user(f"page{i}@test.com")
+        seen, cursor = [], None
+        while True:
+            query = f"?limit=2&cursor={cursor}" if cursor else "?limit=2"
+            res = self.client.get(f"/api/v1/users/{query}")
+            self.assertEqual(res.status_code, 200)
+            self.assertLessEqual(len(res.get_json()), 2)
+            seen.extend(u["id"] for u in res.get_json())
+            cursor = res.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        all_ids = [u["id"] for u in self.client.get("/api/v1/users/").get_json()]
+        self.assertEqual(seen, all_ids)
+
+    def test_28_paginate_invalid_limit(self):
+        res = self.client.get("/api/v1/places/?limit=0")
+        self.assertEqual(res.status_code, 400)
+        self._create_user("cursor@test.com")
+        for raw in (b"2024-01-01T00:00:00+00:00|x", b"not a date|x", b"no separator"):
+            cursor = base64.urlsafe_b64encode(raw).decode()
+            res = self.client.get(f"/api/v1/users/?limit=1&cursor={cursor}")
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(res.get_json()["message"], "Invalid cursor")
+
+    def test_29_stream_places_ndjson(self):
+        self._create_place("stream1@test.com")
+        res = self.client.get("/api/v1/places/?stream=ndjson")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.mimetype, "application/x-ndjson")
+        lines = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+        self.assertEqual(lines, self.client.get("/api/v1/places/").get_json())
+
+    def test_30_stream_reviews_json_array(self):
+        res = self.client.get("/api/v1/reviews/?stream=json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(json.loads(res.get_data(as_text=True)),
+                         self.client.get("/api/v1/reviews/").get_json())
+
+    def _create_place_at(self, owner_id, title, lat, lon):
+        data = {"title": title, "price": 50, "latitude": lat, "longitude": lon, "owner_id": owner_id}
+        res = self.client.post("/api/v1/places/", data=json.dumps(data), headers=self.headers)
+        return res.get_json()["id"]
+
+    def test_31_places_near_ordered_by_distance(self):
+        owner_id = self._create_user("geo1@test.com")
+        far = self._create_place_at(owner_id, "Versailles", -48.80, -2.13)
+        near = self._create_place_at(owner_id, "Louvre", -48.86, -2.33)
+        self._create_place_at(owner_id, "Lyon", -45.76, -4.83)
+        res = self.client.get("/api/v1/places/?near=-48.8566,-2.3522&radius_km=25")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([p["id"] for p in res.get_json()], [near, far])
+
+    def test_32_places_in_bbox_follows_updates(self):
+        owner_id = self._create_user("geo2@test.com")
+        place_id = self._create_place_at(owner_id, "Moving", -10.5, -10.5)
+        bbox = "/api/v1/places/?bbox=-11,-11,-10,-10"
+        self.assertEqual([p["id"] for p in self.client.get(bbox).get_json()], [place_id])
+        update = {"latitude": 20.0, "longitude": 20.0}
+        self.client.put(f"/api/v1/places/{place_id}", data=json.dumps(update), headers=self.headers)
+        self.assertEqual(self.client.get(bbox).get_json(), [])
+
+    def test_33_places_search_invalid_bbox(self):
+        res = self.client.get("/api/v1/places/?bbox=1,2,3")
+        self.assertEqual(res.status_code, 400)
+
+    def test_34_places_filter_by_price_and_amenities(self):
+        owner_id = self._create_user("filter1@test.com")
+        wifi = self.client.post("/api/v1/amenities/", data=json.dumps({"name": "WiFi"}),
+                                headers=self.headers).get_json()["id"]
+        pool = self.client.post("/api/v1/amenities/", data=json.dumps({"name": "Pool"}),
+                                headers=self.headers).get_json()["id"]
+        ids = []
+        for price, amenities in ((9120.0, [wifi, pool]), (9110.0, [wifi, pool]),
+                                 (9130.0, [wifi]), (9999.0, [wifi, pool])):
+            data = {"title": "Filtered", "price": price, "latitude": 0, "longitude": 0,
+                    "owner_id": owner_id, "amenities": amenities}
+            res = self.client.post("/api/v1/places/", data=json.dumps(data), headers=self.headers)
+            ids.append(res.get_json()["id"])
+        res = self.client.get(f"/api/v1/places/?min_price=9100&max_price=9200&amenities={wifi},{pool}")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([p["id"] for p in res.get_json()], [ids[1], ids[0]])
+        res = self.client.get(f"/api/v1/places/?amenities={pool}")
+        self.assertEqual({p["id"] for p in res.get_json()}, {ids[0], ids[1], ids[3]})
+        res = self.client.get("/api/v1/places/?min_price=9100&max_price=9200&stream=ndjson")
+        lines = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+        self.assertEqual([p["id"] for p in lines], [ids[1], ids[0], ids[2]])
+        self.assertEqual(lines, self.client.get("/api/v1/places/?min_price=9100&max_price=9200").get_json())
+        res = self.client.get("/api/v1/places/?min_price=9100&max_price=9200&limit=2")
+        self.assertEqual([p["id"] for p in res.get_json()], [ids[1], ids[0]])
+        self.assertNotIn("X-Next-Cursor", res.headers)
+        cursor = base64.urlsafe_b64encode(f"2024-01-01T00:00:00|{ids[0]}".encode()).decode()
+        res = self.client.get(f"/api/v1/places/?max_price=9200&limit=1&cursor={cursor}")
+        self.assertEqual(res.status_code, 400)
+
+    def test_35_place_rating_aggregates(self):
+        place_id, user_id = self._create_place("rating1@test.com")
+        review_ids = []
+        for rating in (5, 3, 4):
+            data = {"text": "Rated", "rating": rating, "place_id": place_id, "user_id": user_id}
+            res = self.client.post("/api/v1/reviews/", data=json.dumps(data), headers=self.headers)
+            review_ids.append(res.get_json()["id"])
+        self.client.put(f"/api/v1/reviews/{review_ids[1]}", data=json.dumps({"rating": 1}),
+                        headers=self.headers)
+        self.client.delete(f"/api/v1/reviews/{review_ids[2]}")
+        rating = self.client.get(f"/api/v1/places/{place_id}").get_json()["rating"]
+        self.assertEqual(rating["count"], 2)
+        self.assertEqual(rating["average"], 3.0)
+        self.assertEqual(rating["histogram"], {"1": 1, "2": 0, "3": 0, "4": 0, "5": 1})
+
+    def test_36_top_rated_places(self):
+        best_id, user_id = self._create_place("rating2@test.com")
+        for _ in range(3):
+            data = {"text": "Perfect", "rating": 5, "place_id": best_id, "user_id": user_id}
+            self.client.post("/api/v1/reviews/", data=json.dumps(data), headers=self.headers)
+        res = self.client.get("/api/v1/places/top_rated?limit=1&min_reviews=3")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.get_json()[0]["rating"]["average"], 5.0)
+        self.assertGreaterEqual(res.get_json()[0]["rating"]["count"], 3)
+
+    def test_37_list_places_expand_owner_and_amenities(self):
+        owner_id = self._create_user("expand1@test.com")
+        wifi = self.client.post("/api/v1/amenities/", data=json.dumps({"name": "WiFi"}),
+                                headers=self.headers).get_json()["id"]
+        data = {"title": "Expanded", "price": 7777, "latitude": 0, "longitude": 0,
+                "owner_id": owner_id, "amenities": [wifi]}
+        place_id = self.client.post("/api/v1/places/", data=json.dumps(data),
+                                    headers=self.headers).get_json()["id"]
+        res = self.client.get("/api/v1/places/?min_price=7777&max_price=7777&expand=owner,amenities")
+        self.assertEqual(res.status_code, 200)
+        place = next(p for p in res.get_json() if p["id"] == place_id)
+        self.assertEqual(place["owner"]["email"], "expand1@test.com")
+        self.assertEqual(place["amenities"], [{"id": wifi, "name": "WiFi"}])
+        single = self.client.get(f"/api/v1/places/{place_id}?expand=owner").get_json()
+        self.assertEqual(single["owner"]["id"], owner_id)
+        self.assertEqual(single["amenities"], [wifi])
+
+    def test_38_expand_unknown_relation(self):
+        res = self.client.get("/api/v1/places/?expand=reviews")
+        self.assertEqual(res.status_code, 400)
+
+    def test_39_cached_list_sees_updates(self):
+        user_id = self._create_user("cache1@test.com")
+        first = self.client.get("/api/v1/users/").get_json()
+        self.assertEqual(self.client.get("/api/v1/users/").get_json(), first)
+        update = {"first_name": "Cached", "last_name": "Again", "email": "cache1@test.com"}
+        self.client.put(f"/api/v1/users/{user_id}", data=json.dumps(update), headers=self.headers)
+        users = {u["id"]: u for u in self.client.get("/api/v1/users/").get_json()}
+        self.assertEqual(users[user_id]["first_name"], "Cached")
+        entries = len(response_cache._entries)
+        for i in range(5):
+            update["first_name"] = f"Cached{i}"
+            self.client.put(f"/api/v1/users/{user_id}", data=json.dumps(update), headers=self.headers)
+            self.client.get("/api/v1/users/")
+        self.assertEqual(len(response_cache._entries), entries)
+
+    def test_40_conditional_get_user(self):
+        user_id = self._create_user("etag1@test.com")
+        res = self.client.get(f"/api/v1/users/{user_id}")
+        etag = res.headers["ETag"]
+        self.assertIn("Last-Modified", res.headers)
+        cached = self.client.get(f"/api/v1/users/{user_id}", headers={"If-None-Match": etag})
+        self.assertEqual(cached.status_code, 304)
+        update = {"first_name": "Etag", "last_name": "Changed", "email": "etag1@test.com"}
+        self.client.put(f"/api/v1/users/{user_id}", data=json.dumps(update), headers=self.headers)
+        fresh = self.client.get(f"/api/v1/users/{user_id}", headers={"If-None-Match": etag})
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh.headers["ETag"], etag)
+
+    def test_41_conditional_get_collection(self):
+        etag = self.client.get("/api/v1/places/").headers["ETag"]
+        res = self.client.get("/api/v1/places/", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 304)
+        self._create_place("etag2@test.com")
+        res = self.client.get("/api/v1/places/", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+
+    def test_42_batch_create_users_is_atomic(self):
+        users = [{"first_name": "Batch", "last_name": str(i), "email": f"batch{i}@test.com"}
+                 for i in range(3)]
+        res = self.client.post("/api/v1/users/batch", data=json.dumps(users + users[:1]),
+                               headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        res = self.client.post("/api/v1/users/batch", data=json.dumps(users + [{"first_name": 1}]),
+                               headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        res = self.client.post("/api/v1/users/batch", data=json.dumps(users), headers=self.headers)
+        self.assertEqual(res.status_code, 201)
+        body = res.get_json()
+        self.assertEqual(body["count"], 3)
+        self.assertEqual(self.client.get(f"/api/v1/users/{body['ids'][0]}").get_json()["email"],
+                         "batch0@test.com")
+
+    def test_43_batch_create_and_update_places(self):
+        owner_id = self._create_user("batch_owner@test.com")
+        places = [{"title": f"Batch {i}", "price": 10.0 * i, "latitude": 1.0, "longitude": 1.0,
+                   "owner_id": owner_id} for i in range(1, 4)]
+        bad = places + [dict(places[0], owner_id="unknown")]
+        res = self.client.post("/api/v1/places/batch", data=json.dumps(bad), headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("Item 3", res.get_json()["message"])
+        listed = self.client.get("/api/v1/places/").get_json()
+        self.assertFalse([p for p in listed if p["owner_id"] == owner_id])
+        res = self.client.post("/api/v1/places/batch", data=json.dumps(places), headers=self.headers)
+        self.assertEqual(res.status_code, 201)
+        ids = res.get_json()["ids"]
+        updates = [{"id": ids[0], "price": 99.0}, {"id": ids[1], "price": -1}]
+        res = self.client.put("/api/v1/places/batch", data=json.dumps(updates), headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        res = self.client.put("/api/v1/places/batch", data=json.dumps(updates[:1]), headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.client.get(f"/api/v1/places/{ids[0]}").get_json()["price"], 99.0)
+        self.assertEqual(self.client.get(f"/api/v1/places/{ids[1]}").get_json()["price"], 20.0)
+
+    @unittest.skipUnless(Config.METRICS, "metrics disabled with HBNB_METRICS=0")
+    def test_44_metrics_endpoint(self):
+        user_id = self._create_user("metrics@test.com")
+        self.client.get(f"/api/v1/users/{user_id}")
+        res = self.client.get("/metrics")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.content_type.startswith("text/plain; version=0.0.4"))
+        text = res.get_data(as_text=True)
+        self.assertRegex(text, r'hbnb_request_duration_seconds_count\{method="GET",'
+                               r'route="/api/v1/users/<string:user_id>",status="200"\} [1-9]')
+        self.assertRegex(text, r'hbnb_facade_call_duration_seconds_count\{method="create_user"\} [1-9]')
+        self.assertRegex(text, r'hbnb_entities\{repository="user"\} [1-9]')
+        self.assertRegex(text, r'hbnb_repository_operations_total\{repository="user",op="add"\} [1-9]')
+
+    def test_45_full_text_search(self):
+        owner_id = self._create_user("text_owner@test.com")
+        ids = {}
+        for title, description in [("Beach house", "Quiet house by the sea"),
+                                   ("City flat", "Near the harbour, close to the sea"),
+                                   ("Mountain cabin", "Wood stove and hiking trails")]:
+            res = self.client.post("/api/v1/places/", data=json.dumps({
+                "title": title, "description": description, "price": 80.0,
+                "latitude": 1.0, "longitude": 1.0, "owner_id": owner_id}), headers=self.headers)
+            ids[title] = res.get_json()["id"]
+        res = self.client.get("/api/v1/places/search?q=sea")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([p["id"] for p in res.get_json()], [ids["Beach house"], ids["City flat"]])
+        self.assertGreater(res.get_json()[0]["score"], res.get_json()[1]["score"])
+        found = self.client.get("/api/v1/places/search?q=quiet%20hou").get_json()
+        self.assertEqual([p["id"] for p in found], [ids["Beach house"]])
+        self.client.post("/api/v1/reviews/", data=json.dumps({
+            "text": "Lovely café next door", "rating": 5, "user_id": owner_id,
+            "place_id": ids["Mountain cabin"]}), headers=self.headers)
+        found = self.client.get("/api/v1/places/search?q=Cafe").get_json()
+        self.assertEqual([p["id"] for p in found], [ids["Mountain cabin"]])
+        self.client.put(f"/api/v1/places/{ids['City flat']}", data=json.dumps({
+            "description": "Near the harbour"}), headers=self.headers)
+        found = self.client.get("/api/v1/places/search?q=sea").get_json()
+        self.assertEqual([p["id"] for p in found], [ids["Beach house"]])
+        self.assertEqual(self.client.get("/api/v1/places/search").status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/places/search?q=sea&limit=0").status_code, 400)
+
+    def test_46_compiled_serializers_match_marshal(self):
+        owner_id = self._create_user("serializer@test.com")
+        amenity_id = self.client.post("/api/v1/amenities/", data=json.dumps({"name": "Sauna"}),
+                                      headers=self.headers).get_json()["id"]
+        place_id = self.client.post("/api/v1/places/", data=json.dumps({
+            "title": "Chalet \"Zoé\"", "price": 120, "latitude": 1.0, "longitude": 1.0,
+            "owner_id": owner_id, "amenities": [amenity_id]}), headers=self.headers).get_json()["id"]
+        for expand, model in expanded_place_models.items():
+            places = facade.expand_places([facade.place_repo.get(place_id)], expand)
+            self.assertEqual(dump_list(compile_serializer(model), places + [None]),
+                             json.dumps(marshal(places + [None], model)).encode() + b"\n")
+        users = facade.get_all_users()
+        self.assertEqual(dump_list(compile_serializer(user_response), users),
+                         json.dumps(marshal(users, user_response)).encode() + b"\n")
+        res = self.client.get("/api/v1/users/")
+        self.assertEqual(res.content_type, "application/json")
+        self.assertEqual(res.get_json(), marshal(facade.get_all_users(), user_response))
+
+    def test_47_compiled_validators(self):
+        owner_id = self._create_user("validator@test.com")
+        place = {"title": " Loft ", "price": 80, "latitude": 1, "longitude": 2, "owner_id": owner_id}
+        for field, value, message in [("price", "80", "price must be a number"),
+                                      ("latitude", True, "latitude must be a number"),
+                                      ("title", None, "title is required"),
+                                      ("amenities", [1], "amenities must be a list of strings")]:
+            res = self.client.post("/api/v1/places/", data=json.dumps(dict(place, **{field: value})),
+                                   headers=self.headers)
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(res.get_json()["message"], message)
+        self.assertEqual(Place.validate(place), dict(place, title="Loft", description="",
+                                                     price=80.0, latitude=1.0, longitude=2.0,
+                                                     amenities=()))
+        self.assertEqual(Place.check_update({"price": 5, "id": "x", "version": 9}), {"price": 5.0})
+        with self.assertRaises(ValueError):
+            Place.check_update({"title": "   "})
+        user = User.create({"first_name": "A", "last_name": "B", "email": "MiXeD@Test.com"})
+        self.assertEqual((user.email, user.is_admin), ("mixed@test.com", False))
+        res = self.client.put(f"/api/v1/users/{owner_id}", data=json.dumps({"email": "nope"}),
+                              headers=self.headers)
+        self.assertEqual(res.get_json()["message"], "Invalid email format")
+        res = self.client.post("/api/v1/users/batch", data=json.dumps([{"first_name": "A"}]),
+                               headers=self.headers)
+        self.assertEqual(res.get_json()["message"], "Item 0: last_name is required")
+
+    def test_48_startup_caches(self):
+        urls = self.app.url_map.bind("localhost")
+        self.assertEqual(urls.build("users_user_resource", {"user_id": "a b"}), "/api/v1/users/a%20b")
+        self.assertEqual(urls.build("places_place_list", {"limit": 5}), "/api/v1/places/?limit=5")
+        self.assertIn("/api/v1/places/search", self.client.get("/swagger.json").get_json()["paths"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "swagger.json")
+
+            def schema():
+                api = CachedSchemaApi(LazyRuleFlask(__name__), title="Users", schema_cache=path)
+                api.add_namespace(users_ns, path="/api/v1/users")
+                with api.app.test_request_context():
+                    return api.__schema__
+
+            built = schema()
+            self.assertEqual(list(built["paths"]), ["/api/v1/users/", "/api/v1/users/batch",
+                                                    "/api/v1/users/{user_id}"])
+            with open(path) as f:
+                cached = json.load(f)
+            self.assertEqual(cached["schema"], built)
+            with open(path, "w") as f:
+                json.dump(dict(cached, schema={"from": "disk"}), f)
+            self.assertIs(schema(), built)
+            startup._schemas.clear()
+            self.assertEqual(schema(), {"from": "disk"})
+
+    def test_49_update_ignores_bookkeeping(self):
+        user_id = self._create_user("keep@test.com")
+        res = self.client.put(f"/api/v1/users/{user_id}", headers=self.headers,
+                              data=json.dumps({"email": "new@b.co", "version": "x", "id": "y"}))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.get_json()["id"], user_id)
+        self.assertEqual(self.client.get(f"/api/v1/users/{user_id}").get_json()["email"], "new@b.co")
+        res = self.client.post("/api/v1/users/", headers=self.headers,
+                               data=json.dumps({"first_name": "A", "last_name": "B", "email": "new@b.co"}))
+        self.assertEqual(res.status_code, 400)
+        res = self.client.put(f"/api/v1/users/{user_id}", data=json.dumps({"first_name": "Z"}),
+                              headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+
+    def test_50_etag_version_not_writable(self):
+        user_id = self._create_user("etag3@test.com")
+        etag = self.client.get(f"/api/v1/users/{user_id}").headers["ETag"]
+        self.client.put(f"/api/v1/users/{user_id}", data=json.dumps({"first_name": "New", "version": 0}),
+                        headers=self.headers)
+        self.assertEqual(facade.get_user(user_id).version, 2)
+        res = self.client.get(f"/api/v1/users/{user_id}", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.get_json()["first_name"], "New")
+
+    def test_51_response_cache_shared_by_threads(self):
+        cache = ResponseCache(max_entries=4)
+        errors = []
+
+        def churn(offset):
+            try:
+                for i in range(5000):
+                    cache.put(offset + i % 8, i, b"{}")
+                    cache.get(offset + (i + 1) % 8, i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=churn, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(cache._entries), 4)
+        cache.put("/users/", 1, b"old")
+        cache.put("/users/", 2, b"new")
+        self.assertIsNone(cache.get("/users/", 1))
+        self.assertEqual(cache.get("/users/", 2), b"new")
+        self.assertEqual(list(cache._entries).count("/users/"), 1)
+
+    def test_52_non_finite_prices_rejected(self):
+        owner_id = self._create_user("nan@test.com")
+        for price in ("NaN", "Infinity", "-Infinity"):
+            body = ('{"title": "Bad", "price": %s, "latitude": 0, "longitude": 0, "owner_id": "%s"}'
+                    % (price, owner_id))
+            res = self.client.post("/api/v1/places/", data=body, headers=self.headers)
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(res.get_json()["message"], "Price must be positive")
+        for query in ("min_price=nan", "max_price=inf", "min_price=5&max_price=-inf",
+                      "near=0,0&radius_km=nan"):
+            res = self.client.get(f"/api/v1/places/?{query}")
+            self.assertEqual(res.status_code, 400)
+
+    def test_53_updates_check_references(self):
+        place_id, user_id = self._create_place("refs@test.com")
+        data = {"text": "Fine", "rating": 4, "place_id": place_id, "user_id": user_id}
+        review_id = self.client.post("/api/v1/reviews/", data=json.dumps(data),
+                                     headers=self.headers).get_json()["id"]
+        for update, message in (({"place_id": "nonexistent"}, "Place not found"),
+                                ({"user_id": "nonexistent"}, "User not found")):
+            res = self.client.put(f"/api/v1/reviews/{review_id}", data=json.dumps(update),
+                                  headers=self.headers)
+            self.assertEqual((res.status_code, res.get_json()["message"]), (400, message))
+        self.assertEqual(facade.get_review(review_id).place_id, place_id)
+        self.assertEqual(self.client.get(f"/api/v1/places/{place_id}").get_json()["rating"]["count"], 1)
+        for update, message in (({"owner_id": "nonexistent"}, "Owner not found"),
+                                ({"amenities": ["nonexistent"]}, "Amenity nonexistent not found")):
+            res = self.client.put(f"/api/v1/places/{place_id}", data=json.dumps(update),
+                                  headers=self.headers)
+            self.assertEqual((res.status_code, res.get_json()["message"]), (400, message))
+            res = self.client.put("/api/v1/places/batch", data=json.dumps([dict(update, id=place_id)]),
+                                  headers=self.headers)
+            self.assertEqual((res.status_code, res.get_json()["message"]), (400, f"Item 0: {message}"))
+        self.assertEqual(facade.place_repo.get(place_id).owner_id, user_id)
+
+    def test_54_preload_only_without_local_files(self):
+        conf = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gunicorn.conf.py")
+        for env, preload in (({"HBNB_STORAGE": "sqlite"}, False), ({"HBNB_STORAGE": "wal"}, False),
+                             ({"HBNB_STORAGE": "memory"}, True),
+                             ({"HBNB_STORAGE": "sqlite", "HBNB_STORE_SOCKET": "/tmp/s.sock"}, True)):
+            with mock.patch.dict(os.environ, env, clear=True):
+                self.assertEqual(runpy.run_path(conf)["preload_app"], preload)
+
+
+class TestModels(unittest.TestCase):
+
+    def test_01_timestamps_round_trip(self):
+        user = User("Alice", "Dupont", "alice@model.com")
+        self.assertIsInstance(user._created, float)
+        self.assertEqual(user.created_at, datetime.fromtimestamp(user._created))
+        self.assertEqual(user.to_dict()["created_at"], user.created_at.isoformat())
+        user.created_at = datetime(2024, 5, 17, 9, 30, 15, 250000)
+        self.assertEqual(user.to_dict()["created_at"], "2024-05-17T09:30:15.250000")
+        copy = User.from_record(json.loads(json.dumps(user.to_record())))
+        self.assertEqual(copy.to_dict(), user.to_dict())
+        self.assertEqual((copy.created_at, copy.updated_at), (user.created_at, user.updated_at))
+
+    def test_02_unknown_attributes_rejected(self):
+        user = User("Alice", "Dupont", "alice@model.com")
+        self.assertFalse(hasattr(user, "__dict__"))
+        with self.assertRaises(AttributeError):
+            user.nickname = "Al"
+        record = dict(user.to_record(), nickname="Al")
+        with self.assertRaises(AttributeError):
+            User.from_record(record)
+
+    def test_03_amenities_serialize_as_list(self):
+        place = Place("Loft", "", 80, 1.0, 2.0, "owner-id")
+        self.assertEqual(place.to_dict()["amenities"], [])
+        repo = InMemoryRepository()
+        repo.add(place)
+        repo.update(place.id, {"amenities": ["a1", "a2"]})
+        self.assertEqual(place.serialized()["amenities"], ["a1", "a2"])
+        self.assertEqual(json.loads(json.dumps(place.to_dict()))["amenities"], ["a1", "a2"])
+        self.assertEqual(Place.from_record(place.to_record()).to_dict(), place.to_dict())
+
+    def test_04_shared_amenities_bounded(self):
+        with mock.patch.object(place_module, "SHARED_AMENITIES_MAX", 3), \
+                mock.patch.object(place_module, "_shared_amenities", {}):
+            places = [Place("Loft", "", 80, 1.0, 2.0, "owner") for _ in range(2)]
+            for i in range(10):
+                places[0].amenities = [f"a{i}"]
+            self.assertLessEqual(len(place_module._shared_amenities), 3)
+            places[1].amenities = ["a9"]
+            self.assertIs(places[1].amenities, places[0].amenities)
+
+
+class TestInMemoryRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository(unique_indexes=("email",), indexes=("last_name",))
+
+    def test_01_unique_index_lookup(self):
+        user = User("Alice", "Dupont", "alice@repo.com")
+        self.repo.add(user)
+        self.assertIs(self.repo.get_by_attribute("email", "alice@repo.com"), user)
+        self.assertIsNone(self.repo.get_by_attribute("email", "nobody@repo.com"))
+
+    def test_02_unique_index_rejects_duplicates(self):
+        self.repo.add(User("Alice", "Dupont", "dup@repo.com"))
+        with self.assertRaises(ValueError):
+            self.repo.add(User("Bob", "Martin", "dup@repo.com"))
+        self.assertEqual(len(self.repo.get_all()), 1)
+
+    def test_03_index_follows_update_and_delete(self):
+        user = User("Alice", "Dupont", "old@repo.com")
+        self.repo.add(user)
+        self.repo.update(user.id, {"email": "new@repo.com", "last_name": "Martin"})
+        self.assertIsNone(self.repo.get_by_attribute("email", "old@repo.com"))
+        self.assertIs(self.repo.get_by_attribute("email", "new@repo.com"), user)
+        self.assertEqual(self.repo.filter_by_attribute("last_name", "Martin"), [user])
+        self.repo.delete(user.id)
+        self.assertIsNone(self.repo.get_by_attribute("email", "new@repo.com"))
+        self.assertEqual(self.repo.filter_by_attribute("last_name", "Martin"), [])
+
+    def test_04_grid_index_crosses_antimeridian(self):
+        index = GridIndex()
+        for i, (lat, lon) in enumerate(((0.0, 179.9), (0.0, -179.9), (0.0, 0.0))):
+            index.insert(SimpleNamespace(id=str(i), latitude=lat, longitude=lon))
+        self.assertEqual(sorted(index.within_bbox(-1, 179, 1, -179)), ["0", "1"])
+        self.assertEqual([pid for _, pid in index.nearby(0.0, 180.0, 50)], ["0", "1"])
+
+    def test_05_sorted_index_range(self):
+        index = SortedIndex("price")
+        items = [SimpleNamespace(id=str(i), price=p) for i, p in enumerate((30.0, 10.0, 20.0, 20.0))]
+        for item in items:
+            index.insert(item)
+        self.assertEqual(index.range(15, 25), ["2", "3"])
+        self.assertEqual(index.count(high=20), 3)
+        index.remove(items[2])
+        self.assertEqual(index.range(low=20), ["3", "0"])
+
+    def test_06_serialized_cache_invalidated_on_update(self):
+        user = User("Alice", "Dupont", "cached@repo.com")
+        self.repo.add(user)
+        self.assertIs(user.serialized(), user.serialized())
+        self.repo.update(user.id, {"first_name": "Alicia"})
+        self.assertEqual(user.serialized()["first_name"], "Alicia")
+
+    def test_07_add_many_and_update_many_are_atomic(self):
+        alice = User("Alice", "Dupont", "alice@batch.com")
+        bob = User("Bob", "Martin", "bob@batch.com")
+        with self.assertRaises(ValueError):
+            self.repo.add_many([alice, bob, User("Carol", "Smith", "alice@batch.com")])
+        self.assertEqual(self.repo.get_all(), [])
+        self.repo.add_many([alice, bob])
+        with self.assertRaises(ValueError):
+            self.repo.update_many([(alice.id, {"first_name": "Alicia"}),
+                                   (bob.id, {"email": "alice@batch.com"})])
+        self.assertEqual(alice.first_name, "Alice")
+        self.repo.update_many([(alice.id, {"email": "bob@batch.com"}),
+                               (bob.id, {"email": "alice@batch.com"})])
+        self.assertIs(self.repo.get_by_attribute("email", "bob@batch.com"), alice)
+        self.assertIs(self.repo.get_by_attribute("email", "alice@batch.com"), bob)
+
+    def test_08_thread_safe_writes_are_not_lost(self):
+        repo = InMemoryRepository(unique_indexes=("email",), thread_safe=True)
+        hot = User("Hot", "Spot", "hot@repo.com")
+        repo.add(hot)
+        created = []
+
+        def work(n):
+            for i in range(200):
+                repo.update(hot.id, {"last_name": f"{n}-{i}"})
+                try:
+                    repo.add(User("Race", str(n), f"race{i}@repo.com"))
+                    created.append(i)
+                except ValueError:
+                    pass
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(hot.version, 1 + 4 * 200)
+        self.assertEqual(sorted(created), list(range(200)))
+        self.assertEqual(len(repo.get_all()), 201)
+
+    def test_09_rw_lock_is_reentrant_but_not_upgradable(self):
+        lock = RWLock()
+        with lock.write(), lock.write(), lock.read():
+            pass
+        with lock.read(), lock.read():
+            with self.assertRaises(RuntimeError):
+                lock.acquire_write()
+        with lock.write():
+            pass
+
+    def test_10_facade_checks_references_atomically(self):
+        facade = HBnBFacade(lambda name, model, **options:
+                            InMemoryRepository(thread_safe=True, **options))
+        owner = facade.create_user({"first_name": "Own", "last_name": "Er", "email": "own@repo.com"})
+        amenity = facade.create_amenity({"name": "Wifi"})
+        place = {"title": "Flat", "price": 10, "latitude": 1, "longitude": 1,
+                 "owner_id": owner.id, "amenities": [amenity.id]}
+        errors = []
+
+        def create():
+            for _ in range(100):
+                try:
+                    facade.create_place(place)
+                except ValueError as e:
+                    errors.append(str(e))
+
+        threads = [threading.Thread(target=create) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        facade.delete_amenity(amenity.id)
+        for thread in threads:
+            thread.join()
+        created = facade.place_repo.get_all()
+        self.assertEqual(len(created) + len(errors), 400)
+        self.assertEqual(len(facade.place_geo), len(created))
+        self.assertTrue(all(e == f"Amenity {amenity.id} not found" for e in errors))
+
+    def test_11_scan_lengths_and_operation_counts(self):
+        users = [User("Scan", str(i), f"scan{i}@repo.com") for i in range(50)]
+        self.repo.add_many(users)
+        self.repo.get_by_attribute("email", "scan3@repo.com")
+        self.assertIs(self.repo.get_by_attribute("first_name", "Scan"), users[0])
+        self.repo.filter_by_attribute("first_name", "Nobody")
+        buckets, counts, total = self.repo.scan_lengths.snapshot()
+        self.assertEqual((sum(counts), total), (2, 51))
+        self.assertEqual(counts[buckets.index(10)], 1)
+        self.assertEqual((self.repo.stats["scan"], self.repo.stats["index_lookup"]), (2, 1))
+        self.assertEqual(self.repo.count(), 50)
+
+    def test_12_text_index(self):
+        index = self.repo.attach_index(TextIndex(("first_name", "last_name")))
+        users = [User("Ana", "Marín", "ana@text.com"), User("Anabel", "Ruiz", "anabel@text.com")]
+        self.repo.add_many(users)
+        self.repo.add(User("Marina", "Ana Ana", "marina@text.com"))
+        self.assertEqual(index.expand("ana"), ["ana"])
+        self.assertEqual(sorted(index.expand("ana", prefix=True)), ["ana", "anabel"])
+        hits = search([(index, 1.0)], "marin ana")
+        self.assertEqual([key for key, _ in hits], [users[0].id])
+        self.assertEqual(len(search([(index, 1.0)], "an")), 3)
+        self.repo.update(users[0].id, {"last_name": "Soto"})
+        self.assertEqual(search([(index, 1.0)], "marin ana"), [])
+        self.repo.delete(users[1].id)
+        self.assertEqual(index.expand("ana", prefix=True), ["ana"])
+        self.assertEqual(len(index), 2)
+
+    def test_13_update_sets_declared_fields_only(self):
+        user = User("Alice", "Dupont", "alice@repo.com")
+        self.repo.add(user)
+        user_id, created = user.id, user.created_at
+        self.repo.update(user_id, {"first_name": "Alicia", "version": "x", "_created": None, "id": "y"})
+        self.assertEqual((user.id, user.first_name, user.version, user.created_at),
+                         (user_id, "Alicia", 2, created))
+
+    def test_14_failed_update_keeps_indexes(self):
+        class FailingUser(User):
+            __slots__ = ()
+
+            def save(self):
+                raise RuntimeError("disk full")
+
+        user = FailingUser("Alice", "Dupont", "alice@repo.com")
+        self.repo.add(user)
+        with self.assertRaises(RuntimeError):
+            self.repo.update(user.id, {"email": "alicia@repo.com", "last_name": "Durand"})
+        self.assertEqual((user.email, user.last_name), ("alice@repo.com", "Dupont"))
+        self.assertIs(self.repo.get_by_attribute("email", "alice@repo.com"), user)
+        self.assertIsNone(self.repo.get_by_attribute("email", "alicia@repo.com"))
+        with self.assertRaises(ValueError):
+            self.repo.add(User("Other", "Dupont", "alice@repo.com"))
+
+
+class TestColumnarRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ColumnarRepository(("price", "latitude", "longitude"))
+        self.places = [Place("Flat", "", price, lat, 2.0, "owner")
+                       for price, lat in ((50, 10.5), (100, 10.2), (150, 20.1), (200, 20.9))]
+        for place in self.places:
+            self.repo.add(place)
+
+    def test_01_filter_and_aggregate(self):
+        self.assertEqual(self.repo.filter_range(price=(90, 160)), self.places[1:3])
+        self.assertEqual(self.repo.aggregate("price", "mean", latitude=(20, 21)), 175.0)
+        self.assertEqual(self.repo.grouped("price", ("latitude",), bin_size=10),
+                         {(10.0,): 75.0, (20.0,): 175.0})
+
+    def test_02_columns_follow_update_and_delete(self):
+        self.repo.delete(self.places[0].id)
+        self.repo.update(self.places[3].id, {"price": 20})
+        self.assertEqual(self.repo.aggregate("price", "min"), 20.0)
+        self.assertEqual(self.repo.aggregate("price", "count"), 3)
+        self.assertIs(self.repo.get(self.places[3].id), self.places[3])
+
+    @unittest.skipIf(columnar.np is None, "needs numpy")
+    def test_03_insert_with_a_live_view_leaves_store_unchanged(self):
+        store = self.repo.column_store
+        view = store._vector("latitude")
+        with self.assertRaises(BufferError):
+            store.insert(Place("Flat", "", 10, 1.0, 2.0, "owner"))
+        del view
+        self.assertEqual([len(store), len(store._rows)] + [len(c) for c in store.columns.values()],
+                         [4] * 5)
+
+    def test_04_selectable_as_facade_backend(self):
+        config = SimpleNamespace(STORAGE="columnar", THREAD_SAFE=False)
+        facade = HBnBFacade(repository_factory(config))
+        self.assertIsInstance(facade.place_repo.lock, RWLock)
+        self.assertEqual(set(facade.place_repo.column_store.columns), {"price", "latitude", "longitude"})
+        self.assertEqual(set(facade.review_repo.column_store.columns), {"rating"})
+        owner = facade.create_user({"first_name": "Col", "last_name": "Umn", "email": "col@repo.com"})
+        facade.create_place({"title": "Flat", "price": 70, "latitude": 1, "longitude": 1,
+                             "owner_id": owner.id})
+        self.assertEqual(facade.place_repo.aggregate("price", "max"), 70.0)
+
+
+class TestPersistentRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "users")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _open(self, **options):
+        return PersistentRepository(self.path, User, unique_indexes=("email",), **options)
+
+    def test_01_restart_replays_log(self):
+        repo = self._open()
+        alice = User("Alice", "Dupont", "alice@wal.com")
+        bob = User("Bob", "Martin", "bob@wal.com")
+        repo.add(alice)
+        repo.add(bob)
+        repo.update(alice.id, {"first_name": "Alicia"})
+        repo.delete(bob.id)
+        repo.close()
+        reopened = self._open()
+        self.assertEqual([u.to_dict() for u in reopened.get_all()], [alice.to_dict()])
+        self.assertEqual(reopened.get_by_attribute("email", "alice@wal.com").version, alice.version)
+        reopened.close()
+
+    def test_02_compaction_and_torn_tail(self):
+        repo = self._open(compact_every=2)
+        users = [User("User", str(i), f"user{i}@wal.com") for i in range(3)]
+        for user in users:
+            repo.add(user)
+        repo.close()
+        with open(self.path + ".wal", "a") as f:
+            f.write('{"op": "put", "rec')
+        reopened = self._open()
+        self.assertEqual([u.id for u in reopened.get_all()], [u.id for u in users])
+        late = User("Late", "Writer", "late@wal.com")
+        reopened.add(late)
+        reopened.close()
+        final = self._open()
+        self.assertEqual(len(final.get_all()), 4)
+        final.close()
+
+    def test_03_lazy_snapshot_loads_on_demand(self):
+        repo = self._open()
+        users = [User("User", str(i), f"lazy{i}@wal.com") for i in range(4)]
+        for user in users:
+            repo.add(user)
+        repo.compact()
+        repo.delete(users[0].id)
+        repo.update(users[1].id, {"first_name": "Changed"})
+        late = User("Late", "Writer", "late@wal.com")
+        extra = User("Extra", "Writer", "extra@wal.com")
+        repo.add_many([late, extra])
+        repo.delete(late.id)
+        repo.close()
+        lazy = self._open(lazy=True)
+        self.assertEqual(lazy.get(users[2].id).to_dict(), users[2].to_dict())
+        self.assertIsNone(lazy.get(users[0].id))
+        self.assertEqual(lazy.get(users[1].id).first_name, "Changed")
+        self.assertEqual(lazy._storage, {})
+        self.assertEqual(lazy.count(), 4)
+        self.assertEqual(lazy._storage, {})
+        self.assertEqual(lazy.get_by_attribute("email", "lazy3@wal.com").id, users[3].id)
+        self.assertEqual(sorted(u.id for u in lazy.get_all()),
+                         sorted(u.id for u in users[1:] + [extra]))
+        self.assertEqual(lazy.count(), 4)
+        lazy.close()
+
+    def test_04_lazy_get_during_load(self):
+        repo = self._open()
+        users = [User("User", str(i), f"race{i}@wal.com") for i in range(200)]
+        repo.add_many(users)
+        repo.compact()
+        repo.delete(users[0].id)
+        repo.update(users[1].id, {"first_name": "Changed"})
+        repo.close()
+        seen = set()
+        for _ in range(20):
+            lazy = self._open(lazy=True)
+            loaded = threading.Event()
+
+            def read():
+                while not loaded.is_set():
+                    seen.add((lazy.get(users[0].id), lazy.get(users[1].id).first_name))
+
+            reader = threading.Thread(target=read)
+            reader.start()
+            lazy.get_all()
+            loaded.set()
+            reader.join()
+            lazy.close()
+        self.assertEqual(seen, {(None, "Changed")})
+
+    def test_05_batches_are_one_log_entry(self):
+        repo = self._open()
+        users = [User("User", str(i), f"batch{i}@wal.com") for i in range(3)]
+        repo.add_many(users)
+        repo.update_many([(users[0].id, {"first_name": "Changed"})])
+        repo.close()
+        with open(self.path + ".wal") as f:
+            self.assertEqual(len(f.readlines()), 2)
+        with open(self.path + ".wal", "rb+") as f:
+            f.truncate(os.path.getsize(self.path + ".wal") - 10)
+        reopened = self._open()
+        self.assertEqual([u.first_name for u in reopened.get_all()], ["User"] * 3)
+        reopened.close()
+
+
+class TestSQLiteRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = SQLiteRepository(os.path.join(self.tmp.name, "hbnb.db"), "users", User,
+                                     unique_indexes=("email",), indexes=("last_name",))
+
+    def tearDown(self):
+        self.repo.close()
+        self.tmp.cleanup()
+
+    def test_01_round_trip_and_unique_email(self):
+        user = User("Alice", "Dupont", "alice@sqlite.com")
+        self.repo.add(user)
+        self.assertEqual(self.repo.get(user.id).to_dict(), user.to_dict())
+        self.assertEqual(self.repo.get_by_attribute("email", "alice@sqlite.com").id, user.id)
+        with self.assertRaises(ValueError):
+            self.repo.add(User("Bob", "Martin", "alice@sqlite.com"))
+
+    def test_02_update_delete_and_pages(self):
+        users = [User("User", "Same", f"user{i}@sqlite.com") for i in range(5)]
+        for user in users:
+            self.repo.add(user)
+        self.repo.update(users[0].id, {"first_name": "Changed"})
+        self.assertEqual(self.repo.get(users[0].id).first_name, "Changed")
+        self.assertEqual(self.repo.get(users[0].id).version, 2)
+        self.repo.delete(users[1].id)
+        self.assertEqual(len(self.repo.filter_by_attribute("last_name", "Same")), 4)
+        page, after = self.repo.get_page(3)
+        rest, end = self.repo.get_page(3, after)
+        self.assertIsNone(end)
+        self.assertEqual([u.id for u in page + rest], [users[0].id] + [u.id for u in users[2:]])
+
+    def test_03_batches_roll_back_and_swap_unique_values(self):
+        alice = User("Alice", "Dupont", "alice@sqlite.com")
+        bob = User("Bob", "Martin", "bob@sqlite.com")
+        with self.assertRaises(ValueError):
+            self.repo.add_many([alice, bob, User("Carol", "Smith", "bob@sqlite.com")])
+        self.assertEqual(self.repo.get_all(), [])
+        self.repo.add_many([alice, bob])
+        self.repo.update_many([(alice.id, {"email": "bob@sqlite.com"}),
+                               (bob.id, {"email": "alice@sqlite.com"})])
+        self.assertEqual(self.repo.get_by_attribute("email", "bob@sqlite.com").id, alice.id)
+        self.assertEqual(self.repo.get_by_attribute("email", "alice@sqlite.com").id, bob.id)
+
+    def test_04_thread_connections_close_with_their_thread(self):
+        user = User("Alice", "Dupont", "alice@sqlite.com")
+        self.repo.add(user)
+        found = []
+        threads = [threading.Thread(target=lambda: found.append(self.repo.get(user.id)))
+                   for _ in range(20)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        self.assertEqual(len(found), 20)
+        self.assertEqual(len(self.repo._connections), 1)
+
+
+class TestRemoteFacade(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "store.sock")
+        self.server = StoreServer(HBnBFacade(lambda name, model, **options:
+                                             InMemoryRepository(thread_safe=True, **options)), path)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.remote = RemoteFacade(path)
+
+    def tearDown(self):
+        self.remote.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def test_01_calls_and_errors_cross_the_socket(self):
+        user = self.remote.create_user({"first_name": "Alice", "last_name": "Dupont",
+                                        "email": "alice@remote.com"})
+        self.assertEqual(self.remote.user_repo.get(user.id).email, "alice@remote.com")
+        self.assertEqual(self.server.facade.get_user(user.id).email, "alice@remote.com")
+        with self.assertRaises(ValueError):
+            self.remote.create_user({"first_name": "Bob", "last_name": "Martin",
+                                     "email": "alice@remote.com"})
+        with self.assertRaises(AttributeError):
+            self.remote.user_repo._storage()
+
+    def test_02_generators_are_streamed_in_chunks(self):
+        owner = self.remote.create_user({"first_name": "Own", "last_name": "Er",
+                                         "email": "owner@remote.com"})
+        self.remote.create_places([{"title": f"Place {i}", "price": 10, "latitude": 0,
+                                    "longitude": 0, "owner_id": owner.id} for i in range(1200)])
+        self.assertEqual(len(list(self.remote.iter_places())), 1200)
+        self.assertEqual(self.remote.versions("place"), self.server.facade.versions("place"))
+
+
+class TestASGIApp(unittest.TestCase):
+
+    def setUp(self):
+        self.app = ASGIApp(create_app().wsgi_app, max_workers=4)
+
+    def tearDown(self):
+        self.app.executor.shutdown()
+
+    def call(self, method, path, body=None, query=b""):
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": json.dumps(body).encode() if body else b""}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": method, "path": path, "query_string": query,
+                 "headers": [(b"content-type", b"application/json")]}
+        asyncio.run(self.app(scope, receive, send))
+        return messages[0]["status"], b"".join(m.get("body", b"") for m in messages[1:])
+
+    def test_01_same_routes_as_wsgi(self):
+        status, body = self.call("POST", "/api/v1/users/", {"first_name": "Alice", "last_name": "Async",
+                                                            "email": "alice@asgi.com"})
+        self.assertEqual(status, 201)
+        user_id = json.loads(body)["id"]
+        status, body = self.call("GET", f"/api/v1/users/{user_id}")
+        self.assertEqual((status, json.loads(body)["email"]), (200, "alice@asgi.com"))
+        self.assertEqual(self.call("GET", "/api/v1/users/missing")[0], 404)
+        self.call("POST", "/api/v1/places/", {"title": "Async", "price": 10, "latitude": 0,
+                                              "longitude": 0, "owner_id": user_id})
+        status, body = self.call("GET", "/api/v1/places/", query=b"stream=ndjson")
+        self.assertEqual(status, 200)
+        self.assertIn("Async", [json.loads(line)["title"] for line in body.splitlines()])
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)